@@ -7,11 +7,20 @@ uses so the ingest will correctly filter items after feedback is added.
 
 Additionally: when feedback is received we immediately prune public/data/news.json
 (for fast UX) and then trigger the full ingest in background (as before).
+
+Pruning works on an in-memory index of news.json (reloaded only when the file's
+mtime changes); a single debounced writer flushes it, so a burst of clicks costs
+one rewrite instead of one full parse + serialize per click.
+
+Ingest triggers are coalesced: at most one ingest runs and one more is queued,
+with INGEST_MIN_INTERVAL_S between starts. GET /ingest/status reports the queue.
 """
+import atexit
 import json
 import os
 import subprocess
 import threading
+import time
 from datetime import datetime, timezone
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 from flask import Flask, request, jsonify
@@ -31,10 +40,17 @@ CANDIDATE_INGEST_PATHS = [
     os.path.join(REPO_ROOT, "public", "scripts", "ingest.py"),
     os.path.join(REPO_ROOT, "scripts", "news_ingest.py"),
     os.path.join(REPO_ROOT, "news_ingest.py"),
+    os.path.join(REPO_ROOT, "scripts", "news_agent.py"),
 ]
 
 VALID_LABELS = {"NOT_RELEVANT", "CRITICAL", "RELEVANT", "MONITOR"}
 
+PRUNE_FLUSH_DELAY_S = 1.0   # write news.json once no prune has arrived for this long
+PRUNE_FLUSH_MAX_S = 5.0     # ...but never hold pruned items back longer than this
+
+INGEST_MIN_INTERVAL_S = float(os.environ.get("INGEST_MIN_INTERVAL_S", "300"))  # between ingest starts
+INGEST_TIMEOUT_S = 1800     # a run still going after this is killed
+
 app = Flask(__name__)
 CORS(app)
 
@@ -83,83 +99,294 @@ def _append_feedback(obj: dict):
         f.write(line + "\n")
 
 
-def _trigger_ingest():
-    if not INGEST_SCRIPT:
-        app.logger.warning("No ingest script found; skipping ingest trigger")
-        return
+def _utc_iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts else None
+
+
+class IngestScheduler:
+    """
+    Single-flight ingest runner. trigger() only marks an ingest as wanted; one
+    worker thread starts it when nothing is running and INGEST_MIN_INTERVAL_S
+    has passed since the previous start. Triggers arriving while one is queued
+    are coalesced into it, so at most one ingest runs and one waits.
+    """
 
-    def _run():
+    def __init__(self, script, min_interval=INGEST_MIN_INTERVAL_S, timeout=INGEST_TIMEOUT_S):
+        self.script = script
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.queued = False
+        self.running = False
+        self.triggers = 0
+        self.coalesced = 0
+        self.runs = 0
+        self.started_at = 0.0          # wall clock, for status
+        self.last_start = None         # monotonic, for the interval
+        self.last_finished_at = 0.0
+        self.last_duration_s = None
+        self.last_returncode = None
+        self._cond = threading.Condition()
+        self._worker = None
+
+    def trigger(self):
+        """Ask for an ingest. Returns True if this trigger queued a new run."""
+        if not self.script:
+            app.logger.warning("No ingest script found; skipping ingest trigger")
+            return False
+        with self._cond:
+            self.triggers += 1
+            if self.queued:
+                self.coalesced += 1
+                return False
+            self.queued = True
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_loop, name="ingest", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+            return True
+
+    def _next_start(self):
+        return 0.0 if self.last_start is None else self.last_start + self.min_interval
+
+    def _run_loop(self):
+        while True:
+            with self._cond:
+                while not self.queued or time.monotonic() < self._next_start():
+                    self._cond.wait(None if not self.queued else self._next_start() - time.monotonic())
+                self.queued = False
+                self.running = True
+                self.last_start = time.monotonic()
+                self.started_at = time.time()
+            returncode = self._run_once()
+            with self._cond:
+                self.running = False
+                self.runs += 1
+                self.last_finished_at = time.time()
+                self.last_duration_s = round(time.monotonic() - self.last_start, 1)
+                self.last_returncode = returncode
+
+    def _run_once(self):
+        python_exe = os.environ.get("PYTHON_BIN", "python3")
         try:
-            python_exe = os.environ.get("PYTHON_BIN", "python3")
-            subprocess.Popen([python_exe, INGEST_SCRIPT], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            app.logger.info("Ingest triggered: %s", INGEST_SCRIPT)
+            proc = subprocess.Popen([python_exe, self.script],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            app.logger.info("Ingest started: %s", self.script)
         except Exception as e:
             app.logger.exception("Failed to start ingest: %s", e)
+            return None
+        try:
+            return proc.wait(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            app.logger.error("Ingest exceeded %ss and was killed", self.timeout)
+            return proc.wait()
+
+    def status(self):
+        with self._cond:
+            now = time.monotonic()
+            wait_s = max(0.0, self._next_start() - now) if self.queued else 0.0
+            return {
+                "script": self.script or "not-found",
+                "running": self.running,
+                "queued": self.queued,
+                "running_since": _utc_iso(self.started_at) if self.running else None,
+                "queued_starts_in_s": round(wait_s, 1) if self.queued and not self.running else None,
+                "min_interval_s": self.min_interval,
+                "runs": self.runs,
+                "triggers": self.triggers,
+                "coalesced": self.coalesced,
+                "last_started": _utc_iso(self.started_at),
+                "last_finished": _utc_iso(self.last_finished_at),
+                "last_duration_s": self.last_duration_s,
+                "last_returncode": self.last_returncode,
+            }
+
+
+INGEST = IngestScheduler(INGEST_SCRIPT)
 
-    t = threading.Thread(target=_run, daemon=True)
-    t.start()
+
+def _trigger_ingest():
+    return INGEST.trigger()
 
 
-def _prune_news_for_feedback(key: str, title: str, url: str, source: str):
+class NewsIndex:
     """
-    Remove items from NEWS_PATH that match the feedback key, normalized url,
-    or have an exact title match (case-insensitive). This runs in background
-    so the feedback endpoint can return quickly.
+    In-memory view of NEWS_PATH indexed by article key, normalized URL and
+    lower-cased title. The file is re-read only when its mtime/size changes.
+
+    prune() removes matching items in memory and returns immediately; a single
+    writer thread rewrites the file once prunes stop arriving for
+    PRUNE_FLUSH_DELAY_S (at most PRUNE_FLUSH_MAX_S after the first pending one).
+    Prunes not yet flushed are re-applied if the ingest replaces news.json
+    in the meantime, so they are never lost or written over fresh output.
     """
-    try:
-        if not os.path.exists(NEWS_PATH):
-            app.logger.debug("news.json not found, skipping prune.")
-            return
 
-        with open(NEWS_PATH, "r", encoding="utf-8") as f:
+    def __init__(self, path, flush_delay=PRUNE_FLUSH_DELAY_S, flush_max=PRUNE_FLUSH_MAX_S):
+        self.path = path
+        self.flush_delay = flush_delay
+        self.flush_max = flush_max
+        self.items = []
+        self.removed = set()     # positions in self.items pruned but not yet flushed
+        self.pending = []        # (key, norm_url, title) prunes since the last flush
+        self.by_key = {}
+        self.by_url = {}
+        self.by_title = {}
+        self.signature = None    # (mtime_ns, size) of the file self.items came from
+        self.first_pending = 0.0
+        self.last_pending = 0.0
+        self.loads = 0
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._writer = None
+
+    # ── loading ──────────────────────────────────────────────────────────────
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _index(self, items):
+        self.items, self.removed = items, set()
+        self.by_key, self.by_url, self.by_title = {}, {}, {}
+        for pos, it in enumerate(items):
+            it_title = (it.get("title") or "").strip()
+            it_url = normalize_url(it.get("url") or "")
+            it_key = build_article_key(it_title, (it.get("source") or "").strip(), it_url)
+            for index, value in ((self.by_key, it_key), (self.by_url, it_url),
+                                 (self.by_title, it_title.lower())):
+                if value:
+                    index.setdefault(value, []).append(pos)
+
+    def _refresh(self):
+        """
+        Reload if news.json changed on disk; re-apply unflushed prunes. Caller
+        holds the lock. Returns False when the file could not be read (e.g. the
+        ingest is mid-write) — the index is then out of date and must not be
+        written back.
+        """
+        sig = self._stat()
+        if sig == self.signature:
+            return True
+        items = []
+        if sig is not None:
             try:
-                items = json.load(f)
+                with open(self.path, "r", encoding="utf-8") as f:
+                    items = json.load(f)
             except Exception:
-                app.logger.exception("Failed to parse existing news.json; skipping prune.")
-                return
-
-        if not isinstance(items, list):
-            app.logger.warning("news.json not list, skipping prune.")
+                app.logger.exception("Failed to parse news.json; keeping previous index.")
+                return False
+            if not isinstance(items, list):
+                app.logger.warning("news.json not list, ignoring.")
+                items = []
+        self._index(items)
+        self.signature = sig
+        self.loads += 1
+        for key, norm_url, title in self.pending:
+            self._remove(key, norm_url, title)
+        return True
+
+    # ── pruning ──────────────────────────────────────────────────────────────
+    def _remove(self, key, norm_url, title):
+        hits = set(self.by_key.get(key, ())) if key else set()
+        if norm_url:
+            hits.update(self.by_url.get(norm_url, ()))
+        if title:
+            hits.update(self.by_title.get(title.strip().lower(), ()))
+        hits -= self.removed
+        self.removed |= hits
+        return len(hits)
+
+    def prune(self, key, title, norm_url):
+        """
+        Remove items matching the feedback key, normalized URL, or exact title
+        (case-insensitive) from the in-memory snapshot and schedule a flush.
+        Returns the number of items removed.
+        """
+        with self._cond:
+            self._refresh()
+            removed = self._remove(key, norm_url, title)
+            if removed:
+                now = time.monotonic()
+                if not self.pending:
+                    self.first_pending = now
+                self.pending.append((key, norm_url, title))
+                self.last_pending = now
+                self._ensure_writer()
+                self._cond.notify()
+            return removed
+
+    # ── writer ───────────────────────────────────────────────────────────────
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._writer_loop, name="news-writer",
+                                            daemon=True)
+            self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                while not self.pending:
+                    self._cond.wait()
+                while self.pending:
+                    now = time.monotonic()
+                    due = min(self.last_pending + self.flush_delay,
+                              self.first_pending + self.flush_max)
+                    if now >= due:
+                        self._flush_locked()
+                        break
+                    self._cond.wait(due - now)
+
+    def _postpone(self):
+        """Retry the flush one flush_delay from now instead of spinning on a failure."""
+        self.first_pending = self.last_pending = time.monotonic()
+
+    def _flush_locked(self):
+        # the ingest may have replaced news.json since the last prune
+        if not self._refresh():
+            app.logger.warning("news.json unreadable (ingest writing?); postponing prune flush.")
+            self._postpone()
             return
-
-        norm_url = normalize_url(url) if url else ""
-        removed = 0
-        kept = []
-        for it in items:
-            it_title = (it.get("title") or "").strip()
-            it_source = (it.get("source") or "").strip()
-            it_url_raw = it.get("url") or ""
-            it_url = normalize_url(it_url_raw)
-            it_key = build_article_key(it_title, it_source, it_url)
-
-            match = False
-            # Exact key match (preferred)
-            if key and it_key and key == it_key:
-                match = True
-            # Normalized URL match
-            elif norm_url and it_url and norm_url == it_url:
-                match = True
-            # Title + source fallback (case-insensitive)
-            elif title and it_title and title.strip().lower() == it_title.strip().lower():
-                match = True
-
-            if match:
-                removed += 1
-                app.logger.debug("Pruning news.json matching feedback: %s", it_title)
-            else:
-                kept.append(it)
-
-        if removed:
-            # Write back the pruned list atomically
-            tmp_path = NEWS_PATH + ".tmp"
+        if not self.pending:
+            return
+        kept = [it for pos, it in enumerate(self.items) if pos not in self.removed]
+        try:
+            tmp_path = self.path + ".tmp"
             with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump(kept, f, indent=2, ensure_ascii=False)
-            os.replace(tmp_path, NEWS_PATH)
-            app.logger.info("Pruned %d items from news.json due to feedback.", removed)
-        else:
-            app.logger.debug("No items pruned from news.json for this feedback.")
-    except Exception as e:
-        app.logger.exception("Error pruning news.json: %s", e)
+            if self._stat() != self.signature:
+                # news.json changed while we serialized — never overwrite output we have not loaded
+                os.remove(tmp_path)
+                app.logger.warning("news.json changed during prune flush; postponing.")
+                self._postpone()
+                return
+            os.replace(tmp_path, self.path)
+        except Exception:
+            app.logger.exception("Error writing pruned news.json")
+            self._postpone()
+            return
+        app.logger.info("Pruned %d items from news.json (%d feedback prunes, one write).",
+                        len(self.removed), len(self.pending))
+        self.pending = []
+        self._index(kept)
+        self.signature = self._stat()
+        self.writes += 1
+
+    def flush(self):
+        """Write any pending prunes now (shutdown)."""
+        with self._cond:
+            if self.pending:
+                self._flush_locked()
+
+    def stats(self):
+        with self._cond:
+            return {"items": len(self.items) - len(self.removed), "pending_prunes": len(self.pending),
+                    "loads": self.loads, "writes": self.writes}
+
+
+NEWS_INDEX = NewsIndex(NEWS_PATH)
+atexit.register(NEWS_INDEX.flush)
 
 
 @app.route("/feedback", methods=["POST"])
@@ -202,17 +429,22 @@ def feedback():
         app.logger.exception("Failed to persist feedback: %s", e)
         return jsonify({"error": "failed to persist feedback"}), 500
 
-    # Prune news.json quickly in background for immediate UX fix
+    # Prune the in-memory news index for immediate UX fix; the writer flushes it
     try:
-        t = threading.Thread(target=_prune_news_for_feedback, args=(key, title, norm_url, source), daemon=True)
-        t.start()
+        pruned = NEWS_INDEX.prune(key, title, norm_url)
     except Exception:
-        app.logger.exception("Failed to start prune thread.")
+        app.logger.exception("Failed to prune news index.")
+        pruned = 0
+
+    # Ask for a full ingest; bursts of feedback coalesce into one queued run
+    ingest_queued = _trigger_ingest()
+
+    return jsonify({"ok": True, "key": key, "pruned": pruned, "ingest_queued": ingest_queued}), 200
 
-    # Trigger full ingest in background as before
-    _trigger_ingest()
 
-    return jsonify({"ok": True, "key": key}), 200
+@app.route("/ingest/status", methods=["GET"])
+def ingest_status():
+    return jsonify(INGEST.status()), 200
 
 
 @app.route("/health", methods=["GET"])
@@ -223,6 +455,7 @@ def health():
             "feedback_file_exists": os.path.exists(FEEDBACK_PATH),
             "news_file_exists": os.path.exists(NEWS_PATH),
             "ingest_script": INGEST_SCRIPT or "not-found",
+            "news_index": NEWS_INDEX.stats(),
         }
     ), 200
 
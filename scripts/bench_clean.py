@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark + parity check for news_agent._clean (fast tag stripper vs BeautifulSoup).
+
+Samples are the summary/content HTML recorded in the feed cache
+(public/data/.cache/feeds.json, written by every scout run). Without a cache,
+a small built-in set shaped like the feeds in FEEDS is used.
+
+Parity: for every sample, the first RAW_BODY_CHARS characters produced by
+_clean(html, limit=RAW_BODY_CHARS) must equal BeautifulSoup's get_text(" ", strip=True).
+Exits 1 on any mismatch.
+
+Usage:  python scripts/bench_clean.py [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import time
+import warnings
+
+from bs4 import BeautifulSoup
+
+from news_agent import FEED_CACHE_PATH, RAW_BODY_CHARS, _clean, _fast_text
+
+warnings.filterwarnings("ignore", module="bs4")
+
+_LONG_ARTICLE = "".join(
+    f"<p>Paragraph {i}: dock workers at the Port of Rotterdam extended their strike &mdash; "
+    f"<a href=\"https://example.com/p/{i}?utm_source=rss&amp;x=1\">container traffic</a> "
+    f"is backed up for a {i}th day, officials said.</p>\n"
+    for i in range(120)
+)
+
+BUILTIN_SAMPLES = [
+    # Guardian / BBC style summary
+    '<p>Protesters gathered outside parliament in Nairobi as police fired tear gas.</p>'
+    '<a href="https://www.theguardian.com/world/kenya">Continue reading...</a>',
+    # Google News search result
+    '<a href="https://news.google.com/rss/articles/CBMi?oc=5" target="_blank">'
+    'Brent crude jumps 4% after OPEC+ output cut</a>&nbsp;&nbsp;<font color="#6f6f6f">Reuters</font>',
+    # WordPress feed with image + entities
+    '<figure><img src="https://latinamericareports.com/x.jpg" alt="Strike &gt; day 3" '
+    'width="300" /></figure><p>Truckers&#8217; strike enters third day &#8211; '
+    'roads blocked around S&atilde;o Paulo&hellip;</p><p>The post <a href="https://x">'
+    'Truckers strike</a> appeared first on <a href="https://y">LATAM Reports</a>.</p>',
+    # Reddit content with table markup and a comment
+    '<!-- SC_OFF --><div class="md"><p>Dell layoffs announced today?</p>'
+    '<table><tr><td>&#32; submitted by &#32; <a href="https://www.reddit.com/user/x"> /u/x </a>'
+    '</td></tr></table></div><!-- SC_ON -->',
+    # Plain text summary (no markup)
+    "Magnitude 6.1 earthquake strikes off the coast of Taiwan, no tsunami warning issued.",
+    # Malformed / special markup — must go through the BeautifulSoup fallback
+    '<p>R&D centre closed <b>unclosed',
+    '<script>trackPageview()</script><p>Airport closed due to typhoon</p>',
+    # Long article body — the early-stop case
+    _LONG_ARTICLE,
+]
+
+
+def load_samples():
+    """Recorded feed HTML from the scout's feed cache, else the built-in samples."""
+    try:
+        with open(FEED_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return BUILTIN_SAMPLES, "built-in"
+    samples = [e[k] for feed in cache.values() for e in feed.get("entries", [])
+               for k in ("summary", "content") if e.get(k)]
+    return (samples, FEED_CACHE_PATH) if samples else (BUILTIN_SAMPLES, "built-in")
+
+
+def _time(fn, samples, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for html in samples:
+            fn(html)
+    return time.perf_counter() - started
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args()
+
+    samples, origin = load_samples()
+    total_kb = sum(len(s) for s in samples) / 1024
+    print(f"{len(samples)} samples ({total_kb:.1f} KB) from {origin}")
+
+    mismatches = 0
+    for html in samples:
+        ref = BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+        if _clean(html, limit=RAW_BODY_CHARS)[:RAW_BODY_CHARS] != ref[:RAW_BODY_CHARS] or \
+                _clean(html) != ref:
+            mismatches += 1
+            print(f"  MISMATCH: {html[:120]!r}")
+    fast_share = sum(_fast_text(h, RAW_BODY_CHARS) is not None for h in samples) / len(samples)
+
+    bs_s   = _time(lambda h: BeautifulSoup(h, "html.parser").get_text(" ", strip=True),
+                   samples, args.repeat)
+    fast_s = _time(lambda h: _clean(h, limit=RAW_BODY_CHARS), samples, args.repeat)
+    n = len(samples) * args.repeat
+    print(f"BeautifulSoup      : {bs_s * 1e6 / n:8.1f} µs/entry")
+    print(f"_clean (limit={RAW_BODY_CHARS}): {fast_s * 1e6 / n:8.1f} µs/entry "
+          f"→ {bs_s / fast_s:.1f}× faster, {fast_share:.0%} on the fast path")
+    print(f"parity: {len(samples) - mismatches}/{len(samples)} identical")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for geo_index.GeoIndex against the linear haversine scans it replaced.
+
+For each asset count, random assets (clustered around the real Dell sites from
+config/locations.json, else uniform over the globe) are indexed and queried
+with random event points. Reports µs/query for the nearest-site lookup
+(k=1), the proximity top-10 within 500 km, and a radius query, and checks
+that the index returns the same items and distances as the linear scan.
+
+Usage:  python scripts/bench_geo.py [--sizes 200,1000,5000,20000,50000] [--queries N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from geo_index import GeoIndex, haversine_km
+
+BASE_DIR       = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCATIONS_PATH = os.path.join(BASE_DIR, "config", "locations.json")
+RADIUS_KM      = 500.0
+
+
+def _seeds():
+    try:
+        with open(LOCATIONS_PATH, "r", encoding="utf-8") as f:
+            return [(float(s["lat"]), float(s["lon"])) for s in json.load(f)]
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+
+
+def synthetic(n, seeds, rnd):
+    """n assets; most within a few hundred km of a real site, the rest anywhere."""
+    out = []
+    for i in range(n):
+        if seeds and rnd.random() < 0.8:
+            lat, lon = rnd.choice(seeds)
+            lat = max(-89.9, min(89.9, lat + rnd.gauss(0, 3)))
+            lon = (lon + rnd.gauss(0, 3) + 180) % 360 - 180
+        else:
+            lat, lon = rnd.uniform(-60, 70), rnd.uniform(-180, 180)
+        out.append({"name": f"asset-{i}", "lat": lat, "lon": lon})
+    return out
+
+
+# ── the linear scans, as they were in news_agent / generate_reports ─────────
+def linear_nearest(assets, lat, lon):
+    best, best_d = None, float("inf")
+    for a in assets:
+        d = haversine_km(lat, lon, a["lat"], a["lon"])
+        if d < best_d:
+            best_d, best = d, a
+    return [(best_d, best)]
+
+
+def linear_within(assets, lat, lon, km, limit=None):
+    rows = []
+    for a in assets:
+        d = haversine_km(lat, lon, a["lat"], a["lon"])
+        if d <= km:
+            rows.append((d, a))
+    rows.sort(key=lambda r: r[0])
+    return rows[:limit] if limit else rows
+
+
+def _time(fn, queries):
+    started = time.perf_counter()
+    out = [fn(lat, lon) for lat, lon in queries]
+    return (time.perf_counter() - started) * 1e6 / len(queries), out
+
+
+def _same(a, b):
+    return len(a) == len(b) and all(da == db and x["name"] == y["name"]
+                                    for (da, x), (db, y) in zip(a, b))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--sizes", default="200,1000,5000,20000,50000")
+    ap.add_argument("--queries", type=int, default=500)
+    args = ap.parse_args()
+
+    seeds = _seeds()
+    rnd   = random.Random(7)
+    print(f"assets clustered around {len(seeds)} sites" if seeds else "uniform random assets")
+    print(f"{'assets':>7} {'build ms':>9} | {'nearest µs lin/idx':>20} | "
+          f"{'top10@500km µs lin/idx':>24} | {'radius µs lin/idx':>20} | parity")
+    failures = 0
+    for n in [int(x) for x in args.sizes.split(",")]:
+        assets  = synthetic(n, seeds, rnd)
+        queries = [(a["lat"] + rnd.gauss(0, 1), a["lon"] + rnd.gauss(0, 1))
+                   for a in rnd.sample(assets, min(args.queries, n))]
+
+        started = time.perf_counter()
+        index   = GeoIndex(assets)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        l1, r1 = _time(lambda la, lo: linear_nearest(assets, la, lo), queries)
+        i1, x1 = _time(lambda la, lo: index.k_nearest(la, lo, 1), queries)
+        l2, r2 = _time(lambda la, lo: linear_within(assets, la, lo, RADIUS_KM, 10), queries)
+        i2, x2 = _time(lambda la, lo: index.k_nearest(la, lo, 10, max_km=RADIUS_KM), queries)
+        l3, r3 = _time(lambda la, lo: linear_within(assets, la, lo, 100.0), queries)
+        i3, x3 = _time(lambda la, lo: index.within_radius(la, lo, 100.0), queries)
+
+        # top-10 may legitimately differ in order among exact-distance ties
+        bad = (sum(not _same(a, b) for a, b in zip(r1, x1))
+               + sum([d for d, _ in a] != [d for d, _ in b] for a, b in zip(r2, x2))
+               + sum(not _same(a, b) for a, b in zip(r3, x3)))
+        failures += bad
+        print(f"{n:>7} {build_ms:>9.1f} | {l1:>8.1f} / {i1:>6.1f} {l1 / i1:>4.0f}× | "
+              f"{l2:>10.1f} / {i2:>6.1f} {l2 / i2:>4.0f}× | {l3:>8.1f} / {i3:>6.1f} {l3 / i3:>4.0f}× | "
+              f"{'ok' if not bad else f'{bad} mismatches'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
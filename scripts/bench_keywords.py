@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for news_agent.keyword_classify (one TermBuckets pass per article)
+against the previous implementation (eight re.search calls per article).
+
+Articles are the titles + summaries recorded in the feed cache
+(public/data/.cache/feeds.json), cycled up to --articles; without a cache a
+synthetic corpus is generated from security and off-topic phrases.
+
+Reports µs/article for both, and every article where the two disagree
+(there should be none — same terms, same first-match order, same result).
+
+Usage:  python scripts/bench_keywords.py [--articles N]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+
+from news_agent import (FEED_CACHE_PATH, RAW_BODY_CHARS, _CYBER_ONLY, _DELL_MENTION, _clean,
+                        keyword_classify)
+
+_CHECKS = [
+    (r"\b(protest|riot|unrest|coup|curfew|martial.law|demonstration|civil.war|"
+     r"attack|bomb|explosion|shooting|terror|hostage|armed|troops|military.action)\b",
+     "PHYSICAL_SECURITY", "HIGH"),
+    (r"\b(strike|industrial.action|walkout|picket|work.stoppage|"
+     r"teachers?.strike|school.clos|transport.strike|bus.strike|train.strike|"
+     r"metro.strike|transit.strike|dock.strike|port.strike)\b",
+     "LABOR_ACTION", "MEDIUM"),
+    (r"\b(port.clos|shipping.disrupt|supply.chain|cargo.disrupt|"
+     r"container.shortage|logistics.halt|factory.clos|manufacturing.halt|"
+     r"freight.disrupt|airspace.clos|airport.clos)\b",
+     "SUPPLY_CHAIN", "MEDIUM"),
+    (r"\b(earthquake|tsunami|typhoon|hurricane|flood|wildfire|eruption|"
+     r"disaster|emergency.declar|evacuation|state.of.emergency)\b",
+     "NATURAL_DISASTER", "HIGH"),
+    (r"\b(power.outage|blackout|grid.failure|infrastructure.attack|"
+     r"internet.outage|road.clos|bridge.clos)\b",
+     "INFRASTRUCTURE", "MEDIUM"),
+    (r"\b(outbreak|epidemic|pandemic|quarantine|health.advisory|"
+     r"travel.ban|disease.spread|health.emergency)\b",
+     "HEALTH_WORKFORCE", "MEDIUM"),
+    (r"\b(travel.advisory|do.not.travel|border.clos|embassy|"
+     r"evacuation.order|safety.alert)\b",
+     "TRAVEL_SECURITY", "MEDIUM"),
+    (r"\b(dell.layoff|dell.breach|dell.incident|dell.restructur|"
+     r"dell.executive|dell.ceo|dell.cto|dell.insider)\b",
+     "BRAND_MONITORING", "HIGH"),
+]
+
+
+def legacy_keyword_classify(title, body):
+    """The previous implementation, kept here as the baseline."""
+    text = (title + " " + body).lower()
+    if _CYBER_ONLY.search(text) and not _DELL_MENTION.search(text):
+        return None
+    checks = list(_CHECKS)   # the old code rebuilt this list on every call
+    for pattern, cat, sev in checks:
+        if re.search(pattern, text, flags=re.IGNORECASE):
+            return {"category": cat, "score": 6, "severity": sev,
+                    "operational_impact": f"{cat.replace('_', ' ').title()} event detected.",
+                    "locations": [], "dell_region": "Global"}
+    return None
+
+
+_EVENTS = [
+    "Teachers strike closes schools across {city}", "Port strike halts container traffic in {city}",
+    "Magnitude 6.2 earthquake strikes near {city}", "Protesters clash with police in {city}",
+    "Typhoon forces evacuation of coastal {city}", "Power outage leaves {city} in the dark",
+    "Airport closure strands thousands in {city}", "Bomb threat prompts evacuation in {city}",
+    "Cholera outbreak reported in {city}", "Government issues travel advisory for {city}",
+    "Dell layoffs hit {city} campus", "Ransomware gang leaks data from {city} hospital",
+]
+_FILLER = [
+    "Stocks rallied on Tuesday as investors weighed central bank comments.",
+    "The local team secured a late win in front of a home crowd.",
+    "Officials said the situation was being monitored and more details would follow.",
+    "Residents were urged to follow guidance from local authorities.",
+    "Analysts expect the disruption to last several days, according to reports.",
+]
+_CITIES = ["Sydney", "Paris", "Nairobi", "Manila", "Austin", "São Paulo", "Bengaluru", "Lodz"]
+
+
+def synthetic(n, seed=7):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        if rnd.random() < 0.6:
+            title = rnd.choice(_EVENTS).format(city=rnd.choice(_CITIES))
+        else:
+            title = rnd.choice(_FILLER)[:70]
+        body = " ".join(rnd.choice(_FILLER) for _ in range(rnd.randint(2, 6)))
+        out.append((title, body[:RAW_BODY_CHARS]))
+    return out
+
+
+def load_articles(n):
+    """Feed-cache entries cycled up to n articles, else a synthetic corpus."""
+    try:
+        with open(FEED_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        base = [(e.get("title") or "", _clean(e.get("content") or e.get("summary") or "",
+                                              limit=RAW_BODY_CHARS))
+                for feed in cache.values() for e in feed.get("entries", [])]
+    except (OSError, ValueError):
+        base = []
+    if not base:
+        return synthetic(n), "synthetic"
+    return [base[i % len(base)] for i in range(n)], FEED_CACHE_PATH
+
+
+def _time(fn, articles):
+    started = time.perf_counter()
+    out = [fn(t, b) for t, b in articles]
+    return time.perf_counter() - started, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--articles", type=int, default=20000)
+    args = ap.parse_args()
+
+    articles, origin = load_articles(args.articles)
+    print(f"{len(articles)} articles from {origin}")
+
+    legacy_s, legacy = _time(legacy_keyword_classify, articles)
+    new_s,    new    = _time(keyword_classify, articles)
+    n = len(articles)
+    print(f"legacy first-match : {legacy_s * 1e6 / n:7.1f} µs/article")
+    print(f"keyword_classify   : {new_s * 1e6 / n:7.1f} µs/article → {legacy_s / new_s:.1f}× faster")
+
+    diff = [(a, o, r) for a, o, r in zip(articles, legacy, new) if o != r]
+    print(f"classified: legacy {sum(r is not None for r in legacy)}, "
+          f"new {sum(r is not None for r in new)}; {len(diff)} mismatches")
+    for (title, _), o, r in diff[:5]:
+        print(f"  {title[:60]!r}: legacy {o and o['category']} / new {r and r['category']}")
+    return 1 if diff else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
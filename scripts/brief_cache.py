@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of AI site briefs for generate_reports.py.
+
+An ongoing event (a multi-day port strike, a cyclone track) keeps matching the
+same Dell sites run after run; without a cache every 6-hour run re-briefs it
+and spends the MAX_AI_BRIEFS budget on repeats. Briefs are stored in
+public/data/.cache/site_briefs.json keyed by
+
+    article key (normalized URL, else content hash) | site | distance bucket | model
+
+Each entry carries a fingerprint of the article's severity and content; when
+either changes the entry is dropped and the site is re-briefed. Entries expire
+after ttl_s and the least recently used are evicted beyond max_entries.
+
+    python scripts/brief_cache.py stats
+    python scripts/brief_cache.py clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+BASE_DIR   = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_PATH = os.path.join(BASE_DIR, "public", "data", ".cache", "site_briefs.json")
+
+TTL_S       = 24 * 3600   # re-brief an unchanged event at most once a day
+MAX_ENTRIES = 2000
+DISTANCE_BUCKETS_KM = (15, 50, 150, 300)   # the proximity bands of the brief prompt
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "ocid", "cmpid")
+
+
+def normalize_url(url):
+    """Lowercased scheme/host, no fragment, tracking params or trailing slash."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(_TRACKING_PARAMS)]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(),
+                       parts.path.rstrip("/"), urlencode(query), ""))
+
+
+def _text(article):
+    return (article.get("body") or article.get("snippet") or article.get("summary") or "").strip()
+
+
+def content_hash(article):
+    """Hash of what the brief is written from: title and body text."""
+    raw = f"{(article.get('title') or '').strip()}\n{_text(article)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def article_key(article):
+    """Normalized URL, else the content hash."""
+    return normalize_url(article.get("url") or article.get("link")) or content_hash(article)
+
+
+def fingerprint(article):
+    """Changes whenever the article's severity or content does."""
+    return f"{article.get('severity', 1)}:{content_hash(article)}"
+
+
+def distance_bucket(distance_km):
+    """0 for a city-level match (no distance), else 1.. by DISTANCE_BUCKETS_KM band."""
+    if not distance_km:
+        return 0
+    for i, limit in enumerate(DISTANCE_BUCKETS_KM, 1):
+        if distance_km <= limit:
+            return i
+    return len(DISTANCE_BUCKETS_KM) + 1
+
+
+class BriefCache:
+    """
+    lookup()/put() by (article, site, distance, model); load() restores the
+    snapshot dropping expired entries, save() persists it trimmed to
+    max_entries (least recently used go first). Not thread-safe — the
+    caller looks up and stores from one thread.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl_s=TTL_S, max_entries=MAX_ENTRIES):
+        self.path        = path
+        self.ttl_s       = ttl_s
+        self.max_entries = max_entries
+        self.entries     = {}   # key → entry, least recently used first
+        self.hits = self.misses = self.invalidated = 0
+
+    @staticmethod
+    def key(article, site_name, distance_km, model):
+        return f"{article_key(article)}|{site_name}|{distance_bucket(distance_km)}|{model}"
+
+    def _fresh(self, entry, now):
+        return now - entry.get("created", 0) <= self.ttl_s
+
+    # ── persistence ───────────────────────────────────────────────────────────
+    def load(self):
+        self.entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            now = time.time()
+            rows = sorted(snap["entries"].items(), key=lambda kv: kv[1].get("used", 0))
+            self.entries = {k: e for k, e in rows if isinstance(e, dict) and self._fresh(e, now)}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+        return self
+
+    def save(self):
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self.entries}, f,
+                      ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    # ── lookups ───────────────────────────────────────────────────────────────
+    def lookup(self, article, site_name, distance_km, models):
+        """
+        (brief, status) for the first of `models` with a valid entry. status is
+        "hit", or for a miss "changed" (the article's severity/content moved
+        since it was briefed), "expired" or "miss".
+        """
+        now, status = time.time(), "miss"
+        for model in models:
+            key   = self.key(article, site_name, distance_km, model)
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                continue
+            if not self._fresh(entry, now):
+                status = "expired" if status == "miss" else status
+                continue
+            if entry.get("fingerprint") != fingerprint(article):
+                self.invalidated += 1
+                status = "changed"
+                continue
+            entry["used"] = now
+            self.entries[key] = entry   # most recently used last
+            self.hits += 1
+            return dict(entry["brief"]), "hit"
+        self.misses += 1
+        return None, status
+
+    def put(self, article, site_name, distance_km, brief):
+        if not brief or not brief.get("ai_model"):
+            return
+        now = time.time()
+        key = self.key(article, site_name, distance_km, brief["ai_model"])
+        self.entries.pop(key, None)
+        self.entries[key] = {"brief": dict(brief), "fingerprint": fingerprint(article),
+                             "created": now, "used": now}
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="SRO site-brief cache")
+    ap.add_argument("command", choices=("stats", "clear"))
+    ap.add_argument("--path", default=CACHE_PATH)
+    args = ap.parse_args()
+
+    if args.command == "clear":
+        if os.path.exists(args.path):
+            os.remove(args.path)
+        print(f"Cleared {args.path}")
+        return 0
+    cache = BriefCache(args.path).load()
+    models = {}
+    for key in cache.entries:
+        model = key.rsplit("|", 1)[-1]
+        models[model] = models.get(model, 0) + 1
+    print(f"{len(cache)} live briefs {models} (ttl {cache.ttl_s // 3600}h, max {cache.max_entries})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Indexed analyst-feedback store for the SRO pipeline.
+
+feedback_api.py appends one JSON line per analyst label to
+public/data/feedback.jsonl, forever. FeedbackStore keeps the compacted view
+(latest label per article key wins) in a snapshot under public/data/.cache/
+together with a byte-offset watermark into the log, so each run only parses
+the lines appended since the previous one. Lookups are a dict probe.
+
+The snapshot is trusted only while the log still holds the same bytes just
+before the watermark; a truncated or rewritten log triggers a full rebuild.
+
+Compaction rewrites the log with one line (the latest record) per key:
+
+    python scripts/feedback_store.py compact
+    python scripts/feedback_store.py stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+BASE_DIR      = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR      = os.path.join(BASE_DIR, "public", "data")
+FEEDBACK_PATH = os.path.join(DATA_DIR, "feedback.jsonl")
+SNAPSHOT_PATH = os.path.join(DATA_DIR, ".cache", "feedback_index.json")
+
+BLOCK_LABELS  = frozenset({"NOT_RELEVANT"})
+BOOST_LABELS  = frozenset({"CRITICAL", "KEEP"})
+FINGERPRINT_BYTES = 256   # log bytes just before the watermark that must not change
+
+
+def feedback_key(obj):
+    """Article key of one feedback record: normalized URL, else title (lowercased)."""
+    url   = (obj.get("url") or "").strip().lower()
+    title = (obj.get("title") or "").strip().lower()
+    return url or title
+
+
+def _fingerprint(f, offset):
+    start = max(0, offset - FINGERPRINT_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+class FeedbackStore:
+    """
+    Latest label per article key. load() restores the snapshot and parses only
+    the log lines past its watermark; save() persists snapshot + watermark.
+    blocked()/boosted() take any number of candidate keys (URL key, title key).
+    """
+
+    def __init__(self, log_path=FEEDBACK_PATH, snapshot_path=SNAPSHOT_PATH):
+        self.log_path      = log_path
+        self.snapshot_path = snapshot_path
+        self.labels        = {}   # key → latest label
+        self.offset        = 0    # bytes of the log folded into self.labels
+        self.parsed        = 0    # log lines parsed by the last load()
+        self.rebuilt       = False
+
+    # ── loading ───────────────────────────────────────────────────────────────
+    def _restore(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            offset = int(snap["offset"])
+            with open(self.log_path, "rb") as log:
+                log.seek(0, os.SEEK_END)
+                if log.tell() < offset or _fingerprint(log, offset) != snap["fingerprint"]:
+                    return False
+            self.labels, self.offset = dict(snap["labels"]), offset
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+    def _apply(self, line):
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(obj, dict):
+            return
+        label = (obj.get("label") or "").strip().upper()
+        key   = feedback_key(obj)
+        if key and label:
+            self.labels[key] = label
+
+    def _read_tail(self):
+        """Fold complete lines past the watermark; a half-written last line waits for next time."""
+        with open(self.log_path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._apply(line.decode("utf-8", errors="replace"))
+                self.parsed += 1
+        self.offset += end
+
+    def load(self):
+        self.labels, self.offset, self.parsed = {}, 0, 0
+        if not os.path.exists(self.log_path):
+            return self
+        self.rebuilt = not self._restore()
+        if self.rebuilt:
+            self.labels, self.offset = {}, 0
+        self._read_tail()
+        return self
+
+    def save(self):
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, "rb") as log:
+            fingerprint = _fingerprint(log, self.offset)
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "offset": self.offset, "fingerprint": fingerprint,
+                       "labels": self.labels}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.snapshot_path)
+
+    # ── lookups ───────────────────────────────────────────────────────────────
+    def label(self, key):
+        return self.labels.get(key)
+
+    def blocked(self, *keys):
+        return any(self.labels.get(k) in BLOCK_LABELS for k in keys if k)
+
+    def boosted(self, *keys):
+        return any(self.labels.get(k) in BOOST_LABELS for k in keys if k)
+
+    def counts(self):
+        out = {}
+        for label in self.labels.values():
+            out[label] = out.get(label, 0) + 1
+        return out
+
+    # ── compaction ────────────────────────────────────────────────────────────
+    def compact(self):
+        """
+        Rewrite the log keeping only the latest record per key, then reset the
+        snapshot. Lines appended while compacting are carried over before the
+        swap (only an append landing between the final size check and the
+        rename can be lost). Returns (lines before, lines after).
+        """
+        latest = {}   # key → raw line, re-inserted so the order is by last write
+        before, offset = 0, 0
+        while True:
+            with open(self.log_path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+            end = data.rfind(b"\n") + 1
+            for raw in data[:end].splitlines():
+                line = raw.decode("utf-8", errors="replace").strip()
+                if not line:
+                    continue
+                before += 1
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(obj, dict) or not (obj.get("label") or "").strip():
+                    continue
+                key = feedback_key(obj)
+                if key:
+                    latest.pop(key, None)
+                    latest[key] = line
+            offset += end
+
+            tmp = self.log_path + ".compact"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(line + "\n" for line in latest.values())
+            if os.path.getsize(self.log_path) == offset:
+                written = os.path.getsize(tmp)
+                os.replace(tmp, self.log_path)
+                break
+            # feedback_api appended while we were writing — fold it in and retry
+
+        self.labels, self.offset = {}, written
+        for line in latest.values():
+            self._apply(line)
+        self.save()
+        return before, len(latest)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="SRO analyst feedback store")
+    ap.add_argument("command", choices=("compact", "stats"))
+    ap.add_argument("--log", default=FEEDBACK_PATH)
+    ap.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    args = ap.parse_args()
+
+    store = FeedbackStore(args.log, args.snapshot)
+    if not os.path.exists(args.log):
+        print(f"No feedback log at {args.log}")
+        return 0
+    if args.command == "compact":
+        started = time.monotonic()
+        before, after = store.compact()
+        print(f"Compacted {args.log}: {before} → {after} lines "
+              f"in {time.monotonic() - started:.2f}s")
+    else:
+        started = time.monotonic()
+        store.load()
+        store.save()
+        print(f"{len(store.labels)} keys {store.counts()} | parsed {store.parsed} new lines "
+              f"({'full rebuild' if store.rebuilt else 'incremental'}) "
+              f"in {(time.monotonic() - started) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,23 @@
+import hashlib
 import json
 import os
 import re
 import time
-import urllib.request
+import unicodedata
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta, timezone
-from math import radians, sin, cos, asin, sqrt
 from typing import List, Dict, Any, Optional
 
 from json import JSONDecodeError
 
+from brief_cache import BriefCache, article_key, normalize_url
+from geo_index import GeoIndex, SiteDistances, haversine_km
+from http_client import HttpClient
+from rate_limit import SlidingWindowLimiter, parse_duration_s
+from term_scan import TermBuckets, alternatives
+
 # ── AI config — Gemini primary, Groq fallback ────────────────────────────────
 GEMINI_API_KEY    = os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL      = "gemini-2.0-flash"
@@ -21,8 +28,20 @@ GROQ_MODEL        = "llama-3.1-8b-instant"
 GROQ_ENDPOINT     = "https://api.groq.com/openai/v1/chat/completions"
 
 MAX_AI_BRIEFS     = 25    # cap AI calls per run
-GROQ_DELAY_S      = 2.0   # stay under 30 RPM free limit
-GEMINI_DELAY_S    = 5.0   # stay under 15 RPM free limit
+GROQ_RPM          = 30    # free tier: 30 requests / minute
+GEMINI_RPM        = 15    # free tier: 15 requests / minute
+BRIEF_WORKERS     = 4     # brief requests in flight; the limiters do the pacing
+BRIEF_BATCH_SIZE  = 4     # (article, site) pairs per request; 1 = one call per brief
+BRIEF_BATCH_TOKENS_PER_ITEM = 450
+
+GEMINI_LIMITER    = SlidingWindowLimiter(GEMINI_RPM)
+GROQ_LIMITER      = SlidingWindowLimiter(GROQ_RPM)
+
+# Briefs persist across runs (public/data/.cache/) so ongoing events are not re-briefed
+BRIEF_CACHE       = BriefCache()
+
+# Keep-alive pool for the brief / summary calls — one TLS handshake per host per run
+HTTP = HttpClient(default_timeout=20)
 
 # ── Site context — tells AI exactly what each site does ──────────────────────
 # This is what makes the assessment specific rather than generic
@@ -99,15 +118,19 @@ def _infer_site_type(site_name: str) -> str:
         return "Regional / Corporate HQ"
     return "Commercial Office"
 
-def _build_brief_prompt(article: Dict[str, Any], site_name: str,
-                         site_region: str, distance_km: float,
-                         match_tier: str) -> str:
-    """
-    Build the intelligence brief prompt. This is the 'brain' — the quality
-    of this prompt determines the quality of every RSM alert.
-    """
-    site_type    = _infer_site_type(site_name)
-    site_context = _get_site_context(site_name)
+_SEV_LABELS = {1:"LOW",2:"MEDIUM",3:"HIGH",4:"CRITICAL"}
+
+_BRIEF_HEADER = """You are generating a PROXIMITY INTELLIGENCE ALERT for a Dell Technologies Regional Security Manager (RSM).
+The RSM needs accurate, specific, actionable intelligence — not generic statements."""
+
+# Field instructions shared by the single and batched prompts
+_BRIEF_FIELDS = """  "site_impact": "2-3 sentences. Name the site AND the event explicitly. Be precise about what operational aspect is affected (workforce attendance / building access / supply chain / production / executive safety). Calibrate to the actual distance — a 250km storm ≠ immediate evacuation. Never say 'Dell employees and facilities may be affected' — that is too generic.",
+  "rsm_action": "Exactly 3 bullet points starting with action verbs. Each must be immediately executable by THIS RSM at THIS site. Example: '1. Contact site security lead to confirm building access status. 2. Activate employee check-in protocol for staff within 10km of incident. 3. Notify APJC Security Director and await further guidance.' Tailor to site type — manufacturing sites → production continuity; HQ → executive safety + comms; office → workforce attendance.",
+  "second_order": "One sentence on the most likely cascading effect. For labor actions consider childcare/school closures. For natural disasters consider supply chain and logistics. For civil unrest consider executive travel risk. Empty string if genuinely none.\""""
+
+
+def _brief_event_section(article: Dict[str, Any], label: str = "EVENT") -> str:
+    """EVENT + INTEL PIPELINE NOTES blocks of the brief prompt."""
     category     = article.get("category", "UNKNOWN")
     title        = article.get("title", "")
     snippet      = (article.get("body") or article.get("snippet")
@@ -115,9 +138,27 @@ def _build_brief_prompt(article: Dict[str, Any], site_name: str,
     op_impact    = article.get("operational_impact", "")
     second_ord   = article.get("second_order", "")
     sev_raw      = article.get("severity", 2)
-    sev_label    = {1:"LOW",2:"MEDIUM",3:"HIGH",4:"CRITICAL"}.get(int(sev_raw), "MEDIUM")
+    sev_label    = _SEV_LABELS.get(int(sev_raw), "MEDIUM")
     pub_time     = article.get("time") or article.get("timestamp", "recent")
 
+    return f"""━━━ {label} ━━━
+Title:     {title}
+Category:  {category}
+Severity:  {sev_label}
+Published: {pub_time}
+Context:   {snippet}
+
+━━━ INTEL PIPELINE NOTES ━━━
+Operational impact (AI-classified): {op_impact or 'not available'}
+Second-order effects (AI-classified): {second_ord or 'not available'}"""
+
+
+def _brief_site_section(site_name: str, site_region: str, distance_km: float,
+                        match_tier: str, label: str = "DELL SITE") -> str:
+    """DELL SITE + PROXIMITY blocks of the brief prompt."""
+    site_type    = _infer_site_type(site_name)
+    site_context = _get_site_context(site_name)
+
     dist_str = f"{round(distance_km, 1)}km" if distance_km else "within city"
     if match_tier == "coordinate":
         dist_note = f"{dist_str} (precise GPS location)"
@@ -136,21 +177,7 @@ def _build_brief_prompt(article: Dict[str, Any], site_name: str,
     else:
         proximity_context = "STRATEGIC AWARENESS — relevant due to ballistic/military threat radius."
 
-    return f"""You are generating a PROXIMITY INTELLIGENCE ALERT for a Dell Technologies Regional Security Manager (RSM).
-The RSM needs accurate, specific, actionable intelligence — not generic statements.
-
-━━━ EVENT ━━━
-Title:     {title}
-Category:  {category}
-Severity:  {sev_label}
-Published: {pub_time}
-Context:   {snippet}
-
-━━━ INTEL PIPELINE NOTES ━━━
-Operational impact (AI-classified): {op_impact or 'not available'}
-Second-order effects (AI-classified): {second_ord or 'not available'}
-
-━━━ DELL SITE ━━━
+    return f"""━━━ {label} ━━━
 Site:     {site_name}
 Type:     {site_type}
 Context:  {site_context}
@@ -158,15 +185,29 @@ Region:   {site_region}
 
 ━━━ PROXIMITY ━━━
 Distance: {dist_note}
-Assessment: {proximity_context}
+Assessment: {proximity_context}"""
+
+
+def _build_brief_prompt(article: Dict[str, Any], site_name: str,
+                         site_region: str, distance_km: float,
+                         match_tier: str) -> str:
+    """
+    Build the intelligence brief prompt. This is the 'brain' — the quality
+    of this prompt determines the quality of every RSM alert.
+    """
+    site_type = _infer_site_type(site_name)
+
+    return f"""{_BRIEF_HEADER}
+
+{_brief_event_section(article)}
+
+{_brief_site_section(site_name, site_region, distance_km, match_tier)}
 
 ━━━ YOUR TASK ━━━
 Generate a precise, site-specific intelligence brief. Return ONLY valid JSON:
 
 {{
-  "site_impact": "2-3 sentences. Name the site AND the event explicitly. Be precise about what operational aspect is affected (workforce attendance / building access / supply chain / production / executive safety). Calibrate to the actual distance — a 250km storm ≠ immediate evacuation. Never say 'Dell employees and facilities may be affected' — that is too generic.",
-  "rsm_action": "Exactly 3 bullet points starting with action verbs. Each must be immediately executable by THIS RSM at THIS site. Example: '1. Contact site security lead to confirm building access status. 2. Activate employee check-in protocol for staff within 10km of incident. 3. Notify APJC Security Director and await further guidance.' Tailor to site type — manufacturing sites → production continuity; HQ → executive safety + comms; office → workforce attendance.",
-  "second_order": "One sentence on the most likely cascading effect. For labor actions consider childcare/school closures. For natural disasters consider supply chain and logistics. For civil unrest consider executive travel risk. Empty string if genuinely none."
+{_BRIEF_FIELDS}
 }}
 
 HARD RULES:
@@ -176,8 +217,59 @@ HARD RULES:
 - Do not invent facts — work only from the information provided above"""
 
 
-def _call_gemini_brief(prompt: str) -> Optional[Dict[str, str]]:
-    """Call Gemini 2.0 Flash for brief generation (primary — better reasoning)."""
+def _build_batch_prompt(items: List[tuple]) -> str:
+    """
+    One prompt for several (article, site_name, site_region, distance_km,
+    match_tier) items: the instructions once, each distinct event once, then
+    one numbered section per (event, site) pair. The model answers with a
+    "briefs" array keyed by item id ("1".."n").
+    """
+    events: Dict[int, str] = {}   # id(article) → event label
+    event_blocks, item_blocks = [], []
+    for n, (article, site_name, site_region, distance_km, match_tier) in enumerate(items, 1):
+        if id(article) not in events:
+            events[id(article)] = f"E{len(events) + 1}"
+            event_blocks.append(_brief_event_section(article, f"EVENT {events[id(article)]}"))
+        item_blocks.append(_brief_site_section(site_name, site_region, distance_km, match_tier,
+                                               f"ITEM {n} — EVENT {events[id(article)]} AT DELL SITE"))
+
+    sections = "\n\n".join(event_blocks + item_blocks)
+    return f"""{_BRIEF_HEADER}
+Each ITEM below pairs one EVENT with one Dell site. Brief every item separately.
+
+{sections}
+
+━━━ YOUR TASK ━━━
+Generate a precise, site-specific intelligence brief for EVERY item. Return ONLY valid JSON:
+
+{{"briefs": [
+ {{
+  "id": "the ITEM number, e.g. \\"1\\"",
+{_BRIEF_FIELDS}
+ }}
+]}}
+
+HARD RULES:
+- Exactly one entry per ITEM (1 to {len(items)}), each with its "id"
+- Reference that item's site and its event by name in site_impact
+- RSM actions must match that item's site type
+- If distance > 100km and category is not NATURAL_DISASTER or military, explain WHY this is still relevant
+- Do not invent facts — work only from the information provided above"""
+
+
+def _defer_on_429(limiter: SlidingWindowLimiter, err: urllib.error.HTTPError) -> None:
+    """Rate-limited: hold every worker on this provider for Retry-After (else one window slot)."""
+    if err.code == 429:
+        retry_after = parse_duration_s(err.headers.get("retry-after") if err.headers else None)
+        limiter.defer(retry_after or limiter.WINDOW_S / max(limiter.rpm, 1))
+
+
+def _valid_brief(parsed: Any) -> bool:
+    return isinstance(parsed, dict) and "site_impact" in parsed and "rsm_action" in parsed
+
+
+def _call_gemini_json(prompt: str, max_tokens: int = 450) -> Any:
+    """Call Gemini 2.0 Flash in JSON mode; the parsed reply, or None."""
     if not GEMINI_API_KEY:
         return None
     url = f"{GEMINI_API_BASE}/{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}"
@@ -185,54 +277,63 @@ def _call_gemini_brief(prompt: str) -> Optional[Dict[str, str]]:
         "contents": [{"parts": [{"text": prompt}]}],
         "generationConfig": {
             "temperature": 0.2,
-            "maxOutputTokens": 450,
+            "maxOutputTokens": max_tokens,
             "responseMimeType": "application/json"
         }
     }).encode("utf-8")
-    req = urllib.request.Request(url, data=payload,
-                                  headers={"Content-Type": "application/json"},
-                                  method="POST")
+    GEMINI_LIMITER.acquire()
     try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            body = json.loads(resp.read().decode("utf-8"))
-        text = body["candidates"][0]["content"]["parts"][0]["text"]
-        parsed = json.loads(text)
-        if "site_impact" in parsed and "rsm_action" in parsed:
-            return parsed
+        resp = HTTP.post(url, payload, headers={"Content-Type": "application/json"})
+        GEMINI_LIMITER.observe(resp.headers)
+        text = resp.json()["candidates"][0]["content"]["parts"][0]["text"]
+        return json.loads(text)
+    except urllib.error.HTTPError as e:
+        _defer_on_429(GEMINI_LIMITER, e)
+        print(f"    Gemini brief failed: {e}")
     except Exception as e:
         print(f"    Gemini brief failed: {e}")
     return None
 
 
-def _call_groq_brief(prompt: str) -> Optional[Dict[str, str]]:
-    """Call Groq llama as fallback for brief generation."""
+def _call_groq_json(prompt: str, max_tokens: int = 450) -> Any:
+    """Call Groq llama in JSON mode; the parsed reply, or None."""
     if not GROQ_API_KEY:
         return None
     payload = json.dumps({
         "model": GROQ_MODEL,
         "messages": [{"role": "user", "content": prompt}],
         "temperature": 0.2,
-        "max_tokens": 450,
+        "max_tokens": max_tokens,
         "response_format": {"type": "json_object"}
     }).encode("utf-8")
-    req = urllib.request.Request(
-        GROQ_ENDPOINT, data=payload,
-        headers={"Authorization": f"Bearer {GROQ_API_KEY}",
-                 "Content-Type": "application/json"},
-        method="POST"
-    )
+    GROQ_LIMITER.acquire()
     try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            body = json.loads(resp.read().decode("utf-8"))
-        content = body["choices"][0]["message"]["content"]
-        parsed = json.loads(content)
-        if "site_impact" in parsed and "rsm_action" in parsed:
-            return parsed
+        resp = HTTP.post(GROQ_ENDPOINT, payload,
+                         headers={"Authorization": f"Bearer {GROQ_API_KEY}",
+                                  "Content-Type": "application/json"})
+        GROQ_LIMITER.observe(resp.headers)
+        content = resp.json()["choices"][0]["message"]["content"]
+        return json.loads(content)
+    except urllib.error.HTTPError as e:
+        _defer_on_429(GROQ_LIMITER, e)
+        print(f"    Groq brief failed: {e}")
     except Exception as e:
         print(f"    Groq brief failed: {e}")
     return None
 
 
+def _call_gemini_brief(prompt: str) -> Optional[Dict[str, str]]:
+    """Call Gemini 2.0 Flash for brief generation (primary — better reasoning)."""
+    parsed = _call_gemini_json(prompt)
+    return parsed if _valid_brief(parsed) else None
+
+
+def _call_groq_brief(prompt: str) -> Optional[Dict[str, str]]:
+    """Call Groq llama as fallback for brief generation."""
+    parsed = _call_groq_json(prompt)
+    return parsed if _valid_brief(parsed) else None
+
+
 def generate_site_brief(article: Dict[str, Any], site_name: str,
                          site_region: str, distance_km: float,
                          match_tier: str = "text") -> Optional[Dict[str, str]]:
@@ -246,15 +347,114 @@ def generate_site_brief(article: Dict[str, Any], site_name: str,
     if GEMINI_API_KEY:
         result = _call_gemini_brief(prompt)
         if result:
-            result["ai_model"] = "gemini-2.0-flash"
+            result["ai_model"] = GEMINI_MODEL
             return result
     # Fall back to Groq
     result = _call_groq_brief(prompt)
     if result:
-        result["ai_model"] = "groq-llama-3.1"
+        result["ai_model"] = GROQ_MODEL
     return result
 
 
+def _batch_entries(parsed: Any) -> Optional[Dict[str, Any]]:
+    """Map item id → entry from a batch reply ({"briefs": [...]} or a bare array)."""
+    if isinstance(parsed, dict):
+        parsed = parsed.get("briefs")
+    if not isinstance(parsed, list):
+        return None
+    return {str(e.get("id", "")).strip(): e for e in parsed if isinstance(e, dict)}
+
+
+def generate_site_briefs(items: List[tuple]) -> List[Optional[Dict[str, str]]]:
+    """
+    Briefs for several (article, site_name, site_region, distance_km,
+    match_tier) items in one request, in item order. Each entry of the reply
+    is validated on its own; when the batch cannot be parsed at all, or an
+    item is missing or invalid, that item falls back to generate_site_brief().
+    """
+    if len(items) <= 1:
+        return [generate_site_brief(*it) for it in items]
+    prompt  = _build_batch_prompt(items)
+    tokens  = BRIEF_BATCH_TOKENS_PER_ITEM * len(items)
+    entries, model = None, ""
+    if GEMINI_API_KEY:
+        entries, model = _batch_entries(_call_gemini_json(prompt, tokens)), GEMINI_MODEL
+    if entries is None and GROQ_API_KEY:
+        entries, model = _batch_entries(_call_groq_json(prompt, tokens)), GROQ_MODEL
+    if entries is None:
+        print(f"    Batch of {len(items)} briefs unparseable — falling back to single calls")
+        entries = {}
+
+    out = []
+    for n, it in enumerate(items, 1):
+        entry = entries.get(str(n))
+        if _valid_brief(entry):
+            brief = {k: entry[k] for k in ("site_impact", "rsm_action", "second_order") if k in entry}
+            brief["ai_model"] = model
+            out.append(brief)
+        else:
+            out.append(generate_site_brief(*it))
+    return out
+
+
+def _brief_models() -> List[str]:
+    """
+    Models whose cached briefs are acceptable this run, preferred first. Briefs
+    are labelled (and cached) with the model the request was sent to, so the
+    names are read from GEMINI_MODEL / GROQ_MODEL at call time.
+    """
+    configured = [m for m, key in ((GEMINI_MODEL, GEMINI_API_KEY),
+                                   (GROQ_MODEL, GROQ_API_KEY)) if key]
+    return configured or [GEMINI_MODEL, GROQ_MODEL]
+
+
+# ── Brief priority — who gets the MAX_AI_BRIEFS budget ───────────────────────
+# Score = severity × proximity × site criticality × recency × cache factor.
+# Cache hits never reach the queue; an article whose severity/content changed
+# since its last brief is moved up, since the RSM is holding an outdated brief.
+BRIEF_SEVERITY_WEIGHT = {1: 0.25, 2: 0.5, 3: 0.75, 4: 1.0}
+BRIEF_PROXIMITY_KM    = 25     # proximity factor halves at this distance
+BRIEF_HALF_LIFE_H     = 24     # recency factor halves every day
+BRIEF_SITE_WEIGHT     = {
+    "Manufacturing / Production Facility": 1.0,
+    "Regional / Corporate HQ":             0.85,
+    "Commercial Office":                   0.5,
+}
+BRIEF_CACHE_FACTOR    = {"changed": 1.25, "expired": 1.0, "miss": 1.0}
+_CRITICAL_CONTEXT = re.compile(r"\b(critical|primary|largest|global|executive)\b", re.I)
+
+
+def _site_criticality(site_name: str) -> float:
+    """Site type weight, raised for sites SITE_CONTEXT calls critical / primary / largest."""
+    weight = BRIEF_SITE_WEIGHT.get(_infer_site_type(site_name), 0.5)
+    if _CRITICAL_CONTEXT.search(_get_site_context(site_name)):
+        weight = min(1.0, weight + 0.2)
+    return weight
+
+
+def _article_age_h(article: Dict[str, Any], now: datetime) -> Optional[float]:
+    raw = article.get("time") or article.get("timestamp") or ""
+    try:
+        ts = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return max(0.0, (now - ts).total_seconds() / 3600)
+
+
+def brief_priority(m: Dict[str, Any], cache_status: str = "miss",
+                   now: Optional[datetime] = None) -> float:
+    """Value of spending one AI brief on raw match `m` (higher first)."""
+    article  = m["article"]
+    severity = BRIEF_SEVERITY_WEIGHT.get(int(article.get("severity", 1)), 0.25)
+    proximity = 1.0 / (1.0 + (m["distance_km"] or 0) / BRIEF_PROXIMITY_KM)
+    age_h    = _article_age_h(article, now or datetime.now(timezone.utc))
+    recency  = 0.5 if age_h is None else max(0.1, 0.5 ** (age_h / BRIEF_HALF_LIFE_H))
+    return (severity * proximity * _site_criticality(m["loc"].name) * recency
+            * BRIEF_CACHE_FACTOR.get(cache_status, 1.0))
+
+
 # ── Paths ─────────────────────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "public", "data")
@@ -266,6 +466,7 @@ PROXIMITY_PATH        = os.path.join(DATA_DIR, "proximity.json")
 LOCATIONS_PATH        = os.path.join(CONFIG_DIR, "locations.json")
 SUPPLY_CHAIN_PATH     = os.path.join(CONFIG_DIR, "supply_chain_assets.json")
 PUBLIC_LOCATIONS_PATH = os.path.join(DATA_DIR, "locations.json")
+PROXIMITY_STATE_PATH  = os.path.join(DATA_DIR, ".cache", "proximity_state.json")
 
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(REPORT_DIR, exist_ok=True)
@@ -297,9 +498,7 @@ _NATURAL_CATS = {"NATURAL_DISASTER"}
 def _event_radius(article: Dict[str, Any]) -> int:
     """Return the correct proximity radius for this article's threat type."""
     category   = article.get("category", "")
-    title_body = (article.get("title", "") + " " +
-                  (article.get("body") or article.get("snippet") or ""))
-    if _BALLISTIC.search(title_body):
+    if "ballistic" in article_term_hits(article):
         return RADIUS_BALLISTIC_KM
     if category in _NATURAL_CATS:
         return RADIUS_NATURAL_KM
@@ -370,7 +569,7 @@ SECURITY_KEYWORDS = {
     ],
 }
 
-ALL_SECURITY_TERMS = [kw.lower() for bucket in SECURITY_KEYWORDS.values() for kw in bucket]
+SECURITY_BUCKETS = frozenset(SECURITY_KEYWORDS)
 
 
 @dataclass
@@ -391,58 +590,104 @@ class Asset:
     asset_type: str = "Building"
 
 # ── Event Type Taxonomy (Everbridge-style mapping) ────────────────────────────
-def get_event_type_taxonomy(category: str, title: str, body: str = "") -> str:
-    text = (title + " " + body).lower()
+# First matching rule wins within a category group.
+_TAXONOMY_RULES: Dict[str, List[tuple]] = {
+    "CIVIL_UNREST": [
+        (r"\b(strike|walkout|industrial.action|labor.dispute|labour.dispute|work.stoppage)\b", "Civil Unrest - Planned Strike"),
+        (r"\b(protest|demonstration|march|rally|picket)\b", "Civil Unrest - Civil Demonstration"),
+        (r"\b(riot|looting|mob|clashes)\b", "Civil Unrest - Civil Disturbance"),
+        (r"\b(curfew|martial.law|state.of.emergency)\b", "Civil Unrest - Curfew / Martial Law"),
+    ],
+    "NATURAL": [
+        (r"\b(earthquake|tremor|seismic|quake)\b", "Natural Disaster - Earthquake"),
+        (r"\b(flood|flooding|flash.flood|inundation)\b", "Natural Disaster - Flood"),
+        (r"\b(hurricane|typhoon|cyclone|tropical.storm)\b", "Natural Disaster - Tropical Cyclone"),
+        (r"\b(tsunami|tidal.wave)\b", "Natural Disaster - Tsunami"),
+        (r"\b(wildfire|bushfire|forest.fire)\b", "Natural Disaster - Wildfire"),
+        (r"\b(volcano|eruption|volcanic)\b", "Natural Disaster - Volcanic Activity"),
+        (r"\b(tornado|twister)\b", "Natural Disaster - Tornado"),
+        (r"\b(hazmat|chemical|toxic|spill|leak)\b", "HAZMAT / Fire"),
+        (r"\b(fire|blaze)\b", "HAZMAT / Fire"),
+    ],
+    "CONFLICT": [
+        (r"\b(missile|rocket|airstrike|air.strike|bombing|shelling|drone.strike)\b", "Violence - Airstrike / Missile"),
+        (r"\b(terror|terrorist|attack|bomb|explosion)\b", "Violence - Terrorism"),
+        (r"\b(shooting|gunfire|armed.attack)\b", "Violence - Shooting"),
+    ],
+    "SECURITY": [
+        (r"\b(terror|terrorist|bomb|explosion)\b", "Violence - Terrorism"),
+        (r"\b(kidnap|hostage|abduct)\b", "Violence - Kidnapping"),
+        (r"\b(robbery|theft|burglary)\b", "Crime - Robbery"),
+        (r"\b(strike|walkout)\b", "Civil Unrest - Planned Strike"),
+        (r"\b(protest|demonstration)\b", "Civil Unrest - Civil Demonstration"),
+    ],
+    "TRANSPORT": [
+        (r"\b(strike|walkout|industrial)\b", "Transport - Strike"),
+        (r"\b(closure|closed|shutdown)\b", "Transport - Closure"),
+        (r"\b(accident|crash|collision)\b", "Transport - Accident"),
+    ],
+    "SUPPLY_CHAIN": [
+        (r"\b(port|shipping|maritime|cargo|dock)\b", "Supply Chain - Port / Shipping"),
+        (r"\b(strike|industrial.action)\b", "Supply Chain - Strike"),
+        (r"\b(shortage|scarcity)\b", "Supply Chain - Shortage"),
+    ],
+    "INFRASTRUCTURE": [
+        (r"\b(power|electricity|blackout|outage)\b", "Infrastructure - Power Outage"),
+        (r"\b(water.supply|water.shortage)\b", "Infrastructure - Water Supply"),
+        (r"\b(fuel|gas.shortage|energy.crisis)\b", "Infrastructure - Energy"),
+        (r"\b(internet|network.outage|telecom)\b", "Infrastructure - Telecommunications"),
+    ],
+}
+
+def _first_rule(group: str, hits: frozenset) -> Optional[str]:
+    for n, (_, label) in enumerate(_TAXONOMY_RULES[group]):
+        if f"{group}/{n}" in hits:
+            return label
+    return None
+
+def get_event_type_taxonomy(category: str, title: str, body: str = "",
+                            hits: Optional[frozenset] = None) -> str:
+    """
+    Everbridge-style event type. `hits` are the article's EVENT_TERMS buckets
+    (article_term_hits); without them title + body are scanned here.
+    """
+    if hits is None:
+        hits = EVENT_TERMS.scan((title + " " + body).lower())
     cat  = category.upper().replace("-", "_").replace(" ", "_")
     if cat == "CIVIL_UNREST":
-        if re.search(r"\b(strike|walkout|industrial.action|labor.dispute|labour.dispute|work.stoppage)\b", text): return "Civil Unrest - Planned Strike"
-        if re.search(r"\b(protest|demonstration|march|rally|picket)\b", text): return "Civil Unrest - Civil Demonstration"
-        if re.search(r"\b(riot|looting|mob|clashes)\b", text): return "Civil Unrest - Civil Disturbance"
-        if re.search(r"\b(curfew|martial.law|state.of.emergency)\b", text): return "Civil Unrest - Curfew / Martial Law"
-        return "Civil Unrest"
+        return _first_rule("CIVIL_UNREST", hits) or "Civil Unrest"
     if cat in ("NATURAL_HAZARD", "NATURAL_DISASTER"):
-        if re.search(r"\b(earthquake|tremor|seismic|quake)\b", text): return "Natural Disaster - Earthquake"
-        if re.search(r"\b(flood|flooding|flash.flood|inundation)\b", text): return "Natural Disaster - Flood"
-        if re.search(r"\b(hurricane|typhoon|cyclone|tropical.storm)\b", text): return "Natural Disaster - Tropical Cyclone"
-        if re.search(r"\b(tsunami|tidal.wave)\b", text): return "Natural Disaster - Tsunami"
-        if re.search(r"\b(wildfire|bushfire|forest.fire)\b", text): return "Natural Disaster - Wildfire"
-        if re.search(r"\b(volcano|eruption|volcanic)\b", text): return "Natural Disaster - Volcanic Activity"
-        if re.search(r"\b(tornado|twister)\b", text): return "Natural Disaster - Tornado"
-        if re.search(r"\b(hazmat|chemical|toxic|spill|leak)\b", text): return "HAZMAT / Fire"
-        if re.search(r"\b(fire|blaze)\b", text): return "HAZMAT / Fire"
-        return "Natural Hazard"
+        return _first_rule("NATURAL", hits) or "Natural Hazard"
     if cat in ("CONFLICT", "GEOPOLITICAL"):
-        if re.search(r"\b(missile|rocket|airstrike|air.strike|bombing|shelling|drone.strike)\b", text): return "Violence - Airstrike / Missile"
-        if re.search(r"\b(terror|terrorist|attack|bomb|explosion)\b", text): return "Violence - Terrorism"
-        if re.search(r"\b(shooting|gunfire|armed.attack)\b", text): return "Violence - Shooting"
-        if cat == "CONFLICT": return "Violence - Armed Conflict"
-        return "Geopolitical Event"
+        return (_first_rule("CONFLICT", hits)
+                or ("Violence - Armed Conflict" if cat == "CONFLICT" else "Geopolitical Event"))
     if cat == "SECURITY":
-        if re.search(r"\b(terror|terrorist|bomb|explosion)\b", text): return "Violence - Terrorism"
-        if re.search(r"\b(kidnap|hostage|abduct)\b", text): return "Violence - Kidnapping"
-        if re.search(r"\b(robbery|theft|burglary)\b", text): return "Crime - Robbery"
-        if re.search(r"\b(strike|walkout)\b", text): return "Civil Unrest - Planned Strike"
-        if re.search(r"\b(protest|demonstration)\b", text): return "Civil Unrest - Civil Demonstration"
-        return "Security Threat"
+        return _first_rule("SECURITY", hits) or "Security Threat"
     if cat == "TRANSPORT":
-        if re.search(r"\b(strike|walkout|industrial)\b", text): return "Transport - Strike"
-        if re.search(r"\b(closure|closed|shutdown)\b", text): return "Transport - Closure"
-        if re.search(r"\b(accident|crash|collision)\b", text): return "Transport - Accident"
-        return "Transport - Disruption"
+        return _first_rule("TRANSPORT", hits) or "Transport - Disruption"
     if cat == "SUPPLY_CHAIN":
-        if re.search(r"\b(port|shipping|maritime|cargo|dock)\b", text): return "Supply Chain - Port / Shipping"
-        if re.search(r"\b(strike|industrial.action)\b", text): return "Supply Chain - Strike"
-        if re.search(r"\b(shortage|scarcity)\b", text): return "Supply Chain - Shortage"
-        return "Supply Chain - Disruption"
+        return _first_rule("SUPPLY_CHAIN", hits) or "Supply Chain - Disruption"
     if cat == "INFRASTRUCTURE":
-        if re.search(r"\b(power|electricity|blackout|outage)\b", text): return "Infrastructure - Power Outage"
-        if re.search(r"\b(water.supply|water.shortage)\b", text): return "Infrastructure - Water Supply"
-        if re.search(r"\b(fuel|gas.shortage|energy.crisis)\b", text): return "Infrastructure - Energy"
-        if re.search(r"\b(internet|network.outage|telecom)\b", text): return "Infrastructure - Telecommunications"
-        return "Infrastructure - Disruption"
+        return _first_rule("INFRASTRUCTURE", hits) or "Infrastructure - Disruption"
     if cat in ("CYBER", "CYBER_SECURITY"): return "Cyber Security Incident"
     return category.replace("_", " ").title()
 
+# ── Event term automaton ──────────────────────────────────────────────────────
+# One pass per article over SECURITY_KEYWORDS (prefix terms at word starts, so
+# "protest" still hits "protesters" but "ied" no longer hits "carried"), the
+# ballistic radius terms and every taxonomy rule. Bucket names: the
+# SECURITY_KEYWORDS keys, "ballistic", and "<taxonomy group>/<rule index>".
+def _event_term_buckets() -> Dict[str, List[str]]:
+    buckets = {name: [re.escape(kw.lower()) for kw in terms]
+               for name, terms in SECURITY_KEYWORDS.items()}
+    buckets["ballistic"] = [alt + r"\b" for alt in alternatives(_BALLISTIC.pattern)]
+    for group, rules in _TAXONOMY_RULES.items():
+        for n, (pattern, _) in enumerate(rules):
+            buckets[f"{group}/{n}"] = [alt + r"\b" for alt in alternatives(pattern)]
+    return buckets
+
+EVENT_TERMS = TermBuckets(_event_term_buckets())
+
 def load_supply_chain_assets() -> List[Asset]:
     """Load 3rd party suppliers, fulfillment centres, and world ports."""
     if not os.path.exists(SUPPLY_CHAIN_PATH):
@@ -481,21 +726,26 @@ def load_all_assets(locations: List[Location], sc_assets: List[Asset]) -> List[A
     return all_assets
 
 
+def asset_index(all_assets: List[Asset]) -> GeoIndex:
+    """Spatial index over (position, asset) — build once per run, query per event."""
+    return GeoIndex(enumerate(all_assets), coords=lambda pa: (pa[1].lat, pa[1].lon))
+
+
 def nearest_10_assets(event_lat: float, event_lon: float,
-                       all_assets: List[Asset], radius_km: float = 500.0):
-    """Return top-10 nearest assets sorted by distance."""
-    results = []
-    for a in all_assets:
-        dist = haversine_km(event_lat, event_lon, a.lat, a.lon)
-        if dist <= radius_km:
-            results.append({
-                "name": a.name,
-                "type": a.asset_type,
-                "region": a.region,
-                "distance_km": round(dist, 2),
-            })
-    results.sort(key=lambda x: x["distance_km"])
-    return results[:10]
+                       assets: GeoIndex, radius_km: float = 500.0):
+    """Return top-10 nearest assets within radius_km, sorted by distance."""
+    hits = assets.k_nearest(event_lat, event_lon, 10, max_km=radius_km)
+    if len(hits) == 10:
+        # pull in anything that rounds level with the 10th so ties keep asset-list order
+        edge = min(radius_km, round(hits[-1][0], 2) + 0.006)
+        hits = assets.within_radius(event_lat, event_lon, edge)
+    hits.sort(key=lambda h: (round(h[0], 2), h[1][0]))
+    return [{
+        "name": a.name,
+        "type": a.asset_type,
+        "region": a.region,
+        "distance_km": round(dist, 2),
+    } for dist, (_, a) in hits[:10]]
 
 
 def count_by_type(assets_list: list) -> dict:
@@ -549,31 +799,34 @@ def load_locations() -> List[Location]:
             continue
     return locations
 
-def haversine_km(lat1, lon1, lat2, lon2) -> float:
-    rlat1, rlon1, rlat2, rlon2 = map(radians, [lat1, lon1, lat2, lon2])
-    dlon = rlon2 - rlon1
-    dlat = rlat2 - rlat1
-    a = sin(dlat / 2) ** 2 + cos(rlat1) * cos(rlat2) * sin(dlon / 2) ** 2
-    c = 2 * asin(sqrt(a))
-    return 6371 * c
-
-def _article_text(article: Dict[str, Any]) -> str:
-    """Return combined searchable text from an article (handles both 'snippet' and 'summary' field names)."""
+def _article_parts(article: Dict[str, Any]) -> tuple:
+    """(title + body, AI-extracted locations) — handles both 'snippet' and 'summary' field names."""
     title = article.get("title", "") or ""
     body = article.get("body") or article.get("snippet") or article.get("summary") or ""
-    # Also include AI-extracted geo locations list for text matching
     geo_locs = article.get("locations") or []
     geo_str = " ".join(geo_locs) if isinstance(geo_locs, list) else str(geo_locs)
-    return f"{title} {body} {geo_str}".lower()
+    return f"{title} {body}", geo_str
+
+def _article_text(article: Dict[str, Any]) -> str:
+    """Return combined searchable text from an article, AI-extracted geo locations included."""
+    title_body, geo_str = _article_parts(article)
+    return f"{title_body} {geo_str}".lower()
+
+def article_term_hits(article: Dict[str, Any]) -> frozenset:
+    """EVENT_TERMS buckets matched by the article — scanned once, kept on the article."""
+    hits = article.get("_term_hits")
+    if hits is None:
+        title_body, geo_str = _article_parts(article)
+        hits = EVENT_TERMS.scan(title_body.lower())
+        if geo_str:   # the AI locations only ever counted towards security relevance
+            hits |= EVENT_TERMS.scan(geo_str.lower()) & SECURITY_BUCKETS
+        article["_term_hits"] = hits
+    return hits
 
 def _is_security_relevant(article: Dict[str, Any]) -> bool:
-    text = _article_text(article)
     if int(article.get("severity", 1)) >= 3:
         return True
-    for kw in ALL_SECURITY_TERMS:
-        if kw in text:
-            return True
-    return False
+    return not SECURITY_BUCKETS.isdisjoint(article_term_hits(article))
 
 # ── Primary city guard — prevents body-text false matches ────────────────────
 # Australian weather articles say "Bureau of Meteorology Sydney" in body text,
@@ -683,6 +936,63 @@ def _location_search_terms(loc: Location) -> List[str]:
     """City terms only — no country-level terms (they cause false matches across vast distances)."""
     return _city_terms(loc)
 
+# ── City gazetteer — Tier B/C text matching ──────────────────────────────────
+_FOLD_EXTRA   = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe"})
+_NON_WORD     = re.compile(r"[\W_]+")
+_SITE_SUFFIX  = re.compile(r"\([^)]*\)|\b\d+\b")   # "(egl 2)", campus numbers
+
+def _fold(text: str) -> str:
+    """Lowercase, strip accents (são paulo → sao paulo, łódź → lodz), punctuation → spaces."""
+    text = text.lower()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text.translate(_FOLD_EXTRA))
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", text).strip()
+
+class CityGazetteer:
+    """
+    Folded city term → Dell site indices, built once per run from _city_terms().
+    Site qualifiers are dropped ("Bangalore (EGL 2)", "Round Rock Campus 3" →
+    "bangalore", "round rock"), so one mention reaches every site in that city.
+    match() walks the folded word sequence once and looks up every 1..N-word
+    window, so terms only ever match whole words ("rome" not in "chromebook").
+    """
+
+    def __init__(self, locations: List[Location]):
+        sites: Dict[tuple, set] = {}
+        for j, loc in enumerate(locations):
+            for term in _city_terms(loc):
+                words = tuple(_fold(_SITE_SUFFIX.sub(" ", term)).split())
+                if len(" ".join(words)) > 2:
+                    sites.setdefault(words, set()).add(j)
+        self.sites   = {w: sorted(js) for w, js in sites.items()}
+        self.first   = {w[0] for w in self.sites}
+        self.longest = max((len(w) for w in self.sites), default=0)
+        # every contiguous word run of every term — "is this place part of a Dell city name?"
+        self.grams   = {w[i:k] for w in self.sites
+                       for i in range(len(w)) for k in range(i + 1, len(w) + 1)}
+
+    def _scan(self, words: List[str]):
+        for i, word in enumerate(words):
+            if word not in self.first:
+                continue
+            for n in range(1, min(self.longest, len(words) - i) + 1):
+                hit = self.sites.get(tuple(words[i:i + n]))
+                if hit:
+                    yield hit
+
+    def match(self, text: str) -> List[int]:
+        """Indices of the sites whose city is mentioned in text, in site order."""
+        found = set()
+        for hit in self._scan(_fold(text).split()):
+            found.update(hit)
+        return sorted(found)
+
+    def knows(self, place: str) -> bool:
+        """True if place names a Dell city, or is contained in / contains one."""
+        words = tuple(_fold(place).split())
+        return words in self.grams or next(self._scan(list(words)), None) is not None
+
 def _collect_raw_matches(articles: List[Dict[str, Any]], locations: List[Location]) -> List[Dict[str, Any]]:
     """
     Phase 1: Geographic matching — find (article, site, distance) pairs.
@@ -706,40 +1016,45 @@ def _collect_raw_matches(articles: List[Dict[str, Any]], locations: List[Locatio
     matches = []
     seen    = set()
 
-    for article in articles:
-        if int(article.get("severity", 1)) < 2:
-            continue
-        if not _is_security_relevant(article):
-            continue
-
-        alat     = article.get("lat")
-        alon     = article.get("lon")
-        art_url  = article.get("url") or article.get("link", "")
-        art_sev  = int(article.get("severity", 1))
-
-        article_hits: List[Dict] = []   # candidates for this article only
+    candidates = [a for a in articles
+                  if int(a.get("severity", 1)) >= 2 and _is_security_relevant(a)]
+    radii      = [_event_radius(a) for a in candidates]   # 50 / 300 / 500 depending on threat type
 
-        radius = _event_radius(article)   # 50 / 300 / 500 depending on threat type
-
-        # ── Tier A: Exact coordinates ─────────────────────────────────────────
+    # ── Tier A: Exact coordinates — one vectorized pass over all articles ────
+    coord_rows: Dict[int, tuple] = {}
+    for i, article in enumerate(candidates):
+        alat, alon = article.get("lat"), article.get("lon")
         if alat is not None and alon is not None:
             try:
-                alat_f, alon_f = float(alat), float(alon)
-                for loc in locations:
-                    dist = haversine_km(alat_f, alon_f, loc.lat, loc.lon)
-                    if dist <= radius:
-                        article_hits.append({"loc": loc, "distance_km": round(dist, 1),
-                                             "match_tier": "coordinate"})
+                coord_rows[i] = (float(alat), float(alon))
             except ValueError:
                 pass
+    kernel = SiteDistances(locations)
+    coord_hits = dict(zip(coord_rows, kernel.within(list(coord_rows.values()),
+                                                    [radii[i] for i in coord_rows])))
+
+    # Tier B/C: city gazetteer, and the distance estimate (country centroid → site)
+    gazetteer     = CityGazetteer(locations)
+    centroid_dist = []
+    for loc in locations:
+        centroid = COUNTRY_CENTROIDS.get(_country_code_for_loc(loc))
+        if centroid:
+            centroid_dist.append(haversine_km(centroid[0], centroid[1], loc.lat, loc.lon))
+        else:
+            centroid_dist.append(0.0)   # unknown → allow through
+
+    for i, article in enumerate(candidates):
+        art_url  = article.get("url") or article.get("link", "")
+        radius   = radii[i]
+
+        article_hits: List[Dict] = [{"loc": locations[j], "distance_km": round(dist, 1),
+                                     "match_tier": "coordinate"}
+                                    for dist, j in coord_hits.get(i, [])]
 
         # ── Tier B+C: City-name text matching ─────────────────────────────────
+        # _article_text() already carries the AI-extracted locations, so one
+        # gazetteer scan covers both the body text and article.locations.
         if not article_hits:
-            text     = _article_text(article)
-            geo_list = article.get("locations") or []
-            geo_norm = set(g.lower().strip() for g in geo_list if g) \
-                       if isinstance(geo_list, list) else set()
-
             # ── Primary city guard ────────────────────────────────────────────
             # If AI says the event's primary location is a specific city that
             # is NOT a Dell site city, block text matching entirely.
@@ -747,41 +1062,14 @@ def _collect_raw_matches(articles: List[Dict[str, Any]], locations: List[Locatio
             # (Australian weather articles mention "Sydney" in their body text
             # causing the city term match to fire incorrectly).
             primary_city = _primary_event_city(article)
-            if primary_city:
-                all_dell_cities = set()
-                for _l in locations:
-                    all_dell_cities.update(_city_terms(_l))
-                primary_is_dell = any(
-                    primary_city in dc or dc in primary_city
-                    for dc in all_dell_cities if len(dc) > 2
-                )
-                if not primary_is_dell:
-                    # e.g. "perth" / "katherine" → no Dell site → skip all text matching
-                    continue
-
-            for loc in locations:
-                city_terms   = _city_terms(loc)     # city only, NOT country
-                country_code = _country_code_for_loc(loc)
-
-                # City term found in article body OR AI-extracted locations
-                city_matched = any(term in text for term in city_terms if len(term) > 2)
-                if not city_matched and geo_norm:
-                    city_matched = any(
-                        any(t in geo_entry or geo_entry in t for geo_entry in geo_norm)
-                        for t in city_terms if len(t) > 2
-                    )
-                if not city_matched:
-                    continue
-
-                # Estimate distance via country centroid — use same event radius
-                centroid = COUNTRY_CENTROIDS.get(country_code)
-                if centroid:
-                    est_dist = haversine_km(centroid[0], centroid[1], loc.lat, loc.lon)
-                else:
-                    est_dist = 0.0   # unknown → allow through
+            if primary_city and not gazetteer.knows(primary_city):
+                # e.g. "perth" / "katherine" → no Dell site → skip all text matching
+                continue
 
+            for j in gazetteer.match(_article_text(article)):
+                est_dist = centroid_dist[j]   # same event radius as Tier A
                 if est_dist <= radius:
-                    article_hits.append({"loc": loc,
+                    article_hits.append({"loc": locations[j],
                                          "distance_km": round(est_dist, 1),
                                          "match_tier": "city_text"})
 
@@ -800,114 +1088,361 @@ def _collect_raw_matches(articles: List[Dict[str, Any]], locations: List[Locatio
     return matches
 
 
+def _proximity_alert(m: Dict[str, Any], ai_brief: Optional[Dict[str, str]],
+                     assets: Optional[GeoIndex], brief_status: str = "none") -> Dict[str, Any]:
+    """
+    One proximity.json alert for a raw match, with its AI brief or the generic
+    fallback. brief_status: cached / generated / failed / queued (over this
+    run's budget, picked up next run) / none (no AI provider configured).
+    """
+    article      = m["article"]
+    loc          = m["loc"]
+    distance_km  = m["distance_km"]
+
+    art_time    = article.get("time") or article.get("timestamp", "")
+    art_url     = article.get("url") or article.get("link", "")
+    art_snippet = (article.get("body") or article.get("snippet")
+                   or article.get("summary") or "")[:300]
+    severity    = int(article.get("severity", 1))
+
+    if ai_brief:
+        site_impact  = ai_brief.get("site_impact", "")
+        rsm_action   = ai_brief.get("rsm_action", "")
+        second_order = ai_brief.get("second_order", "")
+        ai_enriched  = True
+    else:
+        # Graceful fallback — still useful, just not site-specific
+        op_impact    = article.get("operational_impact", "")
+        site_impact  = op_impact if op_impact else art_snippet
+        rsm_action   = ""
+        second_order = article.get("second_order", "")
+        ai_enriched  = False
+
+    # ── Everbridge Layer 2-4: supply chain enrichment ──────────────────
+    art_lat = article.get("lat")
+    art_lon = article.get("lon")
+    top10       = []
+    nearest_asset_name     = loc.name
+    nearest_asset_type     = "Building"
+    nearest_asset_dist     = distance_km
+    affected_by_type: dict = {}
+    event_taxonomy = get_event_type_taxonomy(
+        article.get("category", ""), article.get("title", ""),
+        article.get("body") or article.get("snippet") or article.get("summary") or "",
+        hits=article_term_hits(article),
+    )
+    if assets and art_lat is not None and art_lon is not None:
+        try:
+            top10 = nearest_10_assets(float(art_lat), float(art_lon), assets)
+            if top10:
+                nearest_asset_name = top10[0]["name"]
+                nearest_asset_type = top10[0]["type"]
+                nearest_asset_dist = top10[0]["distance_km"]
+                affected_by_type   = count_by_type(top10)
+        except (ValueError, TypeError):
+            pass
+    # ───────────────────────────────────────────────────────────────────
+
+    return {
+        # Event fields
+        "article_title":     article.get("title", ""),
+        "article_source":    article.get("source", ""),
+        "article_timestamp": art_time,
+        "article_link":      art_url,
+        "category":          article.get("category", "GENERAL"),
+        "severity":          severity,
+        # Site fields (nearest Dell building — legacy compatibility)
+        "site_name":         loc.name,
+        "site_region":       loc.region,
+        "site_country":      loc.country,
+        "site_type":         _infer_site_type(loc.name),
+        "distance_km":       distance_km,
+        "lat":               art_lat if art_lat is not None else loc.lat,
+        "lon":               art_lon if art_lon is not None else loc.lon,
+        # Intelligence fields
+        "site_impact":       site_impact,
+        "rsm_action":        rsm_action,
+        "second_order":      second_order,
+        "ai_enriched":       ai_enriched,
+        "ai_model":          ai_brief.get("ai_model", "") if ai_brief else "",
+        "ai_cached":         bool(ai_brief and ai_brief.get("cached")),
+        "brief_status":      brief_status,
+        "brief_priority":    round(m.get("priority", 0.0), 4),
+        # Everbridge-style supply chain fields
+        "nearest_asset_name":        nearest_asset_name,
+        "nearest_asset_type":        nearest_asset_type,
+        "nearest_asset_distance_km": nearest_asset_dist,
+        "nearest_10_assets":         top10,
+        "affected_count_by_type":    affected_by_type,
+        "event_type_taxonomy":       event_taxonomy,
+        # Cross-run state (see _lifecycle_status); build_proximity_alerts fills these in
+        "article_key":               article_key(article),
+        "match_tier":                m.get("match_tier", "text"),
+        "notification_status":       "New",
+        "first_seen":                "",
+        "last_seen":                 "",
+        "site_matched":              True,   # False once an edit moved the event off this site
+    }
+
+
+# ── Cross-run proximity state ─────────────────────────────────────────────────
+# proximity.json is merged, not rebuilt: only articles whose content hash is new
+# or changed since the last run are matched and enriched. The hashes live next
+# to the feedback index in public/data/.cache/ and are trusted only for the
+# proximity.json they were written with and the same site list / match rules.
+#
+# notification_status lifecycle of an (article, site) alert:
+#   New      first run it is reported
+#   Ongoing  reported before, article still in the feed
+#   Stale    article left the feed, or the event is older than PROXIMITY_STALE_H
+#   Expired  event older than PROXIMITY_EXPIRE_H, or unseen for that long —
+#            written once with this status, dropped on the next run
+PROXIMITY_MATCH_VERSION = 1     # bump when matching rules change → full recompute
+PROXIMITY_STALE_H       = 24
+PROXIMITY_EXPIRE_H      = 72
+
+
+def article_content_hash(article: Dict[str, Any]) -> str:
+    """
+    Hash of the fields matching and enrichment read. Per-run fields are left
+    out: news_agent stamps undated RSS and GDELT items with the fetch time.
+    """
+    stable = [
+        (article.get("title") or "").strip(),
+        (article.get("body") or article.get("snippet") or article.get("summary") or "").strip(),
+        normalize_url(article.get("url") or article.get("link")),
+        article.get("severity", 1),
+        article.get("category", ""),
+        article.get("locations") or [],
+        article.get("lat"),
+        article.get("lon"),
+    ]
+    raw = json.dumps(stable, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _match_signature(locations: List[Location]) -> str:
+    sites = [[l.name, l.country, l.region, l.lat, l.lon] for l in locations]
+    raw   = json.dumps([PROXIMITY_MATCH_VERSION, RADIUS_DEFAULT_KM, RADIUS_NATURAL_KM,
+                        RADIUS_BALLISTIC_KM, sites], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def load_previous_proximity(locations: List[Location]) -> tuple:
+    """
+    ({article key: [alerts]}, {article key: content hash}) from the last run.
+    The hashes come back empty (full recompute) when the state does not belong
+    to the current proximity.json or the sites / match rules changed; the old
+    alerts are still returned so the lifecycle carries over.
+    """
+    try:
+        with open(PROXIMITY_PATH, "r", encoding="utf-8") as f:
+            prox = json.load(f)
+        old_alerts = [a for a in prox.get("alerts", []) if isinstance(a, dict)]
+    except (OSError, ValueError, AttributeError):
+        return {}, {}
+    by_key: Dict[str, List[Dict[str, Any]]] = {}
+    for alert in old_alerts:
+        key = alert.get("article_key") or normalize_url(alert.get("article_link"))
+        if key:
+            by_key.setdefault(key, []).append(alert)
+    hashes = {}
+    try:
+        with open(PROXIMITY_STATE_PATH, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if (state["generated_at"] == prox.get("generated_at")
+                and state["signature"] == _match_signature(locations)):
+            hashes = dict(state["hashes"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return by_key, hashes
+
+
+def save_proximity_state(generated_at: str, locations: List[Location],
+                         articles: List[Dict[str, Any]]) -> None:
+    hashes = {}
+    for a in articles:
+        hashes.setdefault(article_key(a), article_content_hash(a))
+    os.makedirs(os.path.dirname(PROXIMITY_STATE_PATH), exist_ok=True)
+    tmp = PROXIMITY_STATE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "generated_at": generated_at,
+                   "signature": _match_signature(locations), "hashes": hashes},
+                  f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, PROXIMITY_STATE_PATH)
+
+
+def _lifecycle_status(alert: Dict[str, Any], in_feed: bool, now: datetime) -> str:
+    """Ongoing / Stale / Expired for an alert that was reported before."""
+    event_age = _article_age_h({"time": alert.get("article_timestamp")}, now)
+    unseen_h  = _article_age_h({"time": alert.get("last_seen")}, now)
+    if (event_age or 0) >= PROXIMITY_EXPIRE_H:
+        return "Expired"
+    if not in_feed and (unseen_h is None or unseen_h >= PROXIMITY_EXPIRE_H):
+        return "Expired"
+    if not in_feed or (event_age or 0) >= PROXIMITY_STALE_H:
+        return "Stale"
+    return "Ongoing"
+
+
 def build_proximity_alerts(articles: List[Dict[str, Any]], locations: List[Location],
-                            all_assets: Optional[List[Asset]] = None) -> List[Dict[str, Any]]:
+                            all_assets: Optional[List[Asset]] = None,
+                            previous: Optional[tuple] = None) -> List[Dict[str, Any]]:
     """
     Phase 2: AI enrichment — take raw matches and generate site-specific
     operational impact briefs. Includes Everbridge-style supply chain enrichment:
     nearest asset (any type), top-10 asset list, affected count by type, event taxonomy.
+
+    `previous` is load_previous_proximity(). Only articles whose content hash
+    is new or changed are matched and enriched; the alerts of unchanged
+    articles are carried over (still-queued briefs go back to the scheduler)
+    and every alert moves through the notification lifecycle.
     """
-    raw_matches = _collect_raw_matches(articles, locations)
-    print(f"  [PROX] {len(raw_matches)} raw matches found → enriching top {MAX_AI_BRIEFS} with AI")
+    prev_alerts, prev_hashes = previous or ({}, {})
+    now     = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    current: Dict[str, Dict[str, Any]] = {}
+    for a in articles:
+        current.setdefault(article_key(a), a)
+    hashes  = {key: article_content_hash(a) for key, a in current.items()}
+    changed = [a for key, a in current.items() if prev_hashes.get(key) != hashes[key]]
+
+    raw_matches = _collect_raw_matches(changed, locations)
+    matched     = len(raw_matches)
+    rematched   = {(article_key(m["article"]), m["loc"].name) for m in raw_matches}
+
+    # Unchanged articles keep their alerts; gone ones age towards Expired
+    ai_ready = bool(GEMINI_API_KEY or GROQ_API_KEY)
+    sites    = {l.name: l for l in locations}
+    prev_pairs: Dict[tuple, Dict[str, Any]] = {}
+    carried = []
+    for key, old_list in prev_alerts.items():
+        article = current.get(key)
+        for old in old_list:
+            prev_pairs[(key, old.get("site_name"))] = old
+        changed_article = article is not None and prev_hashes.get(key) != hashes[key]
+        for old in old_list:
+            if old.get("notification_status") == "Expired":
+                continue   # reported as Expired last run
+            if changed_article:
+                if (key, old.get("site_name")) in rematched:
+                    continue   # re-matched above
+                # the edited article no longer places the event near this site —
+                # age the old alert out (Stale → Expired) rather than dropping it
+                alert = dict(old, article_key=key, site_matched=False,
+                             notification_status=_lifecycle_status(old, False, now))
+                carried.append(alert)
+                continue
+            in_feed = article is not None and old.get("site_matched", True)
+            loc = sites.get(old.get("site_name"))
+            if in_feed and ai_ready and loc is not None and not old.get("ai_enriched"):
+                # still waiting for a brief (queued / failed / no provider last run)
+                raw_matches.append({"article": article, "loc": loc,
+                                    "distance_km": old.get("distance_km", 0),
+                                    "match_tier": old.get("match_tier", "text")})
+                continue
+            alert = dict(old)
+            alert["article_key"] = key
+            alert["notification_status"] = _lifecycle_status(old, in_feed, now)
+            if in_feed:
+                alert["last_seen"] = now_iso
+            carried.append(alert)
+    print(f"  [PROX] {len(changed)}/{len(current)} articles new or changed → {matched} raw matches "
+          f"(+{len(raw_matches) - matched} awaiting a brief) → enriching top {MAX_AI_BRIEFS} with AI")
 
     alerts = []
-    ai_calls = 0
-
-    for m in raw_matches:
-        article      = m["article"]
-        loc          = m["loc"]
-        distance_km  = m["distance_km"]
-
-        art_time    = article.get("time") or article.get("timestamp", "")
-        art_url     = article.get("url") or article.get("link", "")
-        art_snippet = (article.get("body") or article.get("snippet")
-                       or article.get("summary") or "")[:300]
-        severity    = int(article.get("severity", 1))
-
-        # ── AI site-specific brief (top N only, then fall back to generic) ───
-        ai_brief = None
-        if ai_calls < MAX_AI_BRIEFS and (GEMINI_API_KEY or GROQ_API_KEY):
-            if ai_calls > 0:
-                delay = GEMINI_DELAY_S if GEMINI_API_KEY else GROQ_DELAY_S
-                time.sleep(delay)
-            ai_brief  = generate_site_brief(
-                article, loc.name, loc.region, distance_km,
-                m.get("match_tier", "text")
-            )
-            ai_calls += 1
-            model_used = ai_brief.get("ai_model", "unknown") if ai_brief else "failed"
-            print(f"    Brief [{model_used}]: {loc.name[:35]}")
-
-        if ai_brief:
-            site_impact  = ai_brief.get("site_impact", "")
-            rsm_action   = ai_brief.get("rsm_action", "")
-            second_order = ai_brief.get("second_order", "")
-            ai_enriched  = True
+    assets = asset_index(all_assets) if all_assets and raw_matches else None
+
+    # Cached briefs are free; the MAX_AI_BRIEFS budget goes to the uncached
+    # matches with the highest brief_priority(), requested BRIEF_BATCH_SIZE at a
+    # time and concurrently (paced per provider by the RPM limiters) while the
+    # alerts are assembled in raw-match order below. The rest are queued.
+    cache  = BRIEF_CACHE.load()
+    models = _brief_models()
+    now    = datetime.now(timezone.utc)
+    cached, queue = {}, []
+    for idx, m in enumerate(raw_matches):
+        hit, status = cache.lookup(m["article"], m["loc"].name, m["distance_km"], models)
+        m["priority"] = brief_priority(m, status, now)
+        if hit:
+            hit["cached"] = True
+            cached[idx] = hit
         else:
-            # Graceful fallback — still useful, just not site-specific
-            op_impact    = article.get("operational_impact", "")
-            site_impact  = op_impact if op_impact else art_snippet
-            rsm_action   = ""
-            second_order = article.get("second_order", "")
-            ai_enriched  = False
-
-        # ── Everbridge Layer 2-4: supply chain enrichment ──────────────────
-        art_lat = article.get("lat")
-        art_lon = article.get("lon")
-        top10       = []
-        nearest_asset_name     = loc.name
-        nearest_asset_type     = "Building"
-        nearest_asset_dist     = distance_km
-        affected_by_type: dict = {}
-        event_taxonomy = get_event_type_taxonomy(
-            article.get("category", ""), article.get("title", ""),
-            article.get("body") or article.get("snippet") or article.get("summary") or ""
-        )
-        if all_assets and art_lat is not None and art_lon is not None:
-            try:
-                top10 = nearest_10_assets(float(art_lat), float(art_lon), all_assets)
-                if top10:
-                    nearest_asset_name = top10[0]["name"]
-                    nearest_asset_type = top10[0]["type"]
-                    nearest_asset_dist = top10[0]["distance_km"]
-                    affected_by_type   = count_by_type(top10)
-            except (ValueError, TypeError):
-                pass
-        # ───────────────────────────────────────────────────────────────────
-
-        alerts.append({
-            # Event fields
-            "article_title":     article.get("title", ""),
-            "article_source":    article.get("source", ""),
-            "article_timestamp": art_time,
-            "article_link":      art_url,
-            "category":          article.get("category", "GENERAL"),
-            "severity":          severity,
-            # Site fields (nearest Dell building — legacy compatibility)
-            "site_name":         loc.name,
-            "site_region":       loc.region,
-            "site_country":      loc.country,
-            "site_type":         _infer_site_type(loc.name),
-            "distance_km":       distance_km,
-            "lat":               art_lat if art_lat is not None else loc.lat,
-            "lon":               art_lon if art_lon is not None else loc.lon,
-            # Intelligence fields
-            "site_impact":       site_impact,
-            "rsm_action":        rsm_action,
-            "second_order":      second_order,
-            "ai_enriched":       ai_enriched,
-            "ai_model":          ai_brief.get("ai_model", "") if ai_brief else "",
-            # Everbridge-style supply chain fields
-            "nearest_asset_name":        nearest_asset_name,
-            "nearest_asset_type":        nearest_asset_type,
-            "nearest_asset_distance_km": nearest_asset_dist,
-            "nearest_10_assets":         top10,
-            "affected_count_by_type":    affected_by_type,
-            "event_type_taxonomy":       event_taxonomy,
-            "notification_status":       "New",
-        })
-
-    print(f"  [PROX] {ai_calls} AI briefs generated, {len(alerts)} total alerts")
+            queue.append(idx)
+    todo = []
+    if GEMINI_API_KEY or GROQ_API_KEY:
+        queue.sort(key=lambda idx: (-raw_matches[idx]["priority"], idx))
+        todo = queue[:MAX_AI_BRIEFS]
+    # Batch an article's sites together (first-seen order) so its event text is sent once
+    first_seen: Dict[int, int] = {}
+    for idx in todo:
+        first_seen.setdefault(id(raw_matches[idx]["article"]), idx)
+    todo.sort(key=lambda idx: (first_seen[id(raw_matches[idx]["article"])], idx))
+
+    pool   = ThreadPoolExecutor(max_workers=BRIEF_WORKERS, thread_name_prefix="brief")
+    briefs = {}   # raw match index → (future of the batch, position in it)
+    batch_size = max(1, BRIEF_BATCH_SIZE)
+    for lo in range(0, len(todo), batch_size):
+        batch = todo[lo:lo + batch_size]
+        items = [(raw_matches[idx]["article"], raw_matches[idx]["loc"].name,
+                  raw_matches[idx]["loc"].region, raw_matches[idx]["distance_km"],
+                  raw_matches[idx].get("match_tier", "text")) for idx in batch]
+        fut = pool.submit(generate_site_briefs, items)
+        for pos, idx in enumerate(batch):
+            briefs[idx] = (fut, pos)
+    started = time.monotonic()
+
+    late_expired = 0
+    try:
+        for idx, m in enumerate(raw_matches):
+            # ── AI site-specific brief (cache, else top N, else generic) ─────
+            ai_brief = cached.get(idx)
+            if ai_brief:
+                status = "cached"
+            elif idx in briefs:
+                fut, pos = briefs[idx]
+                try:
+                    ai_brief = fut.result()[pos]
+                except Exception as e:   # one failed brief must not sink the run
+                    print(f"    Brief error for {m['loc'].name[:35]}: {e}")
+                model_used = ai_brief.get("ai_model", "unknown") if ai_brief else "failed"
+                print(f"    Brief [{model_used}]: {m['loc'].name[:35]} (priority {m['priority']:.3f})")
+                cache.put(m["article"], m["loc"].name, m["distance_km"], ai_brief)
+                status = "generated" if ai_brief else "failed"
+            else:
+                status = "queued" if (GEMINI_API_KEY or GROQ_API_KEY) else "none"
+            alert = _proximity_alert(m, ai_brief, assets, status)
+            old   = prev_pairs.get((alert["article_key"], alert["site_name"]))
+            state = _lifecycle_status(dict(alert, last_seen=now_iso), True, now)
+            if old is None and state == "Expired":
+                late_expired += 1   # first seen already past PROXIMITY_EXPIRE_H — reported once
+            alert["notification_status"] = state if old or state == "Expired" else "New"
+            alert["first_seen"] = (old or {}).get("first_seen") or now_iso
+            alert["last_seen"]  = now_iso
+            alerts.append(alert)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        cache.save()
+
+    enriched = sum(a["ai_enriched"] for a in alerts)
+    print(f"  [PROX] brief cache: {len(cached)} hits, {cache.invalidated} invalidated, "
+          f"{len(cache)} stored | {sum(a['brief_status'] == 'queued' for a in alerts)} "
+          f"queued for next run")
+    print(f"  [PROX] {len(briefs)} AI briefs requested in {-(-len(briefs) // batch_size)} batches, "
+          f"{enriched} alerts enriched in "
+          f"{time.monotonic() - started:.1f}s | "
+          f"limiter wait gemini {GEMINI_LIMITER.waited_s:.1f}s, groq {GROQ_LIMITER.waited_s:.1f}s")
+
+    alerts += carried
+    alerts.sort(key=lambda a: (a["notification_status"] == "Expired",
+                               -int(a.get("severity", 1)), a.get("distance_km", 0)))
+    lifecycle: Dict[str, int] = {}
+    for a in alerts:
+        lifecycle[a["notification_status"]] = lifecycle.get(a["notification_status"], 0) + 1
+    print(f"  [PROX] {len(alerts)} total alerts ({len(carried)} carried over) {lifecycle}")
+    if late_expired:
+        print(f"  [PROX] {late_expired} first-time matches already older than "
+              f"{PROXIMITY_EXPIRE_H}h — written once as Expired, not New")
     return alerts
 
 # --- Reporting Logic ---
@@ -925,12 +1460,8 @@ def summarise_with_gemini(profile_label, articles):
         "contents": [{"parts": [{"text": prompt}]}],
         "generationConfig": {"temperature": 0.3, "maxOutputTokens": 400}
     }).encode("utf-8")
-    req = urllib.request.Request(url, data=payload,
-                                  headers={"Content-Type": "application/json"},
-                                  method="POST")
     try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            body = json.loads(resp.read().decode("utf-8"))
+        body = HTTP.post(url, payload, headers={"Content-Type": "application/json"}).json()
         return body["candidates"][0]["content"]["parts"][0]["text"]
     except Exception:
         return ""
@@ -970,13 +1501,16 @@ def main():
     print(f"Exported {len(locations)} locations to {PUBLIC_LOCATIONS_PATH}")
 
     # 2. Proximity Alerts (with full supply chain enrichment)
-    proximity_alerts = build_proximity_alerts(articles, locations, all_assets)
+    previous = load_previous_proximity(locations)
+    proximity_alerts = build_proximity_alerts(articles, locations, all_assets, previous)
+    generated_at = datetime.now(timezone.utc).isoformat()
     with open(PROXIMITY_PATH, "w", encoding="utf-8") as f:
         json.dump({
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": generated_at,
             "radius_km": RADIUS_DEFAULT_KM,
             "alerts": proximity_alerts
         }, f, indent=2)
+    save_proximity_state(generated_at, locations, articles)
     print(f"Wrote {len(proximity_alerts)} alerts to {PROXIMITY_PATH}")
 
     # 3. Reports
@@ -995,6 +1529,7 @@ def main():
         html = render_html_report(cfg["label"], body, now)
         with open(os.path.join(REPORT_DIR, f"{key}_latest.html"), "w", encoding="utf-8") as f:
             f.write(html)
-            
+    print(HTTP.summary())
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Spatial index over Dell sites and supply-chain assets.
+
+Points are mapped to unit vectors on the sphere and stored in a 3-d k-d tree.
+Straight-line (chord) distance between unit vectors is monotonic in
+great-circle distance, so the tree prunes on cheap coordinate differences and
+only the surviving candidates get a haversine. Reported distances come from the
+same haversine the scripts always used, so radius results are identical to a
+linear scan.
+
+  GeoIndex(items, coords=..., distance=haversine_km)
+    .k_nearest(lat, lon, k, max_km=None)  → [(km, item)] nearest first
+    .within_radius(lat, lon, km)          → [(km, item)] nearest first
+
+Ties on distance keep the input order, as the stable-sorted linear scans did.
+
+  SiteDistances(sites, coords=...)
+    .within(points, radii)  → per point, [(km, site_index)] for sites within its radius
+
+Many-points × few-sites distances (proximity Tier A). Site radians and cos(lat)
+are cached; with NumPy the whole points × sites matrix is computed in one shot
+to prune, and the surviving pairs are recomputed with the scalar haversine so
+distances are bit-identical to haversine_km. Without NumPy it is the scalar
+loop over the cached arrays.
+"""
+
+import heapq
+from math import asin, cos, isfinite, pi, radians, sin, sqrt
+
+try:
+    import numpy as np
+except ImportError:   # optional — SiteDistances falls back to the scalar loop
+    np = None
+
+EARTH_RADIUS_KM = 6371.0
+LEAF_SIZE       = 8
+_SLACK          = 1e-9   # chord pruning tolerance — the haversine has the final say
+MATRIX_ROWS     = 4096   # points per NumPy distance block (rows × sites float64s)
+_MATRIX_SLACK_KM = 1e-6  # vectorized trig may differ from libm in the last ulp
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km."""
+    rlat1, rlon1, rlat2, rlon2 = map(radians, [lat1, lon1, lat2, lon2])
+    dlon = rlon2 - rlon1
+    dlat = rlat2 - rlat1
+    a = sin(dlat / 2) ** 2 + cos(rlat1) * cos(rlat2) * sin(dlon / 2) ** 2
+    c = 2 * asin(sqrt(a))
+    return EARTH_RADIUS_KM * c
+
+
+def _unit_vector(lat, lon):
+    rlat, rlon = radians(lat), radians(lon)
+    return (cos(rlat) * cos(rlon), cos(rlat) * sin(rlon), sin(rlat))
+
+
+def _chord2(km):
+    """Squared chord length of an arc of `km` on the unit sphere."""
+    theta = min(km / EARTH_RADIUS_KM, pi)
+    return (2 * sin(theta / 2)) ** 2
+
+
+class GeoIndex:
+    """
+    k-d tree over (lat, lon) points. `coords(item)` returns (lat, lon);
+    `distance(lat1, lon1, lat2, lon2)` is the km metric used for the final
+    check and the reported distances.
+    """
+
+    def __init__(self, items, coords=lambda it: (it["lat"], it["lon"]),
+                 distance=haversine_km, leaf_size=LEAF_SIZE):
+        self.items    = list(items)
+        self.latlon   = [tuple(map(float, coords(it))) for it in self.items]
+        self.vec      = [_unit_vector(lat, lon) for lat, lon in self.latlon]
+        self.distance = distance
+        self.leaf     = leaf_size
+        self.root     = self._build(list(range(len(self.items)))) if self.items else None
+
+    def __len__(self):
+        return len(self.items)
+
+    # node = ("leaf", [idx...]) or (axis, split, left, right)
+    def _build(self, idx):
+        if len(idx) <= self.leaf:
+            return ("leaf", idx)
+        # split on the axis with the widest spread
+        spans = [max(self.vec[i][a] for i in idx) - min(self.vec[i][a] for i in idx)
+                 for a in range(3)]
+        axis = spans.index(max(spans))
+        idx.sort(key=lambda i: self.vec[i][axis])
+        mid = len(idx) // 2
+        return (axis, self.vec[idx[mid]][axis],
+                self._build(idx[:mid]), self._build(idx[mid:]))
+
+    @staticmethod
+    def _d2(p, q):
+        return (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2
+
+    def _candidates_within(self, q, limit2):
+        """Indices whose chord² to q is ≤ limit2."""
+        out, stack = [], [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            if node[0] == "leaf":
+                out.extend(i for i in node[1] if self._d2(self.vec[i], q) <= limit2)
+                continue
+            axis, split, left, right = node
+            diff = q[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append(near)
+            if diff * diff <= limit2:
+                stack.append(far)
+        return out
+
+    def _finish(self, lat, lon, idx, max_km=None):
+        rows = []
+        for i in idx:
+            d = self.distance(lat, lon, *self.latlon[i])
+            if max_km is None or d <= max_km:
+                rows.append((d, i))
+        rows.sort()
+        return [(d, self.items[i]) for d, i in rows]
+
+    def within_radius(self, lat, lon, km):
+        """Every item within `km` of (lat, lon), nearest first, as (distance_km, item)."""
+        if self.root is None or km < 0:
+            return []
+        limit2 = _chord2(km) * (1 + _SLACK) + _SLACK
+        return self._finish(lat, lon, self._candidates_within(_unit_vector(lat, lon), limit2), km)
+
+    def k_nearest(self, lat, lon, k, max_km=None):
+        """The k items nearest to (lat, lon) (optionally within max_km), nearest first."""
+        if self.root is None or k <= 0:
+            return []
+        q     = _unit_vector(lat, lon)
+        bound = _chord2(max_km) * (1 + _SLACK) + _SLACK if max_km is not None else float("inf")
+        heap  = []   # max-heap of (-chord², -idx) holding the k best so far
+        stack = [(self.root, 0.0)]   # (node, lower bound on chord² to anything in it)
+        while stack:
+            node, floor2 = stack.pop()
+            worst = -heap[0][0] if len(heap) >= k else bound
+            if floor2 > worst * (1 + _SLACK) + _SLACK:
+                continue
+            if node[0] == "leaf":
+                for i in node[1]:
+                    d2 = self._d2(self.vec[i], q)
+                    if d2 > bound:
+                        continue
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d2, -i))
+                    elif (d2, i) < (-heap[0][0], -heap[0][1]):
+                        heapq.heapreplace(heap, (-d2, -i))
+                continue
+            axis, split, left, right = node
+            diff = q[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append((far, max(floor2, diff * diff)))
+            stack.append((near, floor2))   # popped first
+        # Near-ties in chord space can order differently from the haversine: re-pull
+        # everything within the k-th chord (+slack) and rank by the reported distance.
+        if len(heap) >= k:
+            kth2 = -heap[0][0] * (1 + _SLACK) + _SLACK
+            idx  = self._candidates_within(q, min(kth2, bound))
+        else:
+            idx  = [-i for _, i in heap]
+        return self._finish(lat, lon, idx, max_km)[:k]
+
+
+class SiteDistances:
+    """
+    Haversine from many points to a fixed list of sites. `coords(site)` returns
+    (lat, lon). within() gives, per point, every site inside that point's radius
+    as (distance_km, site_index) in site order — the same pairs and floats a
+    haversine_km loop over the sites produces.
+    """
+
+    def __init__(self, sites, coords=lambda s: (s.lat, s.lon)):
+        latlon    = [tuple(map(float, coords(s))) for s in sites]
+        self.rlat = [radians(lat) for lat, _ in latlon]
+        self.rlon = [radians(lon) for _, lon in latlon]
+        self.cos  = [cos(r) for r in self.rlat]
+        if np is not None and latlon:
+            self._rlat = np.array(self.rlat)
+            self._rlon = np.array(self.rlon)
+            self._cos  = np.array(self.cos)
+
+    def __len__(self):
+        return len(self.rlat)
+
+    def _exact(self, rlat1, rlon1, cos1, j):
+        """haversine_km(point, site j) with the site's radians and cos cached."""
+        dlon = self.rlon[j] - rlon1
+        dlat = self.rlat[j] - rlat1
+        a = sin(dlat / 2) ** 2 + cos1 * self.cos[j] * sin(dlon / 2) ** 2
+        c = 2 * asin(sqrt(a))
+        return EARTH_RADIUS_KM * c
+
+    def _scalar(self, rlat1, rlon1, radius):
+        cos1 = cos(rlat1)
+        out  = []
+        for j in range(len(self.rlat)):
+            d = self._exact(rlat1, rlon1, cos1, j)
+            if d <= radius:
+                out.append((d, j))
+        return out
+
+    def _matrix(self, rlat1, rlon1):
+        """Points × sites distance matrix (km) for radian column vectors."""
+        dlat = self._rlat[None, :] - rlat1[:, None]
+        dlon = self._rlon[None, :] - rlon1[:, None]
+        a = np.sin(dlat / 2) ** 2 + np.cos(rlat1)[:, None] * self._cos[None, :] * np.sin(dlon / 2) ** 2
+        return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def within(self, points, radii):
+        """
+        points: [(lat, lon)] floats; radii: km per point (or one number for all).
+        Returns one [(distance_km, site_index)] list per point.
+        """
+        if not isinstance(radii, (list, tuple)):
+            radii = [radii] * len(points)
+        # a non-finite coordinate matches nothing (math.sin(inf) would raise)
+        rad = [(radians(lat), radians(lon)) if isfinite(lat) and isfinite(lon) else (float("nan"),) * 2
+               for lat, lon in points]
+        if np is None or not self.rlat:
+            return [self._scalar(rl, rn, r) if rl == rl else [] for (rl, rn), r in zip(rad, radii)]
+
+        out = []
+        with np.errstate(invalid="ignore"):
+            for lo in range(0, len(rad), MATRIX_ROWS):
+                block = rad[lo:lo + MATRIX_ROWS]
+                rr    = radii[lo:lo + MATRIX_ROWS]
+                arr   = np.array(block, dtype=float).reshape(-1, 2)
+                limit = np.array(rr, dtype=float) + _MATRIX_SLACK_KM
+                near  = self._matrix(arr[:, 0], arr[:, 1]) <= limit[:, None]
+                for row, (rl, rn) in enumerate(block):
+                    hits = []
+                    cols = np.flatnonzero(near[row]).tolist()
+                    cos1 = cos(rl) if cols else 0.0
+                    for j in cols:
+                        d = self._exact(rl, rn, cos1, j)
+                        if d <= rr[row]:
+                            hits.append((d, j))
+                    out.append(hits)
+        return out
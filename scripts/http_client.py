@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Pooled keep-alive HTTP client for the SRO pipeline scripts.
+
+urllib.request.urlopen opens a fresh TCP + TLS connection per call; the scout,
+the analyst and the proximity brief generator hit the same handful of hosts
+(news.google.com, api.gdeltproject.org, generativelanguage.googleapis.com,
+api.groq.com) dozens of times a run. HttpClient keeps idle HTTP/1.1
+connections per host and reuses them, asks for gzip/deflate and decodes it,
+and applies a per-host timeout.
+
+Errors mirror urllib: an HTTP status >= 400 raises urllib.error.HTTPError
+(e.code, e.headers, e.read()), so existing handlers keep working.
+
+stats() / summary() report requests, connections opened vs reused, handshake
+time spent and the estimated handshake time saved by reuse.
+"""
+
+import gzip
+import http.client
+import io
+import json
+import ssl
+import threading
+import time
+import urllib.error
+import zlib
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_TIMEOUT_S = 15
+MAX_IDLE_PER_HOST = 4      # idle connections kept per host
+IDLE_TTL_S        = 30.0   # servers commonly drop idle keep-alive sockets after 60 s
+MAX_REDIRECTS     = 5
+
+_REDIRECTS    = (301, 302, 303, 307, 308)
+# A reused socket the server already closed fails before any response is read —
+# safe to resend once on a fresh connection.
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 ConnectionResetError, BrokenPipeError)
+
+
+class HttpResponse:
+    """
+    A fully-read response: status, headers (case-insensitive), decoded body,
+    and wire_bytes — the body size as transferred, before Content-Encoding.
+    """
+
+    def __init__(self, url, status, reason, headers, body, wire_bytes=None):
+        self.url        = url
+        self.status     = status
+        self.reason     = reason
+        self.headers    = headers
+        self.body       = body
+        self.wire_bytes = len(body) if wire_bytes is None else wire_bytes
+
+    def text(self, encoding="utf-8"):
+        return self.body.decode(encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+
+def _decode(body, encoding):
+    encoding = (encoding or "").strip().lower()
+    if encoding in ("gzip", "x-gzip"):
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)   # raw deflate (no zlib header)
+    return body
+
+
+class _HostStats:
+    __slots__ = ("requests", "opened", "reused", "handshake_s", "wire_bytes", "body_bytes")
+
+    def __init__(self):
+        self.requests    = 0
+        self.opened      = 0
+        self.reused      = 0
+        self.handshake_s = 0.0
+        self.wire_bytes  = 0
+        self.body_bytes  = 0
+
+
+class HttpClient:
+    """
+    Thread-safe keep-alive client. Idle connections are pooled per
+    (scheme, host, port), at most MAX_IDLE_PER_HOST each, and dropped after
+    IDLE_TTL_S. `timeouts` maps a hostname to its timeout in seconds;
+    anything else uses `default_timeout`.
+    """
+
+    def __init__(self, timeouts=None, default_timeout=DEFAULT_TIMEOUT_S, user_agent=None):
+        self.timeouts        = dict(timeouts or {})
+        self.default_timeout = default_timeout
+        self.user_agent      = user_agent or "Mozilla/5.0"
+        self._ssl            = ssl.create_default_context()
+        self._idle           = {}   # (scheme, host, port) → [(conn, idle_since)]
+        self._stats          = {}   # host → _HostStats
+        self._lock           = threading.Lock()
+
+    # ── pool ──────────────────────────────────────────────────────────────────
+    def _host_stats(self, host):
+        st = self._stats.get(host)
+        if st is None:
+            st = self._stats[host] = _HostStats()
+        return st
+
+    def _checkout(self, key):
+        """An idle connection for `key`, or None. Expired ones are closed."""
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, since = idle.pop()
+                if now - since < IDLE_TTL_S:
+                    return conn
+                conn.close()
+        return None
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < MAX_IDLE_PER_HOST:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def _connect(self, key, timeout):
+        scheme, host, port = key
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        started = time.monotonic()
+        conn.connect()
+        elapsed = time.monotonic() - started
+        with self._lock:
+            st = self._host_stats(host)
+            st.opened      += 1
+            st.handshake_s += elapsed
+        return conn
+
+    # ── requests ──────────────────────────────────────────────────────────────
+    def _send(self, method, url, body, headers, timeout):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {url}")
+        host = parts.hostname
+        key  = (parts.scheme, host, parts.port or (443 if parts.scheme == "https" else 80))
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        if timeout is None:
+            timeout = self.timeouts.get(host, self.default_timeout)
+
+        hdrs = {"User-Agent": self.user_agent, "Accept-Encoding": "gzip, deflate"}
+        hdrs.update(headers or {})
+
+        conn   = self._checkout(key)
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = self._connect(key, timeout)
+            else:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+            try:
+                conn.request(method, path, body=body, headers=hdrs)
+                resp = conn.getresponse()
+                raw  = resp.read()
+                break
+            except _STALE_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                conn, reused = None, False   # resend once on a fresh connection
+            except BaseException:
+                conn.close()
+                raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+
+        decoded = _decode(raw, resp.headers.get("Content-Encoding"))
+        with self._lock:
+            st = self._host_stats(host)
+            st.requests   += 1
+            st.reused     += reused
+            st.wire_bytes += len(raw)
+            st.body_bytes += len(decoded)
+        return HttpResponse(url, resp.status, resp.reason, resp.headers, decoded, len(raw))
+
+    def request(self, method, url, data=None, headers=None, timeout=None):
+        """
+        Send one request and read the whole response. Redirects are followed
+        (303, and 301/302 on a POST, switch to GET). Raises
+        urllib.error.HTTPError for a final status >= 400, except 304.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = self._send(method, url, data, headers, timeout)
+            location = resp.headers.get("Location")
+            if resp.status not in _REDIRECTS or not location:
+                break
+            url = urljoin(url, location)
+            if resp.status == 303 or (resp.status in (301, 302) and method == "POST"):
+                method, data = "GET", None
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(resp.url, resp.status, resp.reason,
+                                         resp.headers, io.BytesIO(resp.body))
+        return resp
+
+    def get(self, url, headers=None, timeout=None):
+        return self.request("GET", url, headers=headers, timeout=timeout)
+
+    def post(self, url, data, headers=None, timeout=None):
+        return self.request("POST", url, data=data, headers=headers, timeout=timeout)
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn, _ in idle:
+                    conn.close()
+            self._idle.clear()
+
+    # ── metrics ───────────────────────────────────────────────────────────────
+    def stats(self):
+        """Per-host and total counters, plus handshake time saved by reuse (estimated)."""
+        with self._lock:
+            hosts = {}
+            for host, st in self._stats.items():
+                avg = st.handshake_s / st.opened if st.opened else 0.0
+                hosts[host] = {
+                    "requests":      st.requests,
+                    "opened":        st.opened,
+                    "reused":        st.reused,
+                    "handshake_s":   round(st.handshake_s, 3),
+                    "saved_s":       round(st.reused * avg, 3),
+                    "wire_bytes":    st.wire_bytes,
+                    "body_bytes":    st.body_bytes,
+                }
+        total = {k: sum(h[k] for h in hosts.values())
+                 for k in ("requests", "opened", "reused", "handshake_s", "saved_s",
+                           "wire_bytes", "body_bytes")}
+        total["reuse_rate"] = total["reused"] / total["requests"] if total["requests"] else 0.0
+        return {"hosts": hosts, "total": total}
+
+    def summary(self):
+        t = self.stats()["total"]
+        compressed = t["body_bytes"] - t["wire_bytes"]
+        return (f"HTTP: {t['requests']} requests over {t['opened']} connections "
+                f"({t['reuse_rate']:.0%} reused) | handshakes {t['handshake_s']:.1f}s, "
+                f"~{t['saved_s']:.1f}s saved by keep-alive"
+                + (f" | gzip saved {compressed / 1024:.0f} KB" if compressed > 0 else ""))
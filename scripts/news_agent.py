@@ -3,39 +3,62 @@
 SRO Intelligence Brain v2.0 — Multi-source AI intelligence pipeline
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
   Scout   → Curated RSS feeds + GDELT real-time global news
-  Analyst → Groq batch (primary) or Gemini 2.0 Flash (if quota available)
+  Analyst → Gemini 2.0 Flash batches, failing over to Groq, then keywords
              Full Dell operational context — second-order reasoning
              No keyword gating — AI reasons about intent and impact
   Output  → news.json scored, filtered, Dell-context-aware
 
-AI priority order:
-  1. Groq llama-3.3-70b  — primary (14,400 req/day free, 30 RPM, batch mode)
-  2. Gemini 2.0 Flash    — upgrade path (1500 req/day, requires valid quota)
-  3. Keyword fallback    — last resort
+AI failover order (per batch — a provider with an open circuit breaker is skipped):
+  1. Gemini 2.0 Flash    — primary when GEMINI_API_KEY is set (15 RPM, 1500 req/day)
+  2. Groq llama-3.1-8b   — 30 RPM / 6k TPM free tier, may be blocked from CI
+  3. Keyword fallback    — anything no provider could take
 
 Environment variables:
-  GROQ_API_KEY     — primary AI (already configured)
-  GEMINI_API_KEY   — optional upgrade (get new key from aistudio.google.com)
+  GEMINI_API_KEY   — primary AI (get a key from aistudio.google.com)
+  GROQ_API_KEY     — failover AI, also used alone when GEMINI_API_KEY is unset
 """
 
+import hashlib
+import html as html_lib
 import json
 import os
+import queue
+import random
 import re
 import time
 import math
 import socket
-import urllib.request
+import threading
 import urllib.error
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timezone
-from urllib.parse import urlparse, urlencode
+from urllib.parse import urlparse, urlunparse, urlencode, parse_qsl
 
 import feedparser
 from bs4 import BeautifulSoup
 
+from feedback_store import FeedbackStore
+from geo_index import GeoIndex
+from http_client import HttpClient
+from rate_limit import (CircuitBreaker, SlidingWindowLimiter, TokenBucket, backoff_delay,
+                        parse_duration_s)
+from term_scan import TermBuckets, alternatives, gated_finditer, word_gate
+
 # Hard timeout for ALL network calls (feedparser, urllib, GDELT)
 # Without this, a single hanging RSS feed can stall the pipeline for minutes
 socket.setdefaulttimeout(8)
 
+# One keep-alive connection pool for every outbound call (feeds, GDELT, Gemini, Groq).
+# Feeds use the 8 s default; the APIs get longer per-host timeouts.
+HTTP_TIMEOUTS = {
+    "api.gdeltproject.org":              15,
+    "generativelanguage.googleapis.com": 30,
+    "api.groq.com":                      30,
+}
+HTTP = HttpClient(timeouts=HTTP_TIMEOUTS, default_timeout=8)
+FEED_USER_AGENT = getattr(feedparser, "USER_AGENT", "Mozilla/5.0")
+
 # ── Paths ──────────────────────────────────────────────────────────────────────
 BASE_DIR   = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR   = os.path.join(BASE_DIR, "public", "data")
@@ -44,29 +67,114 @@ os.makedirs(DATA_DIR, exist_ok=True)
 
 NEWS_PATH      = os.path.join(DATA_DIR, "news.json")
 FEEDBACK_PATH  = os.path.join(DATA_DIR, "feedback.jsonl")
+CACHE_DIR      = os.path.join(DATA_DIR, ".cache")
+FEED_CACHE_PATH = os.path.join(CACHE_DIR, "feeds.json")
+CLASSIFY_CACHE_PATH = os.path.join(CACHE_DIR, "classifications.json")
+FEEDBACK_INDEX_PATH = os.path.join(CACHE_DIR, "feedback_index.json")
 LOCATIONS_PATH = os.path.join(CONFIG_DIR, "locations.json")
 
-# ── Groq config (PRIMARY AI) ───────────────────────────────────────────────────
+# ── Groq config (FAILOVER AI) ─────────────────────────────────────────────────
 GROQ_API_URL       = "https://api.groq.com/openai/v1/chat/completions"
 GROQ_MODEL         = "llama-3.1-8b-instant"  # confirmed free tier, fast, reliable
-GROQ_BATCH_SIZE    = 8    # articles per call
+GROQ_BATCH_SIZE    = 16   # max articles per call (calls are packed by GROQ_BATCH_TOKENS)
+GROQ_BATCH_TOKENS  = 1600 # est. article tokens per call — free tier is TPM-bound (6k TPM)
+GROQ_MAX_OUTPUT_TOKENS = 2048
 GROQ_MAX_CALLS     = 100  # 48 runs/day × 100 = 4800 (well within 14,400/day free)
-GROQ_DELAY_S       = 2.5  # 30 RPM limit → 1 call per 2s minimum; 2.5s is safe
+GROQ_RPM           = 30   # free tier: 30 requests / minute
+GROQ_TPM           = 6000 # free tier: 6k tokens / minute (prompt + completion)
+GROQ_WORKERS       = 4    # batches in flight; the limiter does the pacing
 MIN_RELEVANCE_SCORE = 4   # 1-10 scale — below this is discarded
 
-# ── Gemini config (OPTIONAL UPGRADE) ──────────────────────────────────────────
+# ── Classification cache ───────────────────────────────────────────────────────
+# Same article seen 6h later → reuse the stored AI verdict instead of spending quota.
+CLASSIFY_CACHE_TTL_H  = 72     # verdicts older than this are re-classified
+CLASSIFY_CACHE_MAX    = 5000   # newest N verdicts kept on disk
+
+def _keyword_result(article, analysis, tag="KW"):
+    """Turn one keyword_classify() result into a news.json item, or None if it had no hit."""
+    if not analysis:
+        return None
+    cat     = analysis.get("category", "NOT_RELEVANT")
+    sev_str = (analysis.get("severity") or "LOW").upper()
+    sev_num = _SEV_NUM.get(sev_str, 1)
+    print(f"  [{tag}] {cat:20s} sev={sev_num} keyword | {article['title'][:70]}")
+    return {
+        "title":              article["title"],
+        "url":                article["url"],
+        "snippet":            article["body"][:160],
+        "body":               article["body"][:600],
+        "source":             article["source"],
+        "time":               article["time"],
+        "region":             map_region(article["title"]),
+        "severity":           sev_num,
+        "type":               _TYPE_MAP.get(cat, "GENERAL"),
+        "locations":          [],
+        "operational_impact": "",
+        "second_order":       "",
+        "ai_score":           5,
+    }
+
+
+# ── Near-duplicate detection ───────────────────────────────────────────────────
+# Syndicated copies (BBC / Guardian / Al Jazeera / Google News / GDELT) are clustered
+# before batching; only the first copy is classified and its verdict is fanned out.
+NEAR_DUP_TITLE_J   = 0.7   # Jaccard on title word uni+bigrams to call two items the same story
+NEAR_DUP_BODY_J    = 0.6   # Jaccard on body word 3-grams (only when both carry real body text)
+MINHASH_PERM       = 64    # MinHash signature length
+LSH_BANDS          = 16    # 16 bands × 4 rows → candidates from ~0.5 similarity, verified exactly
+
+# ── Gemini config (PRIMARY AI) ────────────────────────────────────────────────
 GEMINI_MODEL       = "gemini-2.0-flash"
 GEMINI_API_BASE    = "https://generativelanguage.googleapis.com/v1beta/models"
-GEMINI_BATCH_SIZE  = 6    # articles per call — keep prompt compact
+GEMINI_BATCH_SIZE  = 16   # max articles per call (calls are packed by GEMINI_BATCH_TOKENS)
+GEMINI_BATCH_TOKENS = 2400  # est. article tokens per call, on top of the fixed system prompt
+GEMINI_MAX_OUTPUT_TOKENS = 2048
 GEMINI_MAX_CALLS   = 12   # 12 × 48 runs/day = 576 calls/day (well under 1500 RPD limit)
-GEMINI_DELAY_S     = 5.0  # 15 RPM free tier → 4s minimum; 5s is safe
-# Token budget: 12 calls × ~700 tokens × 48 runs = ~403k tokens/day (under 1M daily limit)
+GEMINI_RPM         = 15   # free tier: 15 requests / minute
+GEMINI_TPM         = 1_000_000
+GEMINI_WORKERS     = 4    # batches in flight; the limiter does the pacing
+# Token budget: 12 calls × ~3k tokens × 4 runs/day = ~144k tokens/day (under 1M daily limit)
+
+# ── Batch packing ──────────────────────────────────────────────────────────────
+# GDELT items are a bare title, RSS items carry up to 250 chars of body — pack calls
+# by estimated tokens instead of a fixed article count, and never ask for more
+# assessments than maxOutputTokens can hold (truncated JSON loses the whole batch).
+CHARS_PER_TOKEN        = 4     # rough English/JSON ratio for both Llama and Gemini tokenizers
+OUTPUT_TOKENS_PER_ITEM = 130   # one assessment object incl. impact + second-order sentences
+OUTPUT_TOKEN_HEADROOM  = 0.85  # use at most 85% of maxOutputTokens
+
+# ── AI retry policy ────────────────────────────────────────────────────────────
+# 429 / 5xx responses are retried after Retry-After (or the provider's retryDelay),
+# else after a full-jitter exponential backoff.
+AI_MAX_RETRIES     = 3
+AI_BACKOFF_BASE_S  = 2.0
+AI_BACKOFF_CAP_S   = 60.0
+AI_RETRY_STATUS    = (429, 500, 502, 503)
+
+# ── Provider failover ──────────────────────────────────────────────────────────
+# Providers are tried in order per batch (Gemini → Groq). A provider whose breaker
+# is open is skipped; batches no provider takes are classified by keyword.
+AI_BREAKER_FAILURES   = 3      # consecutive failed batches that open a provider's breaker
+AI_BREAKER_COOLDOWN_S = 120.0  # then one probe batch is let through
 
 # ── GDELT config ───────────────────────────────────────────────────────────────
 GDELT_API_URL   = "https://api.gdeltproject.org/api/v2/doc/doc"
 GDELT_TIMESPAN  = "60min"   # look back 60 min (GDELT has ~10-15 min lag)
 GDELT_MAX_ARTS  = 20        # per query — reduced to avoid hammering their servers
 GDELT_DELAY_S   = 4.0       # seconds between GDELT queries — they rate-limit fast requests
+GDELT_WORKERS   = 3         # queries in flight; issue rate is still capped by the token bucket
+GDELT_MAX_RETRIES = 2       # retries per query after a rate-limit response
+
+# ── Scout concurrency ──────────────────────────────────────────────────────────
+# Feeds are fetched in parallel; wall time ≈ slowest single feed instead of the sum.
+# Per-host cap stops us opening a dozen sockets to news.google.com at once.
+FEED_WORKERS       = 12   # max feeds in flight overall
+FEED_PER_HOST      = 2    # max feeds in flight against any one host
+FEED_ENTRIES_KEPT  = 6    # newest entries taken from each feed (and cached for 304s)
+
+# ── Streaming pipeline ─────────────────────────────────────────────────────────
+ARTICLE_QUEUE_MAX  = 64   # scout → analyst backlog; scout blocks when the analyst falls behind
+BATCH_FLUSH_S      = 3.0  # send a partial AI batch once its oldest article waited this long
 
 # ── Dell site data ─────────────────────────────────────────────────────────────
 def _load_sites():
@@ -142,7 +250,7 @@ FEEDS = [
 # ── GDELT real-time queries ────────────────────────────────────────────────────
 # GDELT monitors every global news source in near real-time, translated from 65 langs.
 # Catches events that never make it to Western RSS feeds (local strikes, regional unrest).
-# No API key needed. Rate limit: use GDELT_DELAY_S between each query.
+# No API key needed. Rate limit: one shared token bucket at 1 query per GDELT_DELAY_S.
 # Kept to 8 queries (down from 12) to stay within rate limits.
 GDELT_QUERIES = [
     "civil unrest protest riot curfew state of emergency",
@@ -193,8 +301,9 @@ _CYBER_ONLY = re.compile(
 _DELL_MENTION = re.compile(r"\bdell\b", flags=re.IGNORECASE)
 
 # ── Cyber source domain/link blocklist — 100% IT/cyber security sources ───────
-# Checked as substring of the FULL URL (not just domain) so feedburner relay URLs
-# like feeds.feedburner.com/SecurityWeek are also caught.
+# Matched against the link's host (any subdomain); entries with a path are matched
+# as host + path prefix so feedburner relay URLs like feeds.feedburner.com/SecurityWeek
+# are also caught. See Prefilter.
 _CYBER_DOMAINS = frozenset({
     # Full domains
     "welivesecurity.com", "thehackernews.com", "bleepingcomputer.com",
@@ -215,10 +324,183 @@ _CYBER_DOMAINS = frozenset({
     "feedburner.com/threatpost", "feedburner.com/infosecurity",
 })
 
+
+# ── Prefilter engine ───────────────────────────────────────────────────────────
+class Prefilter:
+    """
+    All scout block rules evaluated in one pass per article:
+      * _HARD_BLOCK, _CYBER_ONLY and _DELL_MENTION merged into one alternation
+        regex with named groups. A trie-shaped gate built from the literal
+        prefix of every alternative scans the lowercased text once; the full
+        regex only runs at the few word starts the gate flags, and each hit is
+        attributed by group name and position (title / body slice).
+      * _CYBER_DOMAINS turned into a host-suffix table (+ path prefixes for
+        relay entries like feedburner.com/securityweek) — a handful of dict
+        lookups per link instead of a substring scan over every domain.
+    check() returns the name of the rule that fired (or None) and keeps
+    per-rule counters plus total time spent, reported by summary().
+    """
+
+    RULES = ("feedback", "hard_block", "cyber_domain", "cyber_only")
+
+    _SCAN = re.compile(
+        f"(?P<hard_block>{_HARD_BLOCK.pattern})"
+        f"|(?P<cyber_only>{_CYBER_ONLY.pattern})"
+        f"|(?P<dell>{_DELL_MENTION.pattern})",
+        flags=re.IGNORECASE,
+    )
+    _GATE = word_gate(alt for rx in (_HARD_BLOCK, _CYBER_ONLY, _DELL_MENTION)
+                       for alt in alternatives(rx.pattern))
+
+    def __init__(self, domains=_CYBER_DOMAINS):
+        self.hosts = {}     # host suffix → [path prefixes]; [] = whole host blocked
+        for d in sorted(domains, key=lambda d: "/" in d):   # whole hosts first
+            host, _, path = d.lower().partition("/")
+            if not path:
+                self.hosts[host] = []
+            elif self.hosts.get(host) != []:
+                self.hosts.setdefault(host, []).append("/" + path)
+        self.counts = dict.fromkeys(self.RULES, 0)
+        self.passed = 0
+        self.time_s = 0.0
+
+    def _blocked_link(self, link):
+        try:
+            p = urlparse(link.strip().lower())
+        except ValueError:
+            return False
+        labels = p.netloc.rsplit("@", 1)[-1].split(":", 1)[0].split(".")
+        for i in range(len(labels) - 1):
+            prefixes = self.hosts.get(".".join(labels[i:]))
+            if prefixes is None:
+                continue
+            if not prefixes or any(p.path.startswith(pp) for pp in prefixes):
+                return True
+        return False
+
+    def _rule_for(self, title, body, link):
+        dell_end  = len(title) + 1 + len(body[:100])
+        cyber_hit = dell_hit = False
+        for m in gated_finditer(self._SCAN, self._GATE, f"{title} {body[:200]}"):
+            group = m.lastgroup
+            if group == "hard_block":
+                return "hard_block"
+            if group == "cyber_only":
+                cyber_hit = cyber_hit or m.end() <= len(title)
+            elif m.end() <= dell_end:
+                dell_hit = True
+        if link and self._blocked_link(link):
+            return "cyber_domain"
+        if cyber_hit and not dell_hit:
+            return "cyber_only"
+        return None
+
+    def check(self, title, body="", link=""):
+        """Rule name that blocks this article, or None if it passes."""
+        started = time.perf_counter()
+        rule = self._rule_for(title, body, link)
+        self.time_s += time.perf_counter() - started
+        if rule:
+            self.counts[rule] += 1
+        else:
+            self.passed += 1
+        return rule
+
+    def count(self, rule):
+        """Record a block decided outside check() (e.g. analyst feedback keys)."""
+        self.counts[rule] += 1
+
+    def summary(self):
+        removed = ", ".join(f"{r}={n}" for r, n in self.counts.items())
+        checked = self.passed + sum(self.counts.values())
+        return (f"Prefilter: {checked} checked, {self.passed} passed | removed {removed} "
+                f"| {self.time_s * 1000:.1f} ms")
+
 # ── Helpers ────────────────────────────────────────────────────────────────────
-def _clean(html):
-    """Strip HTML tags, return plain text."""
-    return BeautifulSoup(html, "html.parser").get_text(" ", strip=True) if html else ""
+RAW_BODY_CHARS = 500   # body text kept per entry — _clean stops extracting once it has this much
+
+# Fast tag stripper: tags/comments are token boundaries, text runs are unescaped and
+# stripped then joined with " " — byte-identical to get_text(" ", strip=True) for
+# well-formed markup. Anything html.parser treats specially falls back to BeautifulSoup.
+_TAG_RE = re.compile(
+    r"<!--.*?-->"                                          # comment
+    r"|<[!?][^>]*>"                                        # doctype / PI
+    r"|</?[A-Za-z][^>\"']*(?:(?:\"[^\"]*\"|'[^']*')[^>\"']*)*>",  # start/end tag, quoted attrs may hold '>'
+    flags=re.DOTALL,
+)
+_FALLBACK_TAG_RE = re.compile(r"<(?:script|style|template)\b|<!\[CDATA\[", re.IGNORECASE)
+_STRAY_LT_RE     = re.compile(r"<[A-Za-z/!?]")   # unterminated tag inside a text run
+# A comment html.parser closes where we do: not "<!-->" / "<!--->", no "--!>" inside
+_GOOD_COMMENT_RE = re.compile(r"<!--(?!-?>)(?:(?!--!>).)*?-->", re.DOTALL)
+_ENTITY_RE       = re.compile(r"&(?:#[0-9]+|#[xX][0-9A-Fa-f]+|([A-Za-z][A-Za-z0-9]*));|&(?=[\s&]|$)")
+
+
+def _safe_entities(text):
+    """True if every '&' is a well-formed entity (or bare '&') that html.unescape decodes like html.parser."""
+    count = 0
+    for m in _ENTITY_RE.finditer(text):
+        if m.group(1) and (m.group(1) + ";") not in html_lib.entities.html5:
+            return False
+        count += 1
+    return count == text.count("&")
+
+
+def _fast_text(html, limit=None):
+    """
+    Streaming tag stripper. Returns plain text (at least `limit` chars when the
+    input has that many, possibly more) or None if the markup needs the full parser.
+    """
+    if "<!--" in html and html.count("<!--") != len(_GOOD_COMMENT_RE.findall(html)):
+        return None   # malformed comment — html.parser keeps some of these as text
+    parts, size, pos = [], 0, 0
+    for m in _TAG_RE.finditer(html):
+        if limit is not None and size >= limit:
+            return " ".join(parts)
+        tag = m.group(0)
+        if _FALLBACK_TAG_RE.match(tag):
+            return None   # raw-text element or CDATA
+        if tag.startswith("<!--") and not tag.endswith("-->") or \
+                not tag.startswith("<!--") and "<" in tag[1:]:
+            return None   # unterminated comment, or a tag swallowing another one
+        chunk = html[pos:m.start()]
+        pos = m.end()
+        if chunk:
+            if _STRAY_LT_RE.search(chunk):
+                return None
+            if "&" in chunk:
+                if not _safe_entities(chunk):
+                    return None
+                chunk = html_lib.unescape(chunk)
+            chunk = chunk.strip()
+            if chunk:
+                size += len(chunk) + (1 if parts else 0)
+                parts.append(chunk)
+    if limit is None or size < limit:
+        chunk = html[pos:]
+        if _STRAY_LT_RE.search(chunk):
+            return None
+        if "&" in chunk:
+            if not _safe_entities(chunk):
+                return None
+            chunk = html_lib.unescape(chunk)
+        chunk = chunk.strip()
+        if chunk:
+            parts.append(chunk)
+    return " ".join(parts)
+
+
+def _clean(html, limit=None):
+    """
+    Strip HTML tags, return plain text. With `limit`, extraction stops once that
+    many characters are produced (callers slice to exactly `limit`). Markup the
+    fast path can't guarantee parity on goes through BeautifulSoup.
+    """
+    if not html:
+        return ""
+    text = _fast_text(html, limit)
+    if text is None:
+        text = BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+    return text
 
 
 def _haversine_km(lat1, lon1, lat2, lon2):
@@ -231,23 +513,177 @@ def _haversine_km(lat1, lon1, lat2, lon2):
     return R * 2 * math.asin(math.sqrt(a))
 
 
+_SITE_INDEX = GeoIndex([s for s in DELL_SITES if s.get("lat") is not None and s.get("lon") is not None],
+                       distance=_haversine_km)
+
+
 def _nearest_site(lat, lon):
     """Return (site_name, distance_km) for nearest Dell site."""
-    if not DELL_SITES or not lat or not lon:
+    if not _SITE_INDEX or not lat or not lon:
         return None, None
-    best, best_d = None, float("inf")
-    for s in DELL_SITES:
-        d = _haversine_km(lat, lon, s["lat"], s["lon"])
-        if d < best_d:
-            best_d, best = d, s["name"]
-    return best, round(best_d)
+    (best_d, site), = _SITE_INDEX.k_nearest(lat, lon, 1)
+    return site["name"], round(best_d)
+
+
+# ── RSS Scout (concurrent fetch) ─────────────────────────────────────────────
+_host_locks = {}
+_host_locks_guard = threading.Lock()
+
+
+def _host_semaphore(url):
+    """Shared per-host semaphore limiting concurrent requests to one publisher."""
+    host = urlparse(url).netloc.lower()
+    with _host_locks_guard:
+        sem = _host_locks.get(host)
+        if sem is None:
+            sem = _host_locks[host] = threading.BoundedSemaphore(FEED_PER_HOST)
+    return sem
+
+
+def load_feed_cache():
+    """Load {feed_url: {etag, modified, entries, bytes}} persisted by the last run."""
+    try:
+        with open(FEED_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"  WARN: feed cache unreadable, starting cold: {e}")
+        return {}
+
+
+def save_feed_cache(cache):
+    """Atomically persist the feed cache (tmp file + os.replace)."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = FEED_CACHE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, FEED_CACHE_PATH)
+    except Exception as e:
+        print(f"  WARN: could not save feed cache: {e}")
+
+
+def _entry_record(e):
+    """Reduce a feedparser entry to the plain, JSON-safe fields the scout uses."""
+    content = ""
+    try:
+        if getattr(e, "content", None):
+            content = e.content[0].value or ""
+    except Exception:
+        pass
+    published = getattr(e, "published_parsed", None)
+    return {
+        "title":     getattr(e, "title", "") or "",
+        "summary":   getattr(e, "summary", "") or "",
+        "content":   content,
+        "link":      getattr(e, "link", "") or "",
+        "published": list(published[:6]) if published else None,
+    }
+
+
+def _fetch_feed(feed_url, cached=None):
+    """
+    Fetch + parse one feed, sending If-None-Match / If-Modified-Since from the
+    cache. A 304 reuses the cached entries without parsing anything.
+    Returns a result dict: url, entries, entry_count, status, etag, modified,
+    bytes (transferred size of the last 200, i.e. what a 304 saves), cache_hit,
+    error, seconds.
+    """
+    cached  = cached or {}
+    started = time.monotonic()
+    result  = {"url": feed_url, "entries": [], "entry_count": 0, "status": None,
+               "etag": None, "modified": None, "bytes": 0, "cache_hit": False,
+               "error": None, "seconds": 0.0}
+    headers = {"User-Agent": FEED_USER_AGENT}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("modified"):
+        headers["If-Modified-Since"] = cached["modified"]
+    try:
+        with _host_semaphore(feed_url):
+            resp = HTTP.get(feed_url, headers=headers)
+        result["status"] = resp.status
+        if resp.status == 304 and cached.get("entries") is not None:
+            result.update(entries=cached["entries"], entry_count=cached.get("entry_count", 0),
+                          etag=cached.get("etag"), modified=cached.get("modified"),
+                          bytes=cached.get("bytes", 0), cache_hit=True)
+        else:
+            # feedparser wants lower-cased header names; content-location is the base
+            # for relative links, as when it fetches the URL itself
+            resp_headers = {k.lower(): v for k, v in resp.headers.items()}
+            resp_headers.setdefault("content-location", resp.url)
+            parsed  = feedparser.parse(resp.body, response_headers=resp_headers)
+            entries = getattr(parsed, "entries", []) or []
+            result.update(entries=[_entry_record(e) for e in entries[:FEED_ENTRIES_KEPT]],
+                          entry_count=len(entries),
+                          etag=resp.headers.get("ETag"),
+                          modified=resp.headers.get("Last-Modified"),
+                          bytes=resp.wire_bytes)
+    except Exception as ex:
+        result["error"] = ex
+    result["seconds"] = time.monotonic() - started
+    return result
+
+
+def fetch_feeds(feed_urls, cache=None):
+    """
+    Fetch all feeds concurrently (bounded by FEED_WORKERS / FEED_PER_HOST).
+    Yields _fetch_feed result dicts in the ORIGINAL feed order, so downstream
+    title dedup stays deterministic run to run.
+    """
+    if not feed_urls:
+        return
+    cache = cache or {}
+    with ThreadPoolExecutor(max_workers=min(FEED_WORKERS, len(feed_urls))) as pool:
+        futures = [pool.submit(_fetch_feed, u, cache.get(u)) for u in feed_urls]
+        for fut in futures:
+            yield fut.result()
+
+
+def _update_feed_cache(cache, res):
+    """Record validators + entries from a fresh 200 so the next run can send a conditional GET."""
+    if res["error"] is not None or res["cache_hit"]:
+        return
+    if not (res["etag"] or res["modified"]) or not res["entries"]:
+        cache.pop(res["url"], None)   # no validators → nothing to revalidate against
+        return
+    cache[res["url"]] = {
+        "etag":        res["etag"],
+        "modified":    res["modified"],
+        "entries":     res["entries"],
+        "entry_count": res["entry_count"],
+        "bytes":       res["bytes"],
+        "fetched_at":  datetime.now(timezone.utc).isoformat(),
+    }
 
 
 # ── GDELT Scout ───────────────────────────────────────────────────────────────
-def fetch_gdelt(query):
+class GdeltRateLimited(Exception):
+    """GDELT answered with a 429 or its plain-text 'Please limit requests' notice."""
+
+    def __init__(self, retry_after=0.0):
+        super().__init__("rate limited")
+        self.retry_after = retry_after
+
+
+def _retry_after_s(headers):
+    """Parse a Retry-After header (seconds form only); 0 if absent/unparseable."""
+    try:
+        return max(0.0, float((headers or {}).get("Retry-After") or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def fetch_gdelt(query, limiter=None, stats=None):
     """
     Query GDELT Doc 2.0 API. Returns list of raw article dicts.
     Free, no API key. Covers global news in near real-time.
+
+    When a TokenBucket `limiter` is given every request waits for a token, and a
+    rate-limit response backs the bucket off and retries (GDELT_MAX_RETRIES).
+    `stats`, if a dict, is filled with latency_s / wait_s / attempts / rate_limited.
     """
     params = {
         "query":       query,
@@ -259,10 +695,38 @@ def fetch_gdelt(query):
         "sort":        "datedesc",
     }
     url = GDELT_API_URL + "?" + urlencode(params)
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+    stats = stats if stats is not None else {}
+    stats.update(latency_s=0.0, wait_s=0.0, attempts=0, rate_limited=0)
+    for attempt in range(GDELT_MAX_RETRIES + 1):
+        if limiter is not None:
+            stats["wait_s"] += limiter.acquire()
+        stats["attempts"] += 1
+        started = time.monotonic()
+        try:
+            try:
+                text = HTTP.get(url).text()
+            except urllib.error.HTTPError as e:
+                if e.code == 429:
+                    raise GdeltRateLimited(_retry_after_s(e.headers))
+                raise
+            finally:
+                stats["latency_s"] += time.monotonic() - started
+            if text.lstrip().lower().startswith("please limit"):
+                raise GdeltRateLimited()
+            data = json.loads(text)
+        except GdeltRateLimited as rl:
+            stats["rate_limited"] += 1
+            if limiter is None or attempt >= GDELT_MAX_RETRIES:
+                print(f"    GDELT rate-limited [{query[:40]}] — giving up")
+                return []
+            limiter.backoff(pause_s=rl.retry_after or GDELT_DELAY_S)
+            continue
+        except Exception as ex:
+            print(f"    GDELT error [{query[:40]}]: {ex}")
+            return []
+
+        if limiter is not None:
+            limiter.recover()
         out = []
         for item in (data.get("articles") or []):
             title = (item.get("title") or "").strip()
@@ -277,9 +741,56 @@ def fetch_gdelt(query):
                 "gdelt":   True,
             })
         return out
-    except Exception as ex:
-        print(f"    GDELT error [{query[:40]}]: {ex}")
-        return []
+    return []
+
+
+def start_gdelt_scout(queries, pool):
+    """
+    Submit every GDELT query to `pool` behind one shared TokenBucket so they run
+    alongside the RSS scout. Returns [(query, future)] in query order; each
+    future resolves to (articles, stats).
+    """
+    limiter = TokenBucket(rate=1.0 / GDELT_DELAY_S, capacity=1)
+
+    def _job(query):
+        stats = {}
+        return fetch_gdelt(query, limiter=limiter, stats=stats), stats
+
+    return [(q, pool.submit(_job, q)) for q in queries]
+
+
+# ── Batch packing ─────────────────────────────────────────────────────────────
+def _batch_item(idx, article):
+    """The per-article object sent to the classifier (shared by Gemini and Groq)."""
+    return {"idx": idx, "title": article["title"], "body": article["body"][:250],
+            "source": article.get("source", "")}
+
+
+def estimate_tokens(article):
+    """Estimated prompt tokens this article adds to a classification batch."""
+    item = json.dumps(_batch_item(0, article), ensure_ascii=False)
+    return len(item) // CHARS_PER_TOKEN + 1
+
+
+class BatchPacker:
+    """
+    Decides batch boundaries: a batch is full once adding the next article would
+    exceed token_budget, or it holds max_items — where max_items is also capped
+    by how many assessments fit in max_output_tokens.
+    """
+
+    def __init__(self, token_budget, max_items, max_output_tokens=None):
+        self.token_budget = token_budget
+        self.max_items    = max_items
+        if max_output_tokens:
+            self.max_items = min(max_items, int(max_output_tokens * OUTPUT_TOKEN_HEADROOM)
+                                 // OUTPUT_TOKENS_PER_ITEM)
+        self.max_items = max(1, self.max_items)
+
+    def fits(self, batch_tokens, batch_len, article_tokens):
+        """True if an article of article_tokens can join a batch of batch_len / batch_tokens."""
+        return batch_len < self.max_items and \
+            (batch_len == 0 or batch_tokens + article_tokens <= self.token_budget)
 
 
 # ── Gemini Analyst ────────────────────────────────────────────────────────────
@@ -309,20 +820,35 @@ SECOND-ORDER REASONING: Always consider how an event cascades to Dell operations
 Example: "NSW teachers strike" → schools close → Dell Sydney/Melbourne employees with school-age children cannot come to work → estimated 10-25% workforce reduction at those sites for the duration."""
 
 
-def gemini_classify_batch(api_key, articles):
+class AIRateLimited(Exception):
+    """A classifier call hit a retryable status (429 / 5xx); retry_after in seconds, 0 if unknown."""
+
+    def __init__(self, provider, status, retry_after=0.0):
+        super().__init__(f"{provider} HTTP {status}")
+        self.status      = status
+        self.retry_after = retry_after
+
+
+_RETRY_DELAY_RE = re.compile(r'"retryDelay"\s*:\s*"([^"]+)"')
+
+
+def _ai_retry_after(headers, body=""):
+    """Retry-After header, else Gemini's RetryInfo.retryDelay in the error body; 0 if neither."""
+    delay = parse_duration_s((headers or {}).get("Retry-After"))
+    if delay is None:
+        m = _RETRY_DELAY_RE.search(body or "")
+        delay = parse_duration_s(m.group(1)) if m else None
+    return delay or 0.0
+
+
+def gemini_classify_batch(api_key, articles, limiter=None):
     """
     Send a batch of articles to Gemini 2.0 Flash.
     Returns list of assessment dicts (one per article), or [] on failure.
+    Raises AIRateLimited on a retryable status; `limiter` is synced from the response headers.
     """
-    articles_payload = json.dumps([
-        {
-            "idx":    i,
-            "title":  a["title"],
-            "body":   a["body"][:250],
-            "source": a.get("source", ""),
-        }
-        for i, a in enumerate(articles)
-    ], ensure_ascii=False)
+    articles_payload = json.dumps([_batch_item(i, a) for i, a in enumerate(articles)],
+                                  ensure_ascii=False)
 
     user_msg = f"""Analyze these {len(articles)} articles for Dell SRO operational relevance.
 
@@ -340,18 +866,17 @@ Return a JSON array, one object per article:
         ],
         "generationConfig": {
             "temperature":      0,
-            "maxOutputTokens":  2048,
+            "maxOutputTokens":  GEMINI_MAX_OUTPUT_TOKENS,
             "responseMimeType": "application/json",
         },
     }).encode("utf-8")
 
     url = f"{GEMINI_API_BASE}/{GEMINI_MODEL}:generateContent?key={api_key}"
-    req = urllib.request.Request(url, data=payload,
-                                 headers={"Content-Type": "application/json"},
-                                 method="POST")
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
+        resp = HTTP.post(url, payload, headers={"Content-Type": "application/json"})
+        if limiter is not None:
+            limiter.observe(resp.headers)
+        result = resp.json()
 
         raw = result["candidates"][0]["content"]["parts"][0]["text"]
         raw = re.sub(r"```json\s*|\s*```", "", raw).strip()
@@ -361,17 +886,17 @@ Return a JSON array, one object per article:
         return assessments
 
     except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace")[:400]
-        print(f"    Gemini HTTP {e.code}: {body}")
-        if e.code == 429:
-            time.sleep(15)
+        body = e.read().decode("utf-8", errors="replace")
+        print(f"    Gemini HTTP {e.code}: {body[:400]}")
+        if e.code in AI_RETRY_STATUS:
+            raise AIRateLimited("Gemini", e.code, _ai_retry_after(e.headers, body))
         return []
     except Exception as ex:
         print(f"    Gemini error: {ex}")
         return []
 
 
-# ── Groq batch classifier (PRIMARY AI) ────────────────────────────────────────
+# ── Groq batch classifier (FAILOVER AI) ───────────────────────────────────────
 _GROQ_SYSTEM = """You are the AI Security Intelligence Analyst for Dell Technologies' Global Security & Resiliency Operations (SRO).
 Users: Regional Security Managers, Regional Security Directors, Security VP, Crisis Leads.
 
@@ -395,15 +920,14 @@ Teacher strike → schools close → employees with children absent → workforc
 Transit strike → employees can't commute → office attendance falls."""
 
 
-def groq_classify_batch(api_key, articles):
+def groq_classify_batch(api_key, articles, limiter=None):
     """
-    Send batch of articles to Groq llama-3.3-70b for Dell-context-aware classification.
-    Primary AI path. Returns list of assessment dicts, or [] on failure.
+    Send batch of articles to Groq (GROQ_MODEL) for Dell-context-aware classification.
+    Failover path behind Gemini. Returns list of assessment dicts, or [] on failure.
+    Raises AIRateLimited on a retryable status; `limiter` is synced from the x-ratelimit-* headers.
     """
-    articles_payload = json.dumps([
-        {"idx": i, "title": a["title"], "body": a["body"][:250], "source": a.get("source", "")}
-        for i, a in enumerate(articles)
-    ], ensure_ascii=False)
+    articles_payload = json.dumps([_batch_item(i, a) for i, a in enumerate(articles)],
+                                  ensure_ascii=False)
 
     user_msg = f"""Analyze these {len(articles)} articles for Dell SRO operational relevance.
 
@@ -416,7 +940,7 @@ Return a JSON array with one object per article:
     payload = json.dumps({
         "model":       GROQ_MODEL,
         "temperature": 0,
-        "max_tokens":  2048,
+        "max_tokens":  GROQ_MAX_OUTPUT_TOKENS,
         "messages": [
             {"role": "system", "content": _GROQ_SYSTEM},
             {"role": "user",   "content": user_msg},
@@ -424,12 +948,13 @@ Return a JSON array with one object per article:
         "response_format": {"type": "json_object"},
     }).encode("utf-8")
 
-    req = urllib.request.Request(GROQ_API_URL, data=payload,
-        headers={"Authorization": f"Bearer {api_key}",
-                 "Content-Type": "application/json"}, method="POST")
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
+        resp = HTTP.post(GROQ_API_URL, payload,
+                         headers={"Authorization": f"Bearer {api_key}",
+                                  "Content-Type": "application/json"})
+        if limiter is not None:
+            limiter.observe(resp.headers)
+        result = resp.json()
         content = result["choices"][0]["message"]["content"].strip()
         content = re.sub(r"```json\s*|\s*```", "", content).strip()
         parsed = json.loads(content)
@@ -445,10 +970,10 @@ Return a JSON array with one object per article:
             return []
         return parsed  # already a list
     except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace")[:300]
-        print(f"    Groq HTTP {e.code}: {body}")
-        if e.code == 429:
-            time.sleep(10)
+        body = e.read().decode("utf-8", errors="replace")
+        print(f"    Groq HTTP {e.code}: {body[:300]}")
+        if e.code in AI_RETRY_STATUS:
+            raise AIRateLimited("Groq", e.code, _ai_retry_after(e.headers, body))
         return []
     except Exception as ex:
         print(f"    Groq batch error: {ex}")
@@ -456,71 +981,75 @@ Return a JSON array with one object per article:
 
 
 # ── Keyword fallback (last resort — no AI available) ──────────────────────────
+# (pattern, category, severity), checked in order — the first category with a hit wins.
+_KEYWORD_CHECKS = (
+    (r"\b(protest|riot|unrest|coup|curfew|martial.law|demonstration|civil.war|"
+     r"attack|bomb|explosion|shooting|terror|hostage|armed|troops|military.action)\b",
+     "PHYSICAL_SECURITY", "HIGH"),
+    (r"\b(strike|industrial.action|walkout|picket|work.stoppage|"
+     r"teachers?.strike|school.clos|transport.strike|bus.strike|train.strike|"
+     r"metro.strike|transit.strike|dock.strike|port.strike)\b",
+     "LABOR_ACTION", "MEDIUM"),
+    (r"\b(port.clos|shipping.disrupt|supply.chain|cargo.disrupt|"
+     r"container.shortage|logistics.halt|factory.clos|manufacturing.halt|"
+     r"freight.disrupt|airspace.clos|airport.clos)\b",
+     "SUPPLY_CHAIN", "MEDIUM"),
+    (r"\b(earthquake|tsunami|typhoon|hurricane|flood|wildfire|eruption|"
+     r"disaster|emergency.declar|evacuation|state.of.emergency)\b",
+     "NATURAL_DISASTER", "HIGH"),
+    (r"\b(power.outage|blackout|grid.failure|infrastructure.attack|"
+     r"internet.outage|road.clos|bridge.clos)\b",
+     "INFRASTRUCTURE", "MEDIUM"),
+    (r"\b(outbreak|epidemic|pandemic|quarantine|health.advisory|"
+     r"travel.ban|disease.spread|health.emergency)\b",
+     "HEALTH_WORKFORCE", "MEDIUM"),
+    (r"\b(travel.advisory|do.not.travel|border.clos|embassy|"
+     r"evacuation.order|safety.alert)\b",
+     "TRAVEL_SECURITY", "MEDIUM"),
+    (r"\b(dell.layoff|dell.breach|dell.incident|dell.restructur|"
+     r"dell.executive|dell.ceo|dell.cto|dell.insider)\b",
+     "BRAND_MONITORING", "HIGH"),
+)
+
+
+class KeywordClassifier:
+    """
+    _KEYWORD_CHECKS as one TermBuckets scan (one bucket per category): a single
+    pass over the lowercased text reports every category with a hit, and the
+    first in check order wins — the same answer as running the checks one by
+    one. Text containing "ı" or "ſ", which IGNORECASE folds onto i / s but the
+    gate does not, is checked one by one.
+    """
+
+    _FOLDED = ("ı", "ſ")
+
+    def __init__(self, checks=_KEYWORD_CHECKS):
+        self.checks = [(re.compile(p, flags=re.IGNORECASE), cat, sev) for p, cat, sev in checks]
+        self.terms  = TermBuckets({cat: [r"\b" + alt + r"\b" for alt in alternatives(p)]
+                                   for p, cat, _ in checks})
+
+    def classify(self, title, body):
+        text = (title + " " + body).lower()
+        if any(c in text for c in self._FOLDED):
+            hit = next(((cat, sev) for rx, cat, sev in self.checks if rx.search(text)), None)
+        else:
+            cats = self.terms.scan(text)
+            hit  = next(((cat, sev) for _, cat, sev in self.checks if cat in cats), None)
+        # Reject pure cyber-only (checked last: it only matters once a category hit)
+        if hit is None or (_CYBER_ONLY.search(text) and not _DELL_MENTION.search(text)):
+            return None
+        cat, sev = hit
+        return {"category": cat, "score": 6, "severity": sev,
+                "operational_impact": f"{cat.replace('_', ' ').title()} event detected.",
+                "locations": [], "dell_region": "Global"}
+
+
+_KEYWORDS = KeywordClassifier()
+
+
 def keyword_classify(title, body):
     """Heuristic fallback when neither Gemini nor Groq is available."""
-    text = (title + " " + body).lower()
-    # Immediately reject pure cyber-only
-    if _CYBER_ONLY.search(text) and not _DELL_MENTION.search(text):
-        return None
-
-    checks = [
-        (r"\b(protest|riot|unrest|coup|curfew|martial.law|demonstration|civil.war|"
-         r"attack|bomb|explosion|shooting|terror|hostage|armed|troops|military.action)\b",
-         "PHYSICAL_SECURITY", "HIGH"),
-        (r"\b(strike|industrial.action|walkout|picket|work.stoppage|"
-         r"teachers?.strike|school.clos|transport.strike|bus.strike|train.strike|"
-         r"metro.strike|transit.strike|dock.strike|port.strike)\b",
-         "LABOR_ACTION", "MEDIUM"),
-        (r"\b(port.clos|shipping.disrupt|supply.chain|cargo.disrupt|"
-         r"container.shortage|logistics.halt|factory.clos|manufacturing.halt|"
-         r"freight.disrupt|airspace.clos|airport.clos)\b",
-         "SUPPLY_CHAIN", "MEDIUM"),
-        (r"\b(earthquake|tsunami|typhoon|hurricane|flood|wildfire|eruption|"
-         r"disaster|emergency.declar|evacuation|state.of.emergency)\b",
-         "NATURAL_DISASTER", "HIGH"),
-        (r"\b(power.outage|blackout|grid.failure|infrastructure.attack|"
-         r"internet.outage|road.clos|bridge.clos)\b",
-         "INFRASTRUCTURE", "MEDIUM"),
-        (r"\b(outbreak|epidemic|pandemic|quarantine|health.advisory|"
-         r"travel.ban|disease.spread|health.emergency)\b",
-         "HEALTH_WORKFORCE", "MEDIUM"),
-        (r"\b(travel.advisory|do.not.travel|border.clos|embassy|"
-         r"evacuation.order|safety.alert)\b",
-         "TRAVEL_SECURITY", "MEDIUM"),
-        (r"\b(dell.layoff|dell.breach|dell.incident|dell.restructur|"
-         r"dell.executive|dell.ceo|dell.cto|dell.insider)\b",
-         "BRAND_MONITORING", "HIGH"),
-    ]
-    for pattern, cat, sev in checks:
-        if re.search(pattern, text, flags=re.IGNORECASE):
-            return {"category": cat, "score": 6, "severity": sev,
-                    "operational_impact": f"{cat.replace('_', ' ').title()} event detected.",
-                    "locations": [], "dell_region": "Global"}
-    return None
-
-
-# ── Feedback loader ────────────────────────────────────────────────────────────
-def load_feedback():
-    block_keys, boost_keys = set(), set()
-    if not os.path.exists(FEEDBACK_PATH):
-        return block_keys, boost_keys
-    with open(FEEDBACK_PATH, "r", encoding="utf-8") as f:
-        for line in f:
-            try:
-                obj = json.loads(line.strip())
-                label = (obj.get("label") or "").upper()
-                url   = (obj.get("url") or "").strip().lower()
-                title = (obj.get("title") or "").strip().lower()
-                key   = url or title
-                if not key:
-                    continue
-                if label == "NOT_RELEVANT":
-                    block_keys.add(key)
-                elif label in ("CRITICAL", "KEEP"):
-                    boost_keys.add(key)
-            except Exception:
-                continue
-    return block_keys, boost_keys
+    return _KEYWORDS.classify(title, body)
 
 
 # ── Region mapper (for dashboard display) ─────────────────────────────────────
@@ -559,113 +1088,356 @@ _TYPE_MAP = {
 _SEV_NUM = {"LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
 
 
-# ── Main pipeline ──────────────────────────────────────────────────────────────
-def main():
-    groq_key   = os.getenv("GROQ_API_KEY", "").strip()
-    gemini_key = os.getenv("GEMINI_API_KEY", "").strip()
+def _assessment_to_result(article, assessment, tag="KEEP"):
+    """
+    Turn one AI assessment into a news.json item, or None if it should be dropped
+    (not relevant, below MIN_RELEVANCE_SCORE, or any cyber category).
+    """
+    relevant = assessment.get("relevant", False)
+    score    = int(assessment.get("score", 0) or 0)
+    cat      = assessment.get("category", "NOT_RELEVANT")
 
-    # Gemini is PRIMARY — Google infrastructure, no Cloudflare blocking from GitHub Actions
-    # Groq was primary but Cloudflare blocks GitHub Actions IPs (403 error 1010)
-    if gemini_key:
-        print(f"SRO Brain v2.0 — Gemini {GEMINI_MODEL} (PRIMARY, batch mode)")
-        ai_mode = "gemini"
-    elif groq_key:
-        print(f"SRO Brain v2.0 — Groq {GROQ_MODEL} (fallback — may be blocked from CI)")
-        ai_mode = "groq"
-    else:
-        print("SRO Brain v2.0 — Keyword-only mode (no AI keys set)")
-        ai_mode = "keyword"
+    if not relevant or cat == "NOT_RELEVANT" or score < MIN_RELEVANCE_SCORE:
+        return None
+    # Hard-block all cyber categories — physical SRO team does not want any cyber news.
+    # If AI somehow returns CYBER_DIRECT despite the prompt instructions, drop it.
+    if "CYBER" in cat.upper():
+        return None
+
+    # Boost flagged articles
+    if article.get("boost") and score < 7:
+        score = 7
+
+    sev_str = (assessment.get("severity") or "LOW").upper()
+    sev_num = _SEV_NUM.get(sev_str, 1)
+    if article.get("boost") and sev_num < 3:
+        sev_num = 3
+
+    op_impact   = assessment.get("operational_impact", "")
+    second_ord  = assessment.get("second_order", "")
+    locations   = assessment.get("locations") or []
+    dell_region = assessment.get("dell_region") or map_region(
+        article["title"] + " " + " ".join(locations)
+    )
+
+    snippet = op_impact
+    if second_ord:
+        snippet = f"{op_impact} | {second_ord}"
+    if not snippet:
+        snippet = article["body"][:160]
+
+    print(f"  [{tag}] {cat:20s} sev={sev_num} score={score:2d} | {article['title'][:70]}")
+    return {
+        "title":              article["title"],
+        "url":                article["url"],
+        "snippet":            snippet,
+        "body":               article["body"][:600],
+        "source":             article["source"],
+        "time":               article["time"],
+        "region":             dell_region,
+        "severity":           sev_num,
+        "type":               _TYPE_MAP.get(cat, "GENERAL"),
+        "locations":          locations,
+        "operational_impact": op_impact,
+        "second_order":       second_ord,
+        "ai_score":           score,
+        "gdelt":              article.get("gdelt", False),
+    }
+
+
+# ── Near-duplicate detection ───────────────────────────────────────────────────
+_MERSENNE_61  = (1 << 61) - 1
+_TITLE_SUFFIX = re.compile(r"\s+[-–—|]\s+[^-–—|]{2,40}$")   # " - Reuters", " | Al Jazeera"
+_STOPWORDS    = frozenset(
+    "a an and are as at be by for from has have in is it its of on or over says "
+    "said the to was were will with after amid into new".split()
+)
+
+
+def _dup_tokens(text):
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in _STOPWORDS]
+
+
+def _title_shingles(title):
+    """Word unigrams + bigrams of the headline with the trailing publisher name removed."""
+    toks = _dup_tokens(_TITLE_SUFFIX.sub("", title))
+    return set(toks) | {f"{a} {b}" for a, b in zip(toks, toks[1:])}
+
+
+def _body_shingles(article):
+    """Word 3-grams of the body, or empty when the body is just the title (GDELT) or too short."""
+    body = article.get("body") or ""
+    if not body or body == article.get("title"):
+        return set()
+    toks = _dup_tokens(body[:300])
+    if len(toks) < 8:
+        return set()
+    return {" ".join(toks[i:i + 3]) for i in range(len(toks) - 2)}
 
-    block_keys, boost_keys = load_feedback()
 
-    # ── Phase 1: Scout — collect raw articles ─────────────────────────────────
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+class NearDupIndex:
+    """
+    MinHash + LSH index over headline shingles and body shingles.
+    find_or_add(article) returns the cluster representative the article
+    duplicates (title or body Jaccard above threshold, verified exactly on the
+    LSH candidates), or registers the article as a new representative and
+    returns None.
+    """
+
+    def __init__(self, num_perm=MINHASH_PERM, bands=LSH_BANDS):
+        rnd = random.Random(0x5D0)   # fixed permutations → deterministic clusters
+        self._perms  = [(rnd.randrange(1, _MERSENNE_61), rnd.randrange(_MERSENNE_61))
+                        for _ in range(num_perm)]
+        self._rows   = num_perm // bands
+        self._bands  = bands
+        self._lsh    = {"title": {}, "body": {}}   # (kind) → {(band, band_hash): [rep_id]}
+        self._reps   = []                          # rep_id → (article, title_sh, body_sh)
+        self.dups    = 0
+
+    def _signature(self, shingles):
+        hashes = [zlib.crc32(sh.encode("utf-8")) for sh in shingles]
+        return [min((a * h + b) % _MERSENNE_61 for h in hashes) for a, b in self._perms]
+
+    def _band_keys(self, shingles):
+        sig = self._signature(shingles)
+        r = self._rows
+        return [(i, hash(tuple(sig[i * r:(i + 1) * r]))) for i in range(self._bands)]
+
+    def find_or_add(self, article):
+        title_sh = _title_shingles(article.get("title", ""))
+        body_sh  = _body_shingles(article)
+        keys = {"title": self._band_keys(title_sh) if title_sh else [],
+                "body":  self._band_keys(body_sh) if body_sh else []}
+
+        for kind, threshold, mine in (("title", NEAR_DUP_TITLE_J, title_sh),
+                                      ("body",  NEAR_DUP_BODY_J,  body_sh)):
+            seen = set()
+            for key in keys[kind]:
+                for rep_id in self._lsh[kind].get(key, ()):
+                    if rep_id in seen:
+                        continue
+                    seen.add(rep_id)
+                    rep, rep_title, rep_body = self._reps[rep_id]
+                    theirs = rep_title if kind == "title" else rep_body
+                    if _jaccard(mine, theirs) >= threshold:
+                        self.dups += 1
+                        return rep
+
+        rep_id = len(self._reps)
+        self._reps.append((article, title_sh, body_sh))
+        for kind, band_keys in keys.items():
+            for key in band_keys:
+                self._lsh[kind].setdefault(key, []).append(rep_id)
+        return None
+
+
+# ── Classification cache ───────────────────────────────────────────────────────
+def _normalize_url(u):
+    """Lowercase scheme/host, drop utm_* params, fragment and trailing slash."""
+    if not u:
+        return ""
+    try:
+        p = urlparse(u.strip())
+        qs = [(k, v) for k, v in parse_qsl(p.query, keep_blank_values=True)
+              if not k.lower().startswith("utm_")]
+        return urlunparse(((p.scheme or "https").lower(), p.netloc.lower(),
+                           p.path.rstrip("/"), "", urlencode(qs), ""))
+    except Exception:
+        return u.strip().lower()
+
+
+def _content_hash(article):
+    """Hash of normalized title + body — identical text under a new URL still hits."""
+    text = f"{article.get('title', '')}\n{article.get('body', '')}"
+    text = re.sub(r"\s+", " ", text).strip().lower()
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _classify_key(article):
+    """Primary cache key: normalized URL + content hash."""
+    raw = f"{_normalize_url(article.get('url', ''))}\n{_content_hash(article)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ClassificationCache:
+    """
+    On-disk store of AI assessments keyed by _classify_key(), with a secondary
+    content-hash index. Entries expire after CLASSIFY_CACHE_TTL_H and the file is
+    bounded to the newest CLASSIFY_CACHE_MAX verdicts.
+    """
+
+    def __init__(self, path=CLASSIFY_CACHE_PATH, ttl_h=CLASSIFY_CACHE_TTL_H,
+                 max_entries=CLASSIFY_CACHE_MAX):
+        self.path        = path
+        self.ttl_s       = ttl_h * 3600
+        self.max_entries = max_entries
+        self.entries     = {}
+        self.by_content  = {}
+        self.hits        = 0
+        self.misses      = 0
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return self
+        except Exception as e:
+            print(f"  WARN: classification cache unreadable, starting cold: {e}")
+            return self
+        cutoff = time.time() - self.ttl_s
+        for key, entry in (data.get("entries") or {}).items():
+            if entry.get("ts", 0) >= cutoff and isinstance(entry.get("assessment"), dict):
+                self.entries[key] = entry
+                self.by_content[entry.get("content_hash")] = key
+        return self
+
+    def get(self, article):
+        """Cached assessment for this article (URL+content, then content only), or None."""
+        key = _classify_key(article)
+        entry = self.entries.get(key)
+        if entry is None:
+            alt = self.by_content.get(_content_hash(article))
+            entry = self.entries.get(alt) if alt else None
+        if entry is None or entry.get("ts", 0) < time.time() - self.ttl_s:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["assessment"]
+
+    def put(self, article, assessment, model=""):
+        key = _classify_key(article)
+        content_hash = _content_hash(article)
+        self.entries[key] = {
+            "assessment":   {k: v for k, v in assessment.items() if k != "idx"},
+            "content_hash": content_hash,
+            "model":        model,
+            "ts":           time.time(),
+        }
+        self.by_content[content_hash] = key
+
+    def save(self):
+        newest = sorted(self.entries.items(), key=lambda kv: kv[1].get("ts", 0),
+                        reverse=True)[:self.max_entries]
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": dict(newest)}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"  WARN: could not save classification cache: {e}")
+
+
+# ── Main pipeline ──────────────────────────────────────────────────────────────
+# ── Scout stage ───────────────────────────────────────────────────────────────
+def scout_articles(feedback, emit):
+    """
+    Phase 1: fetch RSS + GDELT, apply feedback/blocklist/cyber filters and title
+    dedup, and hand every surviving article to emit() as soon as it is accepted.
+    Emission order is deterministic (feeds in FEEDS order, then GDELT queries).
+    Returns the number of articles emitted.
+    """
     print(f"\n[SCOUT] Fetching {len(FEEDS)} RSS feeds...")
-    raw_articles = []
+    emitted      = 0
     seen_titles  = set()
-
-    for feed_url in FEEDS:
+    prefilter    = Prefilter()
+
+    # GDELT is throttled server-side, so start it first and let it overlap the RSS fetches
+    gdelt_pool = ThreadPoolExecutor(max_workers=GDELT_WORKERS)
+    gdelt_jobs = start_gdelt_scout(GDELT_QUERIES, gdelt_pool)
+
+    feed_cache    = load_feed_cache()
+    cache_hits    = 0
+    bytes_saved   = 0
+    scout_started = time.monotonic()
+    slowest_feed  = 0.0
+    for res in fetch_feeds(FEEDS, feed_cache):
+        feed_url     = res["url"]
+        slowest_feed = max(slowest_feed, res["seconds"])
         try:
-            f = feedparser.parse(feed_url)
-            entries = getattr(f, "entries", [])
-            if entries:
-                print(f"  ✓ {feed_url[-60:]:60s} → {len(entries)} entries")
-            for e in entries[:6]:
-                title = (getattr(e, "title", "") or "").strip()
+            if res["error"] is not None:
+                raise res["error"]
+            _update_feed_cache(feed_cache, res)
+            entries = res["entries"]
+            if res["cache_hit"]:
+                cache_hits  += 1
+                bytes_saved += res["bytes"]
+                print(f"  ✓ {feed_url[-60:]:60s} → {res['entry_count']} entries "
+                      f"(304 cached, {res['bytes'] / 1024:.1f} KB saved)")
+            elif entries:
+                print(f"  ✓ {feed_url[-60:]:60s} → {res['entry_count']} entries")
+            for e in entries:
+                title = (e["title"] or "").strip()
                 if not title or title.lower() in seen_titles:
                     continue
                 seen_titles.add(title.lower())
 
-                raw_body = _clean(getattr(e, "summary", "") or "")
-                if hasattr(e, "content") and e.content:
-                    try:
-                        cv = e.content[0].value
-                        if cv:
-                            raw_body = _clean(cv)
-                    except Exception:
-                        pass
+                # Full content wins over summary when the feed provides it
+                raw_body = _clean(e["content"] or e["summary"], limit=RAW_BODY_CHARS)
 
-                link   = getattr(e, "link", "") or ""
+                link   = e["link"]
                 source = (urlparse(link).netloc or urlparse(feed_url).netloc).replace("www.", "")
 
                 url_key   = link.strip().lower()
                 title_key = title.lower()
-                if url_key in block_keys or title_key in block_keys:
-                    continue
-
-                # Hard blocklist — entertainment/sports
-                if _HARD_BLOCK.search(title + " " + raw_body[:200]):
+                if feedback.blocked(url_key, title_key):
+                    prefilter.count("feedback")
                     continue
 
-                # Domain blocklist — pure cyber/IT security news sites
-                link_lower = link.lower()
-                if any(d in link_lower for d in _CYBER_DOMAINS):
-                    continue
-
-                # Cyber-only pre-filter: skip if clearly pure IT security and no Dell mention
-                if _CYBER_ONLY.search(title) and not _DELL_MENTION.search(title + " " + raw_body[:100]):
+                # Hard blocklist (entertainment/sports), cyber source domains, and
+                # pure IT-security titles without a Dell mention — one pass
+                if prefilter.check(title, raw_body, link):
                     continue
 
                 pub_time = datetime.now(timezone.utc).isoformat()
                 try:
-                    if hasattr(e, "published_parsed") and e.published_parsed:
+                    if e["published"]:
                         pub_time = datetime(
-                            *e.published_parsed[:6], tzinfo=timezone.utc
+                            *e["published"][:6], tzinfo=timezone.utc
                         ).isoformat()
                 except Exception:
                     pass
 
-                raw_articles.append({
+                emit({
                     "title":    title,
                     "url":      link,
-                    "body":     raw_body[:500],
+                    "body":     raw_body[:RAW_BODY_CHARS],
                     "source":   source,
                     "time":     pub_time,
                     "url_key":  url_key,
                     "title_key": title_key,
-                    "boost":    (url_key in boost_keys or title_key in boost_keys),
+                    "boost":    feedback.boosted(url_key, title_key),
                 })
+                emitted += 1
         except Exception as ex:
             print(f"  ✗ {feed_url[-60:]:60s} → {ex}")
 
+    print(f"  RSS scout done in {time.monotonic() - scout_started:.1f}s "
+          f"(slowest feed {slowest_feed:.1f}s, {FEED_WORKERS} workers)")
+    save_feed_cache(feed_cache)
+    print(f"  Feed cache: {cache_hits}/{len(FEEDS)} not modified "
+          f"({100 * cache_hits / max(len(FEEDS), 1):.0f}% hit rate, "
+          f"{bytes_saved / 1024:.1f} KB saved)")
+
     # ── Phase 1b: GDELT Scout ─────────────────────────────────────────────────
-    print(f"\n[SCOUT] Querying GDELT ({len(GDELT_QUERIES)} queries, last {GDELT_TIMESPAN})...")
+    print(f"\n[SCOUT] Collecting GDELT ({len(GDELT_QUERIES)} queries, last {GDELT_TIMESPAN})...")
     gdelt_total = 0
-    for qi, query in enumerate(GDELT_QUERIES):
-        if qi > 0:
-            time.sleep(GDELT_DELAY_S)  # respect GDELT rate limits
-        articles = fetch_gdelt(query)
+    for query, fut in gdelt_jobs:
+        articles, gstats = fut.result()
+        added = 0
         for a in articles:
             title = a["title"]
             if title.lower() in seen_titles:
                 continue
-            if _HARD_BLOCK.search(title):
-                continue
-            if any(d in (a.get("url","")).lower() for d in _CYBER_DOMAINS):
-                continue
-            if _CYBER_ONLY.search(title) and not _DELL_MENTION.search(title):
+            if prefilter.check(title, link=a.get("url", "")):
                 continue
             seen_titles.add(title.lower())
-            raw_articles.append({
+            emit({
                 "title":     title,
                 "url":       a["url"],
                 "body":      title,   # GDELT returns title only
@@ -676,188 +1448,343 @@ def main():
                 "boost":     False,
                 "gdelt":     True,
             })
-            gdelt_total += 1
+            added += 1
+            emitted += 1
+        gdelt_total += added
+        print(f"  GDELT {query[:40]:40s} → {len(articles):2d} returned, {added:2d} kept "
+              f"| {gstats.get('latency_s', 0):.1f}s latency, {gstats.get('wait_s', 0):.1f}s queued"
+              + (f", {gstats['rate_limited']}× rate-limited" if gstats.get("rate_limited") else ""))
+    gdelt_pool.shutdown()
 
     print(f"  GDELT added {gdelt_total} new articles")
-    print(f"\n[SCOUT] Total raw articles: {len(raw_articles)}")
+    print(f"  {prefilter.summary()}")
+    print(f"\n[SCOUT] Total raw articles: {emitted} "
+          f"(scout finished after {time.monotonic() - scout_started:.1f}s)")
+    return emitted
 
-    # ── Phase 2: Analyst — AI classification ──────────────────────────────────
-    print(f"\n[ANALYST] Mode: {ai_mode.upper()} — classifying {len(raw_articles)} articles...")
-    results = []
 
-    if ai_mode == "gemini":
-        # Batch articles and send to Gemini
-        gemini_calls = 0
-        for batch_start in range(0, len(raw_articles), GEMINI_BATCH_SIZE):
-            if gemini_calls >= GEMINI_MAX_CALLS:
-                print(f"  Gemini call cap reached ({GEMINI_MAX_CALLS})")
-                break
+def _report_near_dups(near_dups, followers, per_call):
+    """Print how many syndicated copies skipped classification and the AI calls that saved."""
+    orphaned = sum(len(v) for v in followers.values())
+    saved    = near_dups.dups - orphaned
+    print(f"  Near-duplicates: {near_dups.dups} copies clustered, {saved} got a fanned-out verdict "
+          f"→ ~{saved / max(per_call, 1):.1f} AI calls saved"
+          + (f" ({orphaned} dropped with an unclassified representative)" if orphaned else ""))
 
-            batch = raw_articles[batch_start: batch_start + GEMINI_BATCH_SIZE]
-            print(f"  Gemini batch {gemini_calls + 1}: articles {batch_start}–{batch_start + len(batch) - 1}")
-            assessments = gemini_classify_batch(gemini_key, batch)
-            gemini_calls += 1
 
-            if assessments:
-                for assessment in assessments:
-                    idx = assessment.get("idx", 0)
-                    if idx >= len(batch):
-                        continue
-                    article = batch[idx]
+# ── Streaming batcher ─────────────────────────────────────────────────────────
+_SCOUT_DONE = object()   # queue sentinel — scout thread has finished
 
-                    relevant = assessment.get("relevant", False)
-                    score    = int(assessment.get("score", 0) or 0)
-                    cat      = assessment.get("category", "NOT_RELEVANT")
 
-                    if not relevant or cat == "NOT_RELEVANT" or score < MIN_RELEVANCE_SCORE:
-                        continue
-                    # Hard-block all cyber categories — physical SRO team does not want any cyber news.
-                    # If AI somehow returns CYBER_DIRECT despite the prompt instructions, drop it.
-                    if "CYBER" in cat.upper():
-                        continue
+def _run_scout(feedback, article_q, stats):
+    """Scout thread body: push accepted articles into article_q, then the sentinel."""
+    try:
+        stats["raw"] = scout_articles(feedback, article_q.put)
+    except Exception as ex:
+        print(f"[SCOUT] aborted: {ex}")
+    finally:
+        article_q.put(_SCOUT_DONE)
 
-                    # Boost flagged articles
-                    if article.get("boost") and score < 7:
-                        score = 7
-
-                    sev_str = (assessment.get("severity") or "LOW").upper()
-                    sev_num = _SEV_NUM.get(sev_str, 1)
-                    if article.get("boost") and sev_num < 3:
-                        sev_num = 3
-
-                    op_impact   = assessment.get("operational_impact", "")
-                    second_ord  = assessment.get("second_order", "")
-                    locations   = assessment.get("locations") or []
-                    dell_region = assessment.get("dell_region") or map_region(
-                        article["title"] + " " + " ".join(locations)
-                    )
-
-                    snippet = op_impact
-                    if second_ord:
-                        snippet = f"{op_impact} | {second_ord}"
-                    if not snippet:
-                        snippet = article["body"][:160]
-
-                    results.append({
-                        "title":            article["title"],
-                        "url":              article["url"],
-                        "snippet":          snippet,
-                        "body":             article["body"][:600],
-                        "source":           article["source"],
-                        "time":             article["time"],
-                        "region":           dell_region,
-                        "severity":         sev_num,
-                        "type":             _TYPE_MAP.get(cat, "GENERAL"),
-                        "locations":        locations,
-                        "operational_impact": op_impact,
-                        "second_order":     second_ord,
-                        "ai_score":         score,
-                        "gdelt":            article.get("gdelt", False),
-                    })
-                    print(f"  [KEEP] {cat:20s} sev={sev_num} score={score:2d} | {article['title'][:70]}")
-
-            time.sleep(GEMINI_DELAY_S)
-
-        print(f"  Gemini calls used: {gemini_calls}")
-
-    elif ai_mode == "groq":
-        # Batch mode — same quality prompt as Gemini, 8 articles per call
-        groq_calls = 0
-        for batch_start in range(0, len(raw_articles), GROQ_BATCH_SIZE):
-            if groq_calls >= GROQ_MAX_CALLS:
-                print(f"  Groq call cap reached ({GROQ_MAX_CALLS})")
-                break
 
-            batch = raw_articles[batch_start: batch_start + GROQ_BATCH_SIZE]
-            print(f"  Groq batch {groq_calls + 1}: articles {batch_start}–{batch_start + len(batch) - 1}")
-            assessments = groq_classify_batch(groq_key, batch)
-            groq_calls += 1
+def stream_batches(article_q, packer, flush_s=BATCH_FLUSH_S, handled=None):
+    """
+    Pull articles off article_q and yield batches as soon as the BatchPacker says
+    one is full, or once the oldest pending article has waited flush_s seconds.
+    Articles for which handled(article) returns True (e.g. cache hits) are
+    consumed without being batched. Stops at the _SCOUT_DONE sentinel.
+    """
+    pending, pending_tokens, first_at = [], 0, 0.0
+    while True:
+        timeout = max(0.0, first_at + flush_s - time.monotonic()) if pending else None
+        try:
+            item = article_q.get(timeout=timeout)
+        except queue.Empty:
+            yield pending
+            pending, pending_tokens = [], 0
+            continue
+        if item is _SCOUT_DONE:
+            break
+        if handled is not None and handled(item):
+            continue
+        tokens = estimate_tokens(item)
+        if not packer.fits(pending_tokens, len(pending), tokens):
+            yield pending
+            pending, pending_tokens = [], 0
+        if not pending:
+            first_at = time.monotonic()
+        pending.append(item)
+        pending_tokens += tokens
+        if not packer.fits(pending_tokens, len(pending), 1):
+            yield pending
+            pending, pending_tokens = [], 0
+    if pending:
+        yield pending
+
+
+# ── AI providers ──────────────────────────────────────────────────────────────
+def _request_tokens(system_prompt, batch):
+    """Estimated prompt + completion tokens of one classify call, for the TPM limiter."""
+    prompt = len(system_prompt) // CHARS_PER_TOKEN + sum(map(estimate_tokens, batch))
+    return prompt + len(batch) * OUTPUT_TOKENS_PER_ITEM
+
+
+class AIProvider:
+    """
+    One batch classifier with its own RPM/TPM limiter, batch packer, call cap and
+    circuit breaker. classify_fn(api_key, batch, limiter=...) returns assessments,
+    [] on failure, or raises AIRateLimited on a retryable status.
+    """
 
+    def __init__(self, name, model, api_key, classify_fn, system_prompt, *, rpm, tpm,
+                 batch_tokens, batch_size, max_output_tokens, workers, max_calls):
+        self.name          = name
+        self.model         = model
+        self.api_key       = api_key
+        self.classify_fn   = classify_fn
+        self.system_prompt = system_prompt
+        self.workers       = workers
+        self.max_calls     = max_calls
+        self.limiter       = SlidingWindowLimiter(rpm, tpm)
+        self.packer        = BatchPacker(batch_tokens, batch_size, max_output_tokens)
+        self.breaker       = CircuitBreaker(AI_BREAKER_FAILURES, AI_BREAKER_COOLDOWN_S)
+        self.calls         = 0
+        self.failed        = 0
+        self.retries       = 0
+        self.articles      = 0
+        self._capped       = False
+        self._lock         = threading.Lock()
+
+    def reserve(self):
+        """Claim one call if under the cap and the breaker allows it."""
+        with self._lock:
+            if self.calls >= self.max_calls:
+                if not self._capped:
+                    print(f"  {self.name} call cap reached ({self.max_calls})")
+                    self._capped = True
+                return False
+            if not self.breaker.allow():
+                return False
+            self.calls += 1
+            return True
+
+    def classify(self, batch, label):
+        """
+        One reserved call. Every attempt waits for the sliding-window limiter; a
+        retryable status defers the whole provider for Retry-After (or a jittered
+        exponential backoff) and retries up to AI_MAX_RETRIES times. The outcome
+        feeds the breaker. Returns assessments, [] on failure.
+        """
+        tokens = _request_tokens(self.system_prompt, batch)
+        print(f"  {self.name} {label}: {len(batch)} articles (~{tokens} tokens)")
+        assessments = []
+        for attempt in range(AI_MAX_RETRIES + 1):
+            self.limiter.acquire(tokens)
+            try:
+                assessments = self.classify_fn(self.api_key, batch, limiter=self.limiter)
+                break
+            except AIRateLimited as rl:
+                with self._lock:
+                    self.retries += 1
+                if attempt >= AI_MAX_RETRIES:
+                    print(f"    {self.name} {label}: {rl} — giving up after {attempt + 1} attempts")
+                    break
+                delay = rl.retry_after or backoff_delay(attempt, AI_BACKOFF_BASE_S, AI_BACKOFF_CAP_S)
+                print(f"    {self.name} {label}: {rl} — retrying in {delay:.1f}s")
+                self.limiter.defer(delay)
+        with self._lock:
             if assessments:
-                for assessment in assessments:
-                    idx = assessment.get("idx", 0)
-                    if idx >= len(batch):
-                        continue
-                    article = batch[idx]
+                self.articles += len(batch)
+            else:
+                self.failed += 1
+        if assessments:
+            self.breaker.success()
+        else:
+            self.breaker.failure()
+        return assessments
 
-                    relevant = assessment.get("relevant", False)
-                    score    = int(assessment.get("score", 0) or 0)
-                    cat      = assessment.get("category", "NOT_RELEVANT")
+    def summary(self):
+        return (f"{self.name}: {self.calls} calls ({self.failed} failed, {self.retries} retries, "
+                f"{self.limiter.waited_s:.1f}s limiter wait) | breaker {self.breaker.state}"
+                + (f", tripped {self.breaker.trips}×" if self.breaker.trips else ""))
 
-                    if not relevant or cat == "NOT_RELEVANT" or score < MIN_RELEVANCE_SCORE:
-                        continue
-                    # Hard-block all cyber categories — physical SRO team does not want any cyber news.
-                    # If AI somehow returns CYBER_DIRECT despite the prompt instructions, drop it.
-                    if "CYBER" in cat.upper():
-                        continue
 
-                    if article.get("boost") and score < 7:
-                        score = 7
-
-                    sev_str = (assessment.get("severity") or "LOW").upper()
-                    sev_num = _SEV_NUM.get(sev_str, 1)
-                    if article.get("boost") and sev_num < 3:
-                        sev_num = 3
-
-                    op_impact   = assessment.get("operational_impact", "")
-                    second_ord  = assessment.get("second_order", "")
-                    locations   = assessment.get("locations") or []
-                    dell_region = assessment.get("dell_region") or map_region(
-                        article["title"] + " " + " ".join(locations)
-                    )
-
-                    snippet = op_impact
-                    if second_ord:
-                        snippet = f"{op_impact} | {second_ord}"
-                    if not snippet:
-                        snippet = article["body"][:160]
-
-                    results.append({
-                        "title":              article["title"],
-                        "url":                article["url"],
-                        "snippet":            snippet,
-                        "body":               article["body"][:600],
-                        "source":             article["source"],
-                        "time":               article["time"],
-                        "region":             dell_region,
-                        "severity":           sev_num,
-                        "type":               _TYPE_MAP.get(cat, "GENERAL"),
-                        "locations":          locations,
-                        "operational_impact": op_impact,
-                        "second_order":       second_ord,
-                        "ai_score":           score,
-                        "gdelt":              article.get("gdelt", False),
-                    })
-                    print(f"  [KEEP] {cat:20s} sev={sev_num} score={score:2d} | {article['title'][:70]}")
-
-            time.sleep(GROQ_DELAY_S)
-
-        print(f"  Groq calls used: {groq_calls}")
+def build_providers(gemini_key, groq_key):
+    """Configured providers in failover order: Gemini (primary), then Groq."""
+    providers = []
+    if gemini_key:
+        providers.append(AIProvider(
+            "Gemini", GEMINI_MODEL, gemini_key, gemini_classify_batch, _GEMINI_SYSTEM,
+            rpm=GEMINI_RPM, tpm=GEMINI_TPM, batch_tokens=GEMINI_BATCH_TOKENS,
+            batch_size=GEMINI_BATCH_SIZE, max_output_tokens=GEMINI_MAX_OUTPUT_TOKENS,
+            workers=GEMINI_WORKERS, max_calls=GEMINI_MAX_CALLS))
+    if groq_key:
+        providers.append(AIProvider(
+            "Groq", GROQ_MODEL, groq_key, groq_classify_batch, _GROQ_SYSTEM,
+            rpm=GROQ_RPM, tpm=GROQ_TPM, batch_tokens=GROQ_BATCH_TOKENS,
+            batch_size=GROQ_BATCH_SIZE, max_output_tokens=GROQ_MAX_OUTPUT_TOKENS,
+            workers=GROQ_WORKERS, max_calls=GROQ_MAX_CALLS))
+    return providers
+
+
+def shared_packer(providers):
+    """
+    One packer every configured provider can take: batches may fail over, so
+    they are sized to the tightest token budget and item cap in the chain.
+    """
+    if not providers:
+        return BatchPacker(token_budget=0, max_items=1)
+    return BatchPacker(min(p.packer.token_budget for p in providers),
+                       min(p.packer.max_items for p in providers))
+
+
+def _classify_failover(providers, batch, label):
+    """Try each provider in order; returns (provider, assessments) or (None, [])."""
+    for i, provider in enumerate(providers):
+        if not provider.reserve():
+            continue
+        assessments = provider.classify(batch, label)
+        if assessments:
+            return provider, assessments
+        if i + 1 < len(providers):
+            print(f"    {label}: {provider.name} failed — failing over")
+    return None, []
+
+
+def classify_stream(batches, providers, on_batch):
+    """
+    Classify batches across `providers` with several calls in flight, each
+    provider paced by its own limiter. on_batch(batch, assessments, provider)
+    runs on the calling thread as each batch completes, so callers need no
+    locking; provider is None when no provider could take the batch.
+    """
+    inflight = {}   # future → batch
+    workers  = sum(p.workers for p in providers) or 1
+
+    def _collect(futures):
+        for fut in futures:
+            provider, assessments = fut.result()
+            on_batch(inflight.pop(fut), assessments, provider)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="classify") as pool:
+        for n, batch in enumerate(batches, 1):
+            _collect([f for f in inflight if f.done()])
+            if not providers:
+                on_batch(batch, [], None)
+                continue
+            inflight[pool.submit(_classify_failover, providers, batch, f"batch {n}")] = batch
+            if len(inflight) >= workers * 2:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                _collect(done)
+        _collect(list(as_completed(inflight)))
 
+
+def main():
+    groq_key   = os.getenv("GROQ_API_KEY", "").strip()
+    gemini_key = os.getenv("GEMINI_API_KEY", "").strip()
+
+    # Gemini is PRIMARY — Google infrastructure, no Cloudflare blocking from GitHub Actions
+    # Groq was primary but Cloudflare blocks GitHub Actions IPs (403 error 1010) —
+    # it stays configured as the failover provider.
+    providers = build_providers(gemini_key, groq_key)
+    chain     = " → ".join(f"{p.name} {p.model}" for p in providers)
+    if providers:
+        print(f"SRO Brain v2.0 — {chain} → keyword (batch mode, per-batch failover)")
     else:
-        # Keyword-only mode
-        for article in raw_articles:
-            analysis = keyword_classify(article["title"], article["body"])
-            if not analysis:
+        print("SRO Brain v2.0 — Keyword-only mode (no AI keys set)")
+
+    # Analyst feedback: snapshot + only the log lines appended since the last run
+    started  = time.monotonic()
+    feedback = FeedbackStore(FEEDBACK_PATH, FEEDBACK_INDEX_PATH).load()
+    try:
+        feedback.save()
+    except Exception as e:   # snapshot is an optimisation — next run just re-parses the log
+        print(f"  WARN: could not save feedback index: {e}")
+    print(f"[FEEDBACK] {len(feedback.labels)} labelled keys | {feedback.parsed} new log lines "
+          f"({'full rebuild' if feedback.rebuilt else 'incremental'}) "
+          f"in {(time.monotonic() - started) * 1000:.0f} ms")
+
+    # ── Phase 1 + 2: Scout → filter → classify, streamed ───────────────────────
+    # The scout thread pushes filtered articles into a bounded queue while this
+    # thread batches and classifies them, so AI round-trips overlap the fetches.
+    article_q    = queue.Queue(maxsize=ARTICLE_QUEUE_MAX)
+    scout_stats  = {"raw": 0}
+    run_started  = time.monotonic()
+    scout_thread = threading.Thread(target=_run_scout, name="scout", daemon=True,
+                                    args=(feedback, article_q, scout_stats))
+    scout_thread.start()
+
+    print(f"\n[ANALYST] Mode: {(chain or 'KEYWORD').upper()} — classifying as articles arrive...")
+    results = []
+
+    # Reuse verdicts for articles already classified in an earlier run, and
+    # classify only one copy of each syndicated story (verdict fanned out).
+    classify_cache = ClassificationCache().load()
+    near_dups      = NearDupIndex()
+    verdicts       = {}   # id(representative) → (result builder, assessment)
+    followers      = {}   # id(representative) → [near-duplicate articles awaiting its verdict]
+    kw_fallback    = 0
+
+    def _record(article, assessment, tag="KEEP", model=None, build=_assessment_to_result):
+        """Store a verdict, emit the result, and fan it out to waiting copies."""
+        if model:
+            classify_cache.put(article, assessment, model=model)
+        verdicts[id(article)] = (build, assessment)
+        for a, t in [(article, tag)] + [(f, "DUP") for f in followers.pop(id(article), [])]:
+            result = build(a, assessment, tag=t)
+            if result:
+                results.append(result)
+
+    def _pre_batch(article):
+        """True if the article needs no AI call of its own (near-dup or cache hit)."""
+        rep = near_dups.find_or_add(article)
+        if rep is not None:
+            if id(rep) in verdicts:
+                build, assessment = verdicts[id(rep)]
+                result = build(article, assessment, tag="DUP")
+                if result:
+                    results.append(result)
+            else:
+                followers.setdefault(id(rep), []).append(article)
+            return True
+        cached = classify_cache.get(article)
+        if cached is None:
+            return False
+        _record(article, cached, tag="CACHE")
+        return True
+
+    def _on_batch(batch, assessments, provider):
+        """Record provider verdicts; articles no provider assessed fall back to keywords."""
+        nonlocal kw_fallback
+        assessed = set()
+        for assessment in assessments:
+            idx = assessment.get("idx", 0)
+            if not isinstance(idx, int) or not 0 <= idx < len(batch) or idx in assessed:
                 continue
-            cat     = analysis.get("category", "NOT_RELEVANT")
-            sev_str = (analysis.get("severity") or "LOW").upper()
-            sev_num = _SEV_NUM.get(sev_str, 1)
-            results.append({
-                "title":              article["title"],
-                "url":                article["url"],
-                "snippet":            article["body"][:160],
-                "body":               article["body"][:600],
-                "source":             article["source"],
-                "time":               article["time"],
-                "region":             map_region(article["title"]),
-                "severity":           sev_num,
-                "type":               _TYPE_MAP.get(cat, "GENERAL"),
-                "locations":          [],
-                "operational_impact": "",
-                "second_order":       "",
-                "ai_score":           5,
-            })
+            assessed.add(idx)
+            _record(batch[idx], assessment, model=provider.model)
+        for idx, article in enumerate(batch):
+            if idx in assessed:
+                continue
+            kw_fallback += 1
+            _record(article, keyword_classify(article["title"], article["body"]),
+                    tag="KW", build=_keyword_result)
+
+    packer = shared_packer(providers)
+    classify_stream(stream_batches(article_q, packer, handled=_pre_batch), providers, _on_batch)
+
+    classify_cache.save()
+    for provider in providers:
+        print(f"  {provider.summary()}")
+    print(f"  Keyword-classified: {kw_fallback} articles "
+          f"| classification cache hits: {classify_cache.hits}")
+    ai_calls    = sum(p.calls for p in providers)
+    ai_articles = sum(p.articles for p in providers)
+    _report_near_dups(near_dups, followers, ai_articles / max(ai_calls, 1))
+
+    scout_thread.join()
+    print(f"[PIPELINE] {scout_stats['raw']} raw articles scouted + classified in "
+          f"{time.monotonic() - run_started:.1f}s")
+    print(f"  {HTTP.summary()}")
 
     # ── Phase 3: Sort, deduplicate, write ─────────────────────────────────────
     # Sort: severity (high first), then time (newest first)
@@ -901,7 +1828,8 @@ def main():
     except Exception as ex:
         print(f"[OUTPUT] Mirror failed (non-fatal): {ex}")
 
-    print(f"\nSRO Brain v2.0 complete — {len(results)} intelligence items | mode={ai_mode}")
+    print(f"\nSRO Brain v2.0 complete — {len(results)} intelligence items "
+          f"| mode={'+'.join(p.name.lower() for p in providers) or 'keyword'}")
 
 
 if __name__ == "__main__":
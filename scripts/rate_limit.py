@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Shared rate limiting and failure handling for the SRO pipeline scripts.
+
+  TokenBucket          — smooth requests/second limiter with adaptive backoff.
+                         Used for GDELT, which throttles anything faster than ~1 req / 5s.
+  SlidingWindowLimiter — requests-per-minute + tokens-per-minute limiter for the
+                         AI providers, synced from their rate-limit headers.
+  backoff_delay        — jittered exponential backoff.
+  CircuitBreaker       — stops calling a provider after repeated failures, probes
+                         it again after a cooldown.
+"""
+
+import random
+import re
+import threading
+import time
+from collections import deque
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `rate` tokens are added per second up to `capacity`;
+    acquire() blocks until a token is available.
+
+    On a rate-limit response call backoff(): the refill rate is halved (down to
+    min_rate) and the bucket is paused for `pause_s`. Each success calls recover(),
+    which steps the rate back towards the configured rate (AIMD).
+    """
+
+    def __init__(self, rate, capacity=1.0, min_rate=None):
+        self.base_rate     = float(rate)
+        self.rate          = float(rate)
+        self.min_rate      = float(min_rate) if min_rate else self.base_rate / 8
+        self.capacity      = float(capacity)
+        self.tokens        = float(capacity)
+        self.updated       = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock         = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens  = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1.0):
+        """Block until `tokens` are available. Returns seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                else:
+                    wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def backoff(self, pause_s=0.0, factor=0.5):
+        """Rate-limited by the server: slow down and optionally pause everyone."""
+        with self._lock:
+            self.rate   = max(self.min_rate, self.rate * factor)
+            self.tokens = min(self.tokens, 0.0)
+            if pause_s:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + pause_s)
+
+    def recover(self, step=0.25):
+        """Successful call: step the rate back up towards the configured rate."""
+        with self._lock:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * step)
+
+
+def backoff_delay(attempt, base=2.0, cap=60.0):
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+_DURATION_PART = re.compile(r"([\d.]+)(ms|h|m|s)")
+
+
+def parse_duration_s(value):
+    """Parse '17s', '1m26.4s', '120ms' or a bare number of seconds. None if unparseable."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(n) * scale[u] for n, u in parts)
+
+
+class SlidingWindowLimiter:
+    """
+    Thread-safe limiter over a rolling 60 s window: at most `rpm` requests and
+    `tpm` estimated tokens. acquire(tokens) blocks until the request fits.
+
+    defer(seconds) pauses every caller (Retry-After / 429). observe(headers)
+    reads OpenAI-style x-ratelimit-* headers (Groq) and pauses until the reset
+    when the provider reports the requests or tokens budget exhausted.
+    """
+
+    WINDOW_S = 60.0
+
+    def __init__(self, rpm, tpm=None):
+        self.rpm           = rpm
+        self.tpm           = tpm
+        self.events        = deque()   # (timestamp, tokens)
+        self.window_tokens = 0
+        self.blocked_until = 0.0
+        self.last_tokens   = 0
+        self.waited_s      = 0.0
+        self._lock         = threading.Lock()
+
+    def _expire(self, now):
+        while self.events and now - self.events[0][0] >= self.WINDOW_S:
+            _, tokens = self.events.popleft()
+            self.window_tokens -= tokens
+
+    def acquire(self, tokens=0):
+        """Block until one request of `tokens` fits the window. Returns seconds waited."""
+        if self.tpm:
+            tokens = min(tokens, self.tpm)   # an oversized request still goes, alone
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._expire(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.rpm and len(self.events) >= self.rpm:
+                    wait = self.events[0][0] + self.WINDOW_S - now
+                elif self.tpm and self.window_tokens + tokens > self.tpm and self.events:
+                    # wait for enough of the window to drain
+                    need, wait = self.window_tokens + tokens - self.tpm, 0.0
+                    for ts, tk in self.events:
+                        need -= tk
+                        wait = ts + self.WINDOW_S - now
+                        if need <= 0:
+                            break
+                else:
+                    self.events.append((now, tokens))
+                    self.window_tokens += tokens
+                    self.last_tokens = tokens
+                    self.waited_s += waited
+                    return waited
+            wait = max(wait, 0.01)
+            time.sleep(wait)
+            waited += wait
+
+    def defer(self, seconds):
+        """Pause all callers for `seconds` (e.g. Retry-After)."""
+        if seconds and seconds > 0:
+            with self._lock:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def observe(self, headers):
+        """Sync with provider rate-limit headers after a successful response."""
+        if not headers:
+            return
+        get = headers.get
+        retry_after = parse_duration_s(get("retry-after"))
+        if retry_after:
+            self.defer(retry_after)
+        try:
+            req_left = int(get("x-ratelimit-remaining-requests") or -1)
+        except ValueError:
+            req_left = -1
+        try:
+            tok_left = int(get("x-ratelimit-remaining-tokens") or -1)
+        except ValueError:
+            tok_left = -1
+        if req_left == 0:
+            self.defer(parse_duration_s(get("x-ratelimit-reset-requests")) or 0)
+        if 0 <= tok_left < self.last_tokens:
+            self.defer(parse_duration_s(get("x-ratelimit-reset-tokens")) or 0)
+
+
+class CircuitBreaker:
+    """
+    Thread-safe closed → open → half-open breaker. `failure_threshold`
+    consecutive failures open it; after `cooldown_s` one caller is let through
+    as a probe (half-open) — its success closes the breaker, its failure
+    re-opens it for another cooldown.
+    """
+
+    def __init__(self, failure_threshold=3, cooldown_s=60.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown_s        = cooldown_s
+        self.state             = "closed"
+        self.failures          = 0
+        self.opened_at         = 0.0
+        self.trips             = 0
+        self._lock             = threading.Lock()
+
+    def allow(self):
+        """True if a call may go ahead now (closed, or the half-open probe)."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown_s:
+                self.state = "half_open"
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.state    = "closed"
+            self.failures = 0
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state     = "open"
+                self.opened_at = time.monotonic()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Gated multi-term scanning shared by the SRO pipeline scripts.
+
+Keyword rules in this repo are written as \b(a|b|c)\b alternations. Running
+dozens of them with re.search, or a list of terms with `in`, walks every
+article once per rule. Here every alternative's literal prefix goes into one
+trie-shaped lookahead regex (the gate) that fires only at word starts where
+some term could begin; the full patterns are tried only there.
+
+  gated_finditer(scan, gate, text) — scan.finditer() restricted to gate hits
+                                     (news_agent prefilter / keyword classifier)
+  TermBuckets({bucket: [patterns]}) — one pass, returns every bucket with a hit
+                                      (generate_reports relevance / radius / taxonomy)
+"""
+
+import re
+
+
+def alternatives(pattern):
+    r"""Top-level alternatives of a \b(a|b|c)\b style pattern."""
+    inner = pattern[2:-2] if pattern.startswith(r"\b") and pattern.endswith(r"\b") else pattern
+    if inner.startswith("(") and inner.endswith(")"):
+        inner = inner[1:-1]
+    alts, cur, depth, i = [], "", 0, 0
+    while i < len(inner):
+        c = inner[i]
+        if c == "\\":
+            cur += inner[i:i + 2]
+            i += 2
+            continue
+        depth += (c == "(") - (c == ")")
+        if c == "|" and depth == 0:
+            alts.append(cur)
+            cur = ""
+        else:
+            cur += c
+        i += 1
+    alts.append(cur)
+    return alts
+
+
+def literal_prefix(alt):
+    """Leading literal characters every match of `alt` must start with (lowercased)."""
+    if alt.startswith(r"\b"):   # a word-start anchor adds no characters
+        alt = alt[2:]
+    out = ""
+    for i, c in enumerate(alt):
+        if not (c.isalnum() or c == "-") or alt[i + 1:i + 2] in ("?", "*", "{"):
+            break
+        out += c
+    return out.lower()
+
+
+def trie_regex(words):
+    """Compile literal words into a trie-shaped regex (shared prefixes branch once)."""
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(sub) for ch, sub in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+def word_gate(patterns):
+    """Lookahead regex firing at word starts where any of `patterns` could begin (lowercased text)."""
+    return re.compile(r"(?<![a-z0-9_])(?=" + trie_regex({literal_prefix(p) for p in patterns}) + ")")
+
+
+def gated_finditer(scan, gate, text):
+    """Same matches as scan.finditer(text), but scan is only tried where gate fires."""
+    low = text.lower()
+    if len(low) != len(text):          # exotic case mapping shifted offsets
+        yield from scan.finditer(text)
+        return
+    pos = 0
+    for g in gate.finditer(low):
+        if g.start() < pos:
+            continue
+        m = scan.match(text, g.start())
+        if m:
+            pos = m.end()
+            yield m
+
+
+class TermBuckets:
+    """
+    Named buckets of regex alternatives (lowercase), matched at word starts.
+    scan(text) reports every bucket with at least one term in `text` —
+    overlapping terms and terms sharing a start all count, unlike a single
+    alternation regex, which reports one term per position.
+
+    A pattern is anchored at a word start only; add r"\b" to require a word
+    end as well (r"\b(a|b)\b" rules) or leave it open for prefix terms
+    ("protest" also hits "protesters"). A leading r"\b" makes the start exact
+    for non-ASCII word characters too, which the gate treats as boundaries.
+
+    At each gate hit only the terms whose literal prefix starts with the next
+    KEY_CHARS characters are tried, and only while they could add a bucket.
+    """
+
+    KEY_CHARS = 2
+
+    def __init__(self, buckets):
+        owners = {}   # pattern → buckets it belongs to
+        for bucket, patterns in buckets.items():
+            for pat in patterns:
+                owners.setdefault(pat, set()).add(bucket)
+        self.gate   = word_gate(owners)
+        self.by_key = {}   # first KEY_CHARS of the literal prefix → [(compiled, buckets)]
+        self.loose  = []   # literal prefix too short to key on — tried at every gate hit
+        for pat, names in owners.items():
+            entry  = (re.compile(pat), frozenset(names))
+            prefix = literal_prefix(pat)
+            if len(prefix) >= self.KEY_CHARS:
+                self.by_key.setdefault(prefix[:self.KEY_CHARS], []).append(entry)
+            else:
+                self.loose.append(entry)
+
+    def scan(self, text):
+        """Buckets with a hit in `text` (already lowercased), as a frozenset."""
+        hits  = set()
+        key_n = self.KEY_CHARS
+        for g in self.gate.finditer(text):
+            pos = g.start()
+            for term, names in self.by_key.get(text[pos:pos + key_n], ()):
+                if not names <= hits and term.match(text, pos):
+                    hits |= names
+            for term, names in self.loose:
+                if not names <= hits and term.match(text, pos):
+                    hits |= names
+        return frozenset(hits)
@@ -0,0 +1,79 @@
+"""news_agent._clean (fast tag stripper) must match BeautifulSoup's get_text(" ", strip=True)."""
+
+import random
+import warnings
+
+import pytest
+from bs4 import BeautifulSoup
+
+from bench_clean import BUILTIN_SAMPLES
+from news_agent import RAW_BODY_CHARS, _clean, _fast_text
+
+warnings.filterwarnings("ignore", module="bs4")
+
+
+def _bs4(html):
+    return BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+
+
+ENTITY_CASES = [
+    "Truckers&#8217; strike &#8211; day 3&hellip;",
+    "R&amp;D &lt;b&gt; not a tag &gt;",
+    "caf&eacute; &#x263A; &nbsp;&nbsp;closed",
+    "AT&T outage & more",
+    "&bogus; entity &notanentity",
+    "&amp",
+]
+
+FALLBACK_CASES = [
+    # malformed comments html.parser keeps (partly) as text
+    "<!---> word",
+    "<!--> word",
+    "before <!-- unterminated comment",
+    "a <!-- one --!> b --> c",
+    # raw-text elements and CDATA
+    "<script>var x = '<p>';</script><p>Airport closed</p>",
+    "<style>p{}</style>text",
+    "<![CDATA[ x ]]>y",
+    # unterminated / swallowing tags
+    "<p>R&D centre closed <b>unclosed",
+    "<a href='x'<b>bold</b>",
+]
+
+
+@pytest.mark.parametrize("html", BUILTIN_SAMPLES + ENTITY_CASES + FALLBACK_CASES)
+def test_matches_beautifulsoup(html):
+    assert _clean(html) == _bs4(html)
+
+
+@pytest.mark.parametrize("html", BUILTIN_SAMPLES + ENTITY_CASES + FALLBACK_CASES)
+@pytest.mark.parametrize("limit", [1, 7, 40, RAW_BODY_CHARS])
+def test_limit_prefix_matches(html, limit):
+    assert _clean(html, limit=limit)[:limit] == _bs4(html)[:limit]
+
+
+@pytest.mark.parametrize("html", ["<!---> word", "<!--> word", "x <!-- open"])
+def test_malformed_comments_take_the_fallback(html):
+    assert _fast_text(html) is None
+
+
+def test_long_article_stops_early():
+    long_html = BUILTIN_SAMPLES[-1]
+    text = _clean(long_html, limit=RAW_BODY_CHARS)
+    assert len(text) >= RAW_BODY_CHARS
+    assert len(text) < len(_bs4(long_html))
+
+
+_TOKENS = ["<p>", "</p>", "<b>", "</b>", "<!--", "-->", "<!--->", "<!-->", "--!>", ">", "<",
+           "&amp;", "&", "&nbsp;", "&#8217;", "&bogus;", " ", "word", "\n", "<a href='x>y'>",
+           "</a>", "<br/>", "<!DOCTYPE html>", "<script>", "</script>", "<![CDATA[", "]]>", "'"]
+
+
+def test_random_markup_fuzz():
+    rnd = random.Random(6)
+    for _ in range(5000):
+        html = "".join(rnd.choice(_TOKENS) for _ in range(rnd.randint(1, 12)))
+        want = _bs4(html)
+        assert _clean(html) == want, html
+        limit = rnd.randint(1, 20)
+        assert _clean(html, limit=limit)[:limit] == want[:limit], html
@@ -0,0 +1,107 @@
+"""geo_index.GeoIndex / SiteDistances must return what the linear haversine scans they replaced returned."""
+
+import random
+
+import pytest
+
+import geo_index
+from bench_geo import linear_nearest, linear_within
+from geo_index import GeoIndex, SiteDistances, haversine_km
+
+
+def _assets(n, rnd):
+    """Random points, clustered near a few centres, with exact duplicates for ties."""
+    centres = [(rnd.uniform(-60, 70), rnd.uniform(-180, 180)) for _ in range(8)]
+    out = []
+    for i in range(n):
+        if out and rnd.random() < 0.05:
+            twin = rnd.choice(out)
+            lat, lon = twin["lat"], twin["lon"]
+        elif rnd.random() < 0.7:
+            lat, lon = rnd.choice(centres)
+            lat = max(-89.9, min(89.9, lat + rnd.gauss(0, 2)))
+            lon = (lon + rnd.gauss(0, 2) + 180) % 360 - 180
+        else:
+            lat, lon = rnd.uniform(-90, 90), rnd.uniform(-180, 180)
+        out.append({"name": f"asset-{i}", "lat": lat, "lon": lon})
+    return out
+
+
+def _queries(assets, n, rnd):
+    near  = [(a["lat"] + rnd.gauss(0, 0.5), a["lon"] + rnd.gauss(0, 0.5)) for a in rnd.sample(assets, n)]
+    exact = [(a["lat"], a["lon"]) for a in rnd.sample(assets, n // 4)]
+    edges = [(90.0, 0.0), (-90.0, 0.0), (0.0, 180.0), (0.0, -180.0), (10.0, 179.99)]
+    return near + exact + edges
+
+
+def _rows(rows):
+    return [(d, it["name"]) for d, it in rows]
+
+
+@pytest.fixture(scope="module", params=[0, 1, 7, 300, 2000])
+def world(request):
+    rnd     = random.Random(17 + request.param)
+    assets  = _assets(request.param, rnd)
+    queries = _queries(assets, min(len(assets), 100), rnd) if assets else [(0.0, 0.0)]
+    return assets, GeoIndex(assets), queries
+
+
+def test_nearest_matches_linear_scan(world):
+    assets, index, queries = world
+    for lat, lon in queries:
+        want = linear_nearest(assets, lat, lon) if assets else []
+        assert _rows(index.k_nearest(lat, lon, 1)) == _rows(want), (lat, lon)
+
+
+@pytest.mark.parametrize("km", [0.0, 25.0, 100.0, 500.0, 20040.0])
+def test_within_radius_matches_linear_scan(world, km):
+    assets, index, queries = world
+    for lat, lon in queries:
+        assert _rows(index.within_radius(lat, lon, km)) == _rows(linear_within(assets, lat, lon, km))
+
+
+@pytest.mark.parametrize("k, max_km", [(3, None), (10, 500.0), (50, 2000.0)])
+def test_k_nearest_matches_linear_scan(world, k, max_km):
+    assets, index, queries = world
+    for lat, lon in queries:
+        want = linear_within(assets, lat, lon, max_km if max_km is not None else float("inf"), k)
+        assert _rows(index.k_nearest(lat, lon, k, max_km=max_km)) == _rows(want), (lat, lon)
+
+
+# ── SiteDistances (proximity Tier A) ──────────────────────────────────────────
+def _site_loop(sites, points, radii):
+    """The per-point haversine_km loop over the sites that SiteDistances replaced."""
+    out = []
+    for (lat, lon), radius in zip(points, radii):
+        hits = []
+        for j, s in enumerate(sites):
+            try:
+                d = haversine_km(lat, lon, s["lat"], s["lon"])
+            except ValueError:   # non-finite point
+                break
+            if d <= radius:
+                hits.append((d, j))
+        out.append(hits)
+    return out
+
+
+@pytest.fixture(params=["numpy", "scalar"])
+def kernel_mode(request, monkeypatch):
+    if request.param == "numpy" and geo_index.np is None:
+        pytest.skip("NumPy not installed")
+    if request.param == "scalar":
+        monkeypatch.setattr(geo_index, "np", None)
+    monkeypatch.setattr(geo_index, "MATRIX_ROWS", 64)   # exercise several blocks
+    return request.param
+
+
+@pytest.mark.parametrize("n_sites", [0, 1, 40])
+def test_site_distances_match_haversine_loop(kernel_mode, n_sites):
+    rnd    = random.Random(18 + n_sites)
+    sites  = _assets(n_sites, rnd)
+    points = [(a["lat"], a["lon"]) for a in _assets(300, rnd)] + [(s["lat"], s["lon"]) for s in sites]
+    points += [(float("nan"), 0.0), (0.0, float("inf")), (90.0, 0.0), (0.0, -180.0)]
+    radii  = [rnd.choice([0.0, 5.0, 50.0, 300.0, 1500.0, 20040.0]) for _ in points]
+    kernel = SiteDistances(sites, coords=lambda s: (s["lat"], s["lon"]))
+    assert kernel.within(points, radii) == _site_loop(sites, points, radii)
+    assert kernel.within(points, 500.0) == _site_loop(sites, points, [500.0] * len(points))
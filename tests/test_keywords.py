@@ -0,0 +1,52 @@
+"""news_agent.keyword_classify (one TermBuckets pass) must match the legacy eight-regex classifier."""
+
+import random
+
+import pytest
+
+from bench_keywords import _CHECKS, legacy_keyword_classify, synthetic
+from news_agent import _KEYWORD_CHECKS, keyword_classify
+from term_scan import alternatives
+
+CASES = [
+    ("Teachers strike closes schools", ""),
+    ("Protesters gather downtown", "no category term here"),       # legacy has no "protesters"
+    ("Port strike and riot in the capital", ""),                    # first check in order wins
+    ("Flooding hits the coast", "floods and more floods"),          # plurals are not legacy terms
+    ("Embassy issues safety alert", ""),
+    ("Dell layoff rumours", "the Dell CEO declined to comment"),
+    ("Ransomware hits hospital", "protest outside"),                # cyber-only: rejected
+    ("Ransomware hits Dell plant", "protest outside"),              # Dell mention: kept
+    ("Quarterly earnings beat estimates", "Shares rose 3%."),
+    ("éstrike and strike_action", "x-riot 1coup"),                  # word boundaries
+    ("Workers ſtrike at the port", ""),                             # IGNORECASE folds ſ onto s
+    ("Rıot police deployed", ""),                                   # ... and ı onto i
+    ("İstanbul transport strike", ""),                              # lower() changes the length
+    ("", "STATE OF EMERGENCY declared\nafter the earthquake"),
+]
+
+
+def test_same_checks_as_legacy():
+    assert list(_KEYWORD_CHECKS) == _CHECKS
+
+
+@pytest.mark.parametrize("title, body", CASES)
+def test_matches_legacy(title, body):
+    assert keyword_classify(title, body) == legacy_keyword_classify(title, body)
+
+
+def test_synthetic_corpus_matches_legacy():
+    for title, body in synthetic(2000):
+        assert keyword_classify(title, body) == legacy_keyword_classify(title, body), title
+
+
+def test_random_term_fuzz():
+    rnd   = random.Random(13)
+    words = [alt.replace(".", " ").replace("s?", "s") for p, _, _ in _CHECKS for alt in alternatives(p)]
+    words += ["ransomware", "Dell", "hacked", "the", "news", "STRIKE", "ſtrike", "rıot", "éstrike",
+              "strikes", "protesters", "İstanbul", "\n", "—", "“coup”", "_riot", "1", "x"]
+    seps  = [" ", "", ".", "-", "_", "é", "\n"]
+    for _ in range(5000):
+        title = "".join(rnd.choice(words) + rnd.choice(seps) for _ in range(rnd.randint(0, 6)))
+        body  = "".join(rnd.choice(words) + rnd.choice(seps) for _ in range(rnd.randint(0, 20)))
+        assert keyword_classify(title, body) == legacy_keyword_classify(title, body), (title, body)